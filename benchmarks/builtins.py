@@ -0,0 +1,98 @@
+"""Recursive sum and map over arrays with rest() views vs a copying rest().
+
+Run from the repository root with ``python -m benchmarks.builtins``. Each
+workload walks an n-element array with first() and rest(), once with the
+builtin rest(), which returns a view sharing the array's elements, and once
+with a rest() bound in the environment that copies the remaining elements,
+as a naive implementation would. Copying makes the walk quadratic, so it is
+only run up to --copy-max elements. The recursion is as deep as the array is
+long, so everything runs in a thread with a large stack and a raised
+recursion limit.
+"""
+
+import argparse
+import sys
+import threading
+import time
+
+from monkeypie.builtins import builtin_rest
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.object import Array, Builtin, Integer, Object
+from monkeypie.parser import Parser
+from monkeypie.persistent import PersistentVector
+from monkeypie.tiered import TieredEvaluator
+
+WORKLOADS = {
+    "sum": """
+        let sum = fn(a) { if (len(a) == 0) { 0 } else { first(a) + sum(rest(a)) } };
+        sum(input);
+    """,
+    "map": """
+        let map = fn(a, f, out) {
+            if (len(a) == 0) { out } else { map(rest(a), f, push(out, f(first(a)))) }
+        };
+        len(map(input, fn(x) { x * 2 }, []));
+    """,
+}
+
+EVALUATORS = {"evaluator": Evaluator, "tiered": TieredEvaluator}
+
+
+def copying_rest(value: Object) -> Object:
+    result = builtin_rest(value)
+    if isinstance(result, Array):
+        return Array(PersistentVector.from_iterable(result.iterate()))
+    return result
+
+
+def run(source: str, evaluator: Evaluator, n: int, copying: bool) -> float:
+    program = Parser(Lexer(source)).parse_program()
+    env = Environment()
+    env.set("input", Array(PersistentVector.from_iterable(map(Integer, range(n)))))
+    if copying:
+        env.set("rest", Builtin("rest", copying_rest))
+    started = time.perf_counter()
+    evaluator.evaluate(program, env)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 4_000, 16_000, 100_000]
+    )
+    argparser.add_argument("--copy-max", type=int, default=4_000)
+    argparser.add_argument("--repeat", type=int, default=3)
+    args = argparser.parse_args()
+
+    def benchmark() -> None:
+        print(
+            f"{'workload':8} {'evaluator':10} {'rest':5} {'n':>8} {'best ms':>10}"
+            f" {'per element us':>15}"
+        )
+        for workload, source in WORKLOADS.items():
+            for name, evaluator_class in EVALUATORS.items():
+                for copying in (False, True):
+                    for n in args.sizes:
+                        if copying and n > args.copy_max:
+                            continue
+                        best = min(
+                            run(source, evaluator_class(), n, copying)
+                            for _ in range(args.repeat)
+                        )
+                        print(
+                            f"{workload:8} {name:10} {'copy' if copying else 'view':5}"
+                            f" {n:8} {best * 1e3:10.1f} {best / n * 1e6:15.2f}"
+                        )
+
+    sys.setrecursionlimit(10**8)
+    threading.stack_size(1 << 30)
+    thread = threading.Thread(target=benchmark)
+    thread.start()
+    thread.join()
+
+
+if __name__ == "__main__":
+    main()
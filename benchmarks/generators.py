@@ -0,0 +1,119 @@
+"""Seeded generators of synthetic Monkey programs with distinct shapes.
+
+Every generator takes a random.Random and an approximate size in characters
+and returns a program that parses without errors.
+"""
+
+import random
+from typing import Callable
+
+Generator = Callable[[random.Random, int], str]
+
+
+def name(prefix: str, i: int) -> str:
+    """Spell i in base 26 after prefix, as identifiers are letters only.
+
+    prefix must not be the first letter of a keyword, or names such as "fn"
+    come out.
+    """
+    letters = prefix
+    while True:
+        i, digit = divmod(i, 26)
+        letters += chr(ord("a") + digit)
+        if not i:
+            return letters
+
+
+def _repeat(rng: random.Random, size: int, statement: Callable[[int], str]) -> str:
+    out: list[str] = []
+    length = 0
+    while length < size:
+        out.append(statement(len(out)))
+        length += len(out[-1]) + 1
+    return "\n".join(out) + "\n"
+
+
+def _operand(rng: random.Random) -> str:
+    return rng.choice([str(rng.randrange(1000)), "x", "y", "true", "-z"])
+
+
+def deep_nesting(rng: random.Random, size: int, depth: int = 40) -> str:
+    """Expressions nested through parentheses, prefix operators, ifs and fns."""
+
+    def expression(level: int) -> str:
+        if level == depth:
+            return _operand(rng)
+        inner = expression(level + 1)
+        match rng.randrange(4):
+            case 0:
+                return f"({inner} * {_operand(rng)})"
+            case 1:
+                return f"!{inner}"
+            case 2:
+                return f"if ({_operand(rng)}) {{ {inner} }} else {{ {_operand(rng)} }}"
+            case _:
+                return f"fn(x) {{ {inner} }}"
+
+    return _repeat(rng, size, lambda i: f"{expression(0)};")
+
+
+def wide_infix(rng: random.Random, size: int, width: int = 200) -> str:
+    """Long infix chains mixing every binary operator."""
+    operators = ["+", "-", "*", "/", "<", ">", "==", "!="]
+
+    def statement(i: int) -> str:
+        terms = [_operand(rng)]
+        for _ in range(width):
+            terms += [rng.choice(operators), _operand(rng)]
+        return " ".join(terms) + ";"
+
+    return _repeat(rng, size, statement)
+
+
+def many_lets(rng: random.Random, size: int) -> str:
+    """Many short let statements, each using an earlier binding."""
+
+    def statement(i: int) -> str:
+        earlier = name("v", rng.randrange(i)) if i else "0"
+        return f"let {name('v', i)} = {earlier} + {rng.randrange(100)};"
+
+    return _repeat(rng, size, statement)
+
+
+def closures(rng: random.Random, size: int) -> str:
+    """Function literals returning closures over their enclosing parameters."""
+
+    def statement(i: int) -> str:
+        depth = rng.randrange(2, 6)
+        parameters = [name("p", level) for level in range(depth)]
+        body = " + ".join(parameters)
+        for parameter in reversed(parameters):
+            body = f"fn({parameter}) {{ {body} }}"
+        calls = "".join(f"({rng.randrange(100)})" for _ in parameters)
+        return f"let {name('c', i)} = {body}; {name('c', i)}{calls};"
+
+    return _repeat(rng, size, statement)
+
+
+def long_calls(rng: random.Random, size: int, arguments: int = 100) -> str:
+    """Calls with long argument lists, including nested calls."""
+
+    def statement(i: int) -> str:
+        args = [
+            f"g({_operand(rng)}, {_operand(rng)})"
+            if rng.random() < 0.1
+            else _operand(rng)
+            for _ in range(arguments)
+        ]
+        return f"f({', '.join(args)});"
+
+    return _repeat(rng, size, statement)
+
+
+GENERATORS: dict[str, Generator] = {
+    "deep_nesting": deep_nesting,
+    "wide_infix": wide_infix,
+    "many_lets": many_lets,
+    "closures": closures,
+    "long_calls": long_calls,
+}
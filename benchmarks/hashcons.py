@@ -0,0 +1,105 @@
+"""Hash-consing: retained memory and a subtree-cached pass, with and without.
+
+Run from the repository root with ``python -m benchmarks.hashcons``.
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from monkeypie.analysis import free_identifiers
+from monkeypie.ast import ExpressionNode, Node, ProgramNode
+from monkeypie.hashcons import InternTable, SubtreeCache
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+
+# Generated code repeats a small set of subexpressions over and over.
+EXPRESSIONS = ["x + 1", "y * 2", "(x + 1) * (y * 2)", "-x", "x < 10 == true"]
+
+
+def generate(lines: int, seed: int) -> str:
+    rng = random.Random(seed)
+    out = []
+    for i in range(lines):
+        a, b = rng.choice(EXPRESSIONS), rng.choice(EXPRESSIONS)
+        out.append(
+            rng.choice(
+                [
+                    f"let v{i} = {a} + {b};",
+                    f"let f{i} = fn(x, y) {{ if ({a}) {{ {b} }} else {{ {a} }} }};",
+                    f"g{i % 50}({a}, {b}, {a});",
+                ]
+            )
+        )
+    return "\n".join(out)
+
+
+def parse(source: str, intern_table: InternTable | None) -> tuple[ProgramNode, int]:
+    tracemalloc.start()
+    program = Parser(Lexer(source), intern_table).parse_program()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert program is not None
+    return program, size
+
+
+def expressions(program: ProgramNode) -> list[Node]:
+    out: list[Node] = []
+    stack: list[object] = list(program.statements)
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, Node):
+            if isinstance(item, ExpressionNode):
+                out.append(item)
+            stack.extend(
+                v for k, v in vars(item).items() if k not in ("token", "last_token")
+            )
+    return out
+
+
+def timed_pass(program: ProgramNode, cache: SubtreeCache | None) -> float:
+    # Ask for the free identifiers of every expression, as an optimizer
+    # deciding what it may move or inline would.
+    nodes = expressions(program)
+    started = time.perf_counter()
+    for node in nodes:
+        free_identifiers(node, cache)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--lines", type=int, default=20_000)
+    argparser.add_argument("--seed", type=int, default=0)
+    args = argparser.parse_args()
+
+    source = generate(args.lines, args.seed)
+    plain, plain_size = parse(source, None)
+    table = InternTable()
+    shared, shared_size = parse(source, table)
+
+    print(f"{args.lines} lines, {len(source) / 1024:.0f} KiB")
+    print(f"retained, plain:        {plain_size / 2**20:8.2f} MiB")
+    print(
+        f"retained, hash-consed:  {shared_size / 2**20:8.2f} MiB "
+        f"({1 - shared_size / plain_size:.1%} less, "
+        f"{table.hits} shared occurrences, {len(table)} canonical nodes)"
+    )
+    print(
+        f"free_identifiers, no cache:             {timed_pass(plain, None) * 1000:8.2f} ms"
+    )
+    print(
+        f"free_identifiers, cache, plain:         "
+        f"{timed_pass(plain, SubtreeCache()) * 1000:8.2f} ms"
+    )
+    print(
+        f"free_identifiers, cache, hash-consed:   "
+        f"{timed_pass(shared, SubtreeCache()) * 1000:8.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
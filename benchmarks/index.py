@@ -0,0 +1,86 @@
+"""Building, updating and querying the symbol index over generated files.
+
+Run from the repository root with ``python -m benchmarks.index``. Writes
+--files files of --lines lines each to a temporary directory and times
+indexing them into a fresh database, updating the index when nothing
+changed, after touching every file and after editing one, and answering
+--queries definition and reference queries for random names. As the
+baseline for queries, the time to answer one by parsing every file.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.generators import name
+from benchmarks.pipeline import generate
+from monkeypie.index import SymbolIndex, occurrences
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+
+
+def timed(function, *args) -> float:
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+
+def parse_all(paths: list[str], name: str) -> list[tuple[str, int]]:
+    found: list[tuple[str, int]] = []
+    for path in paths:
+        with open(path) as file:
+            program = Parser(Lexer(file.read())).parse_program()
+        found.extend(
+            (path, start)
+            for other, _, start, _ in occurrences(program)
+            if other == name
+        )
+    return found
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--files", type=int, default=1000)
+    argparser.add_argument("--lines", type=int, default=200)
+    argparser.add_argument("--queries", type=int, default=1000)
+    args = argparser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "src")
+        os.makedirs(source)
+        paths = []
+        for i in range(args.files):
+            paths.append(os.path.join(source, f"m{i}.monkey"))
+            with open(paths[-1], "w") as file:
+                file.write(generate(args.lines, i))
+
+        index = SymbolIndex(os.path.join(directory, "index.sqlite3"))
+        print(f"{args.files} files of {args.lines} lines")
+        print(f"cold       {timed(index.update, source) * 1e3:10.1f} ms")
+        print(f"unchanged  {timed(index.update, source) * 1e3:10.1f} ms")
+        for path in paths:
+            os.utime(path)
+        print(f"touched    {timed(index.update, source) * 1e3:10.1f} ms")
+        with open(paths[0], "a") as file:
+            file.write("let edited = va;\n")
+        print(f"one edit   {timed(index.update, source) * 1e3:10.1f} ms")
+
+        names = [
+            name(rng.choice("vh"), rng.randrange(args.lines))
+            for _ in range(args.queries)
+        ]
+        found = 0
+        started = time.perf_counter()
+        for symbol in names:
+            found += len(index.definitions(symbol)) + len(index.references(symbol))
+        queries = (time.perf_counter() - started) / (2 * len(names))
+        print(f"query      {queries * 1e3:10.3f} ms ({found / len(names):.0f} hits)")
+        print(f"parse all  {timed(parse_all, paths, names[0]) * 1e3:10.1f} ms")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Call-heavy workloads with and without call site inline caches.
+
+Run from the repository root with ``python -m benchmarks.inline_cache``.
+"""
+
+import argparse
+import time
+
+from monkeypie.bench import CALL_OVERHEAD_CALLS, WORKLOADS
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator, inline_cache_stats
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+
+CALL_WORKLOADS = ["fib", "closures", "map_reduce"]
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--repeat", type=int, default=10)
+    args = argparser.parse_args()
+
+    sources = {name: WORKLOADS[name] for name in CALL_WORKLOADS}
+    sources["calls"] = CALL_OVERHEAD_CALLS
+    for name, source in sources.items():
+        best = {}
+        program = None
+        for inline_caches in (False, True):
+            # The caches live on the program, so each configuration gets its
+            # own parse.
+            program = Parser(Lexer(source)).parse_program()
+            assert program is not None
+            evaluator = Evaluator(inline_caches)
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                evaluator.evaluate(program, Environment())
+                timings.append(time.perf_counter() - started)
+            best[inline_caches] = min(timings)
+        assert program is not None
+        hits, misses = inline_cache_stats(program)
+        print(
+            f"{name:12} uncached {best[False] * 1e3:8.2f} ms"
+            f"  cached {best[True] * 1e3:8.2f} ms"
+            f"  {best[False] / best[True] - 1:+6.1%}"
+            f"  hit rate {hits / (hits + misses):7.2%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Pasting a long entry into the REPL one line at a time.
+
+Run from the repository root with ``python -m benchmarks.interactive``.
+Feeds a function whose body is --lines generated statements, followed by a
+``let`` whose value starts on the next line, to an InteractiveParser line by
+line, and, as the baseline, relexes the whole buffer after every line to
+count its open brackets and parses it once they are all closed. Reports the
+total time and the slowest line of each.
+"""
+
+import argparse
+import time
+
+from benchmarks.pipeline import generate
+from monkeypie.interactive import InteractiveParser
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+from monkeypie.token import TokenKind
+
+OPENING = {TokenKind.LPAREN, TokenKind.LBRACE, TokenKind.LBRACKET}
+CLOSING = {TokenKind.RPAREN, TokenKind.RBRACE, TokenKind.RBRACKET}
+
+
+def entry(lines: int) -> list[str]:
+    body = generate(lines, 0).splitlines()
+    return ["let main = fn() {", *body, "va", "};", "let result =", "main();"]
+
+
+def session(lines: list[str]) -> list[float]:
+    parser = InteractiveParser()
+    timings = []
+    for line in lines:
+        started = time.perf_counter()
+        parsed = parser.feed(line + "\n")
+        timings.append(time.perf_counter() - started)
+    assert parsed.complete and not parsed.errors, parsed.errors
+    return timings
+
+
+def relex(lines: list[str]) -> list[float]:
+    buffer = ""
+    timings = []
+    for line in lines:
+        started = time.perf_counter()
+        buffer += line + "\n"
+        depth = 0
+        lexer = Lexer(buffer)
+        while (token := lexer.next_token()).kind != TokenKind.EOF:
+            depth += (token.kind in OPENING) - (token.kind in CLOSING)
+        if depth == 0:
+            parser = Parser(Lexer(buffer))
+            parser.parse_program()
+            if not parser.errors():
+                buffer = ""
+        timings.append(time.perf_counter() - started)
+    assert buffer == ""
+    return timings
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--lines", type=int, default=2000)
+    args = argparser.parse_args()
+
+    lines = entry(args.lines)
+    print(f"{len(lines)} lines")
+    print(f"{'':8} {'total ms':>10} {'slowest line ms':>16}")
+    for label, paste in (("session", session), ("relex", relex)):
+        timings = paste(lines)
+        print(f"{label:8} {sum(timings) * 1e3:10.1f} {max(timings) * 1e3:16.2f}")
+
+
+if __name__ == "__main__":
+    main()
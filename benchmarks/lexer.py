@@ -0,0 +1,47 @@
+"""Lexer throughput in MB/s for the Unicode path and the ASCII fast path.
+
+Run from the repository root with ``python -m benchmarks.lexer``.
+"""
+
+import argparse
+import time
+
+from benchmarks.reparse import generate
+from monkeypie.lexer import Lexer
+from monkeypie.token import TokenKind
+
+
+def lex(lexer: Lexer) -> None:
+    while lexer.next_token().kind != TokenKind.EOF:
+        pass
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--lines", type=int, default=20_000)
+    argparser.add_argument("--repeat", type=int, default=5)
+    argparser.add_argument("--seed", type=int, default=0)
+    args = argparser.parse_args()
+
+    source = generate(args.lines, args.seed)
+    encoded = source.encode()
+    megabytes = len(encoded) / 1_000_000
+    cases = {
+        "unicode path, str": lambda: Lexer(source, ascii_fast_path=False),
+        "ascii path, str": lambda: Lexer(source),
+        "ascii path, bytes": lambda: Lexer(encoded),
+        "ascii path, memoryview": lambda: Lexer(memoryview(encoded)),
+    }
+
+    print(f"{args.lines} lines, {megabytes:.2f} MB")
+    for name, make_lexer in cases.items():
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            lex(make_lexer())
+            timings.append(time.perf_counter() - started)
+        print(f"{name:24} {megabytes / min(timings):8.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
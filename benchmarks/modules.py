@@ -0,0 +1,72 @@
+"""Loading a generated graph of modules cold, from the cache and after a touch.
+
+Run from the repository root with ``python -m benchmarks.modules``. Writes
+--modules files of --lines lines each to a temporary directory, each
+importing up to --fanout of the files after it, and times loading the first
+one with a fresh ModuleLoader for each worker count in --workers, again with
+the loader that has every module cached, and once more after updating every
+file's modification time, so that the cache is only kept by hashing the
+contents. Parsing is CPU bound, so extra workers only pay off on a
+free-threaded build; with the GIL they overlap reading files at most.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.pipeline import generate
+from monkeypie.modules import ModuleLoader
+
+
+def write_graph(directory: str, modules: int, lines: int, fanout: int) -> str:
+    rng = random.Random(0)
+    for i in range(modules):
+        dependencies = sorted(
+            rng.sample(range(i + 1, modules), min(fanout, modules - i - 1))
+        )
+        imports = "".join(f'import "m{j}.monkey";\n' for j in dependencies)
+        with open(os.path.join(directory, f"m{i}.monkey"), "w") as file:
+            file.write(imports + generate(lines, i))
+    return os.path.join(directory, "m0.monkey")
+
+
+def timed(loader: ModuleLoader, path: str) -> float:
+    started = time.perf_counter()
+    loader.load(path)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--modules", type=int, default=200)
+    argparser.add_argument("--lines", type=int, default=500)
+    argparser.add_argument("--fanout", type=int, default=3)
+    argparser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = argparser.parse_args()
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(
+        f"{args.modules} modules of {args.lines} lines, fanout {args.fanout},"
+        f" GIL enabled: {is_gil_enabled}"
+    )
+    print(f"{'workers':>7} {'cold ms':>10} {'cached ms':>10} {'touched ms':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        root = write_graph(directory, args.modules, args.lines, args.fanout)
+        for workers in args.workers:
+            loader = ModuleLoader(workers)
+            cold = timed(loader, root)
+            cached = timed(loader, root)
+            for name in os.listdir(directory):
+                os.utime(os.path.join(directory, name))
+            touched = timed(loader, root)
+            print(
+                f"{workers:7} {cold * 1e3:10.1f} {cached * 1e3:10.1f}"
+                f" {touched * 1e3:11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Evaluation time of programs before and after monkeypie.optimizer.
+
+Run from the repository root with ``python -m benchmarks.optimizer``. Runs of
+the original and the optimized program alternate, each going first every other
+time, so that both see the same machine load, and the best of --repeat runs is
+reported for each evaluator.
+"""
+
+import argparse
+import time
+
+from monkeypie.bench import WORKLOADS
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.optimizer import Optimizer
+from monkeypie.parser import Parser
+from monkeypie.tiered import TieredEvaluator
+
+EVALUATORS = {"evaluator": Evaluator, "tiered": TieredEvaluator}
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--repeat", type=int, default=10)
+    argparser.add_argument("--budget", type=int, default=16)
+    args = argparser.parse_args()
+
+    print(
+        f"{'workload':12} {'evaluator':10} {'before ms':>10} {'after ms':>10}"
+        f" {'speedup':>8} {'inlined':>8} {'removed':>8}"
+    )
+    for workload, source in WORKLOADS.items():
+        program = Parser(Lexer(source)).parse_program()
+        assert program is not None
+        optimizer = Optimizer(args.budget)
+        optimized = optimizer.optimize(program)
+        for name, evaluator_class in EVALUATORS.items():
+            evaluators = (evaluator_class(), evaluator_class())
+            best = [float("inf"), float("inf")]
+            trees = (program, optimized)
+            for run in range(args.repeat):
+                for i in (run % 2, 1 - run % 2):
+                    started = time.perf_counter()
+                    evaluators[i].evaluate(trees[i], Environment())
+                    best[i] = min(best[i], time.perf_counter() - started)
+            print(
+                f"{workload:12} {name:10} {best[0] * 1e3:10.2f} {best[1] * 1e3:10.2f}"
+                f" {best[0] / best[1]:7.2f}x {optimizer.inlined:8}"
+                f" {optimizer.eliminated:8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
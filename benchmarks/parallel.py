@@ -0,0 +1,77 @@
+"""Scaling of pmap and preduce with the number of worker processes.
+
+Run from the repository root with ``python -m benchmarks.parallel``. Maps a
+function costing a small recursive computation per element over an array of
+--size elements and then sums the results with preduce, once per worker
+count in --workers, where one worker is the serial baseline. Worker
+processes are started, and the pool warmed up, before timing; speedups are
+relative to the serial run and bounded by the cores of the machine.
+"""
+
+import argparse
+import os
+import time
+
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.object import Array, Integer
+from monkeypie.parallel import WorkerPool, use_pool
+from monkeypie.parser import Parser
+from monkeypie.persistent import PersistentVector
+from monkeypie.tiered import TieredEvaluator
+
+SOURCE = """
+let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };
+let work = fn(x) { fib(x - x / 12 * 12) + x };
+preduce(pmap(input, work), 0, fn(a, b) { a + b });
+"""
+
+EVALUATORS = {"evaluator": Evaluator, "tiered": TieredEvaluator}
+
+
+def main() -> None:
+    cores = os.cpu_count() or 1
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--size", type=int, default=10_000)
+    argparser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[w for w in (1, 2, 4, 8, 16, 32) if w < cores] + [cores],
+    )
+    argparser.add_argument(
+        "--evaluator", choices=sorted(EVALUATORS), default="evaluator"
+    )
+    argparser.add_argument("--repeat", type=int, default=3)
+    args = argparser.parse_args()
+
+    program = Parser(Lexer(SOURCE)).parse_program()
+    data = Array(PersistentVector.from_iterable(map(Integer, range(args.size))))
+    print(f"{cores} cores, {args.size} elements, {args.evaluator}")
+    print(f"{'workers':>7} {'best ms':>10} {'speedup':>8}  result")
+    serial = None
+    for workers in args.workers:
+        pool = WorkerPool(workers, min_elements=1)
+        previous = use_pool(pool)
+        try:
+            best = float("inf")
+            for run in range(args.repeat + 1):
+                env = Environment()
+                env.set("input", data)
+                started = time.perf_counter()
+                result = EVALUATORS[args.evaluator]().evaluate(program, env)
+                if run:
+                    # The first run starts the worker processes.
+                    best = min(best, time.perf_counter() - started)
+        finally:
+            use_pool(previous)
+            pool.shutdown()
+        serial = serial or best
+        print(
+            f"{workers:7} {best * 1e3:10.1f} {serial / best:7.2f}x  {result.inspect()}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Lexer and parser throughput on a large generated corpus.
+
+Run from the repository root with ``python -m benchmarks.parse``.
+"""
+
+import argparse
+import time
+
+from benchmarks.reparse import generate
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+from monkeypie.token import TokenKind
+
+
+def lex(source: str) -> int:
+    lexer = Lexer(source)
+    count = 1
+    while lexer.next_token().kind != TokenKind.EOF:
+        count += 1
+    return count
+
+
+def parse(source: str) -> None:
+    Parser(Lexer(source)).parse_program()
+
+
+def best_of(repeat: int, function, source: str) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(source)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--lines", type=int, default=20_000)
+    argparser.add_argument("--repeat", type=int, default=5)
+    argparser.add_argument("--seed", type=int, default=0)
+    args = argparser.parse_args()
+
+    source = generate(args.lines, args.seed)
+    tokens = lex(source)
+    lexing = best_of(args.repeat, lex, source)
+    parsing = best_of(args.repeat, parse, source)
+
+    print(f"{args.lines} lines, {len(source) / 1024:.0f} KiB, {tokens} tokens")
+    print(f"lex:   {lexing * 1000:9.2f} ms  {tokens / lexing:12,.0f} tokens/s")
+    print(f"parse: {parsing * 1000:9.2f} ms  {tokens / parsing:12,.0f} tokens/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Building arrays and hashes one update at a time, persistent vs copying.
+
+Run from the repository root with ``python -m benchmarks.persistent``. For
+growing n, times n appends to a PersistentVector against n copy-and-append
+steps on a tuple, and n insertions into a HashTrie against n copy-and-set
+steps on a dict, which is what immutable Monkey arrays and hashes would cost
+without structural sharing. The per-update column shows the persistent
+structures staying flat where the copies grow linearly with n.
+"""
+
+import argparse
+import time
+from typing import Callable
+
+from monkeypie.persistent import HashTrie, PersistentVector
+
+
+def vector_appends(n: int) -> None:
+    vector: PersistentVector[int] = PersistentVector()
+    for i in range(n):
+        vector = vector.append(i)
+
+
+def tuple_copies(n: int) -> None:
+    items: tuple[int, ...] = ()
+    for i in range(n):
+        items = items + (i,)
+
+
+def trie_sets(n: int) -> None:
+    trie: HashTrie[int, int] = HashTrie()
+    for i in range(n):
+        trie = trie.set(i, i)
+
+
+def dict_copies(n: int) -> None:
+    pairs: dict[int, int] = {}
+    for i in range(n):
+        pairs = {**pairs, i: i}
+
+
+CASES: dict[str, Callable[[int], None]] = {
+    "vector": vector_appends,
+    "tuple copy": tuple_copies,
+    "hash trie": trie_sets,
+    "dict copy": dict_copies,
+}
+
+
+def best_of(run: Callable[[int], None], n: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(n)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--repeat", type=int, default=3)
+    argparser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 4_000, 16_000, 32_000]
+    )
+    args = argparser.parse_args()
+
+    print(f"{'structure':12} {'n':>8} {'total ms':>10} {'per update us':>14}")
+    for name, run in CASES.items():
+        for n in args.sizes:
+            elapsed = best_of(run, n, args.repeat)
+            print(f"{name:12} {n:8} {elapsed * 1e3:10.2f} {elapsed / n * 1e6:14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Time to first output and peak RSS: parse-then-run vs pipelined execution.
+
+Run from the repository root with ``python -m benchmarks.pipeline``. Every mode
+runs in a fresh interpreter so that its peak RSS is measured on its own.
+"""
+
+import argparse
+import random
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.generators import name
+from monkeypie.ast import ExpressionStatement
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.object import Object
+from monkeypie.parser import Parser
+from monkeypie.pipeline import run_pipelined
+
+MODES = ("parse-then-run", "pipelined", "pipelined-threaded")
+
+
+def generate(lines: int, seed: int) -> str:
+    # Unlike benchmarks.reparse.generate the program has to run, so statements
+    # only refer to variables and functions defined on earlier lines.
+    rng = random.Random(seed)
+    out = ["let va = 1;", "let ha = fn(x, y) { x + y };"]
+    variables, functions = [0], [0]
+    for i in range(len(out), lines):
+        a = name("v", rng.choice(variables))
+        f = name("h", rng.choice(functions))
+        match rng.randrange(4):
+            case 0:
+                out.append(f"let {name('v', i)} = {i} * ({a} + {i});")
+                variables.append(i)
+            case 1:
+                out.append(
+                    f"let {name('h', i)} = fn(x, y) {{ if (x < y) {{ return x; }} else {{ y }} }};"
+                )
+                functions.append(i)
+            case 2:
+                out.append(f"{f}({a}, {i} + 1);")
+            case _:
+                out.append(f"-{i} / 2 != {a};")
+    return "\n".join(out) + "\n"
+
+
+def parse_then_run(source: str, on_result) -> None:
+    program = Parser(Lexer(source)).parse_program()
+    assert program is not None
+    evaluator = Evaluator()
+    env = Environment()
+    for statement in program.statements:
+        result = evaluator.evaluate(statement, env)
+        if isinstance(statement, ExpressionStatement):
+            on_result(result)
+
+
+def run(mode: str, lines: int, seed: int) -> None:
+    source = generate(lines, seed)
+    first: list[float] = []
+    outputs = 0
+
+    def on_result(_: Object) -> None:
+        nonlocal outputs
+        if not first:
+            first.append(time.perf_counter())
+        outputs += 1
+
+    started = time.perf_counter()
+    if mode == "parse-then-run":
+        parse_then_run(source, on_result)
+    else:
+        result = run_pipelined(
+            source, on_result=on_result, threaded=mode == "pipelined-threaded"
+        )
+        assert not result.errors, result.errors
+    finished = time.perf_counter()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+    print(
+        f"{mode:20} first output {(first[0] - started) * 1e3:9.2f} ms"
+        f"  total {finished - started:6.2f} s  peak RSS {peak:8.2f} MiB"
+        f"  ({outputs} outputs)"
+    )
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--lines", type=int, default=100_000)
+    argparser.add_argument("--seed", type=int, default=0)
+    argparser.add_argument("--mode", choices=MODES)
+    args = argparser.parse_args()
+
+    if args.mode:
+        run(args.mode, args.lines, args.seed)
+        return
+    print(f"{args.lines} lines")
+    for mode in MODES:
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.pipeline",
+                f"--lines={args.lines}",
+                f"--seed={args.seed}",
+                f"--mode={mode}",
+            ],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
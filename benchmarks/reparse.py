@@ -0,0 +1,60 @@
+"""Single-character edits in a 50k-line file: full parse vs reparse.
+
+Run from the repository root with ``python -m benchmarks.reparse``.
+"""
+
+import argparse
+import random
+import time
+
+from monkeypie.incremental import reparse
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+
+SNIPPETS = [
+    "let a{i} = {i} * (b + {i});",
+    "let f{i} = fn(x, y) {{ if (x < y) {{ return x; }} else {{ y }} }};",
+    "f{i}(a{i}, {i} + 1, !true);",
+    "-{i} / 2 != {i};",
+]
+
+
+def generate(lines: int, seed: int) -> str:
+    rng = random.Random(seed)
+    return "\n".join(rng.choice(SNIPPETS).format(i=i) for i in range(lines)) + "\n"
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--lines", type=int, default=50_000)
+    argparser.add_argument("--edits", type=int, default=50)
+    argparser.add_argument("--seed", type=int, default=0)
+    args = argparser.parse_args()
+
+    source = generate(args.lines, args.seed)
+    rng = random.Random(args.seed)
+
+    started = time.perf_counter()
+    program = Parser(Lexer(source)).parse_program()
+    full = time.perf_counter() - started
+    assert program is not None
+
+    timings: list[float] = []
+    for _ in range(args.edits):
+        position = rng.randrange(len(source))
+        while not source[position].isdigit():
+            position += 1
+        started = time.perf_counter()
+        program = reparse(program, source, (position, position), "7")
+        timings.append(time.perf_counter() - started)
+        source = source[:position] + "7" + source[position:]
+
+    timings.sort()
+    print(f"{args.lines} lines, {len(source) / 1024:.0f} KiB")
+    print(f"full parse:      {full * 1000:9.2f} ms")
+    print(f"reparse median:  {timings[len(timings) // 2] * 1000:9.2f} ms")
+    print(f"reparse max:     {timings[-1] * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Load test for monkeypie.server: request latency under concurrent clients.
+
+Run from the repository root with ``python -m benchmarks.server``. Without
+--port or --unix a server is started in-process on an ephemeral port.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from monkeypie.server import MAX_LINE_LENGTH, EvaluationServer
+
+SOURCES = [
+    "let x = {i}; x * 2",
+    "let fib = fn(n) {{ if (n < 2) {{ return n; }} fib(n - 1) + fib(n - 2) }}; fib({n})",
+    "if ({i} > 5) {{ {i} }} else {{ -{i} }}",
+]
+
+
+async def client(
+    connect, requests: int, distinct: int, latencies: list[float], client_id: int
+) -> None:
+    reader, writer = await connect()
+    try:
+        for i in range(requests):
+            source = SOURCES[i % len(SOURCES)].format(
+                i=(client_id + i) % distinct, n=10 + i % 5
+            )
+            started = time.perf_counter()
+            writer.write(json.dumps({"id": i, "source": source}).encode() + b"\n")
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - started)
+            assert response["id"] == i and "result" in response, response
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run(args: argparse.Namespace) -> None:
+    server = None
+    if args.unix:
+        path = args.unix
+
+        def connect():
+            return asyncio.open_unix_connection(path, limit=MAX_LINE_LENGTH)
+    else:
+        host, port = args.host, args.port
+        if port is None:
+            server = EvaluationServer(args.workers)
+            listener = await server.start(host, 0)
+            port = listener.sockets[0].getsockname()[1]
+
+        def connect():
+            return asyncio.open_connection(host, port, limit=MAX_LINE_LENGTH)
+
+    latencies: list[float] = []
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            client(connect, args.requests, args.distinct, latencies, c)
+            for c in range(args.clients)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    if server is not None:
+        listener.close()
+        server.close()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{args.clients} clients x {args.requests} requests:"
+        f" {len(latencies) / elapsed:8.0f} requests/s"
+        f"  p50 {percentiles[49] * 1e3:7.2f} ms  p99 {percentiles[98] * 1e3:7.2f} ms"
+    )
+    if server is not None:
+        print(
+            f"prepared program cache: {len(server.cache)} programs, {server.cache.hits} hits"
+        )
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--host", default="127.0.0.1")
+    argparser.add_argument("--port", type=int)
+    argparser.add_argument("--unix", metavar="PATH")
+    argparser.add_argument("--workers", type=int, default=4)
+    argparser.add_argument("--clients", type=int, default=50)
+    argparser.add_argument("--requests", type=int, default=200)
+    argparser.add_argument(
+        "--distinct", type=int, default=10, help="distinct values of {i} in SOURCES"
+    )
+    args = argparser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
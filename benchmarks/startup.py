@@ -0,0 +1,69 @@
+"""Time to the first REPL prompt, with and without the prelude snapshot.
+
+Run from the repository root with ``python -m benchmarks.startup``. Starts
+the REPL --repeat times per mode and reports the time until its first prompt
+is written, with the prelude loaded from its snapshot and, as the baseline,
+parsed and evaluated from source. --command times another command instead of
+``python repl.py``, such as the executable built from monkey.spec in
+``dist/monkey``, which only has the snapshot and so needs
+``--modes snapshot``.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from monkeypie import prelude
+
+PROMPT = b">> "
+
+MODES = {
+    "snapshot": {},
+    "source": {"MONKEYPIE_PRELUDE_SNAPSHOT_DISABLED": "1"},
+}
+
+
+def first_prompt(command: list[str], env: dict[str, str]) -> float:
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env
+    )
+    assert process.stdout is not None and process.stdin is not None
+    output = b""
+    while not output.endswith(PROMPT):
+        byte = process.stdout.read(1)
+        if not byte:
+            raise RuntimeError(f"{command} exited before prompting: {output!r}")
+        output += byte
+    elapsed = time.perf_counter() - started
+    process.stdin.close()
+    process.wait()
+    return elapsed
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--command", nargs="+", default=[sys.executable, "repl.py"])
+    argparser.add_argument(
+        "--modes", nargs="+", choices=list(MODES), default=list(MODES)
+    )
+    argparser.add_argument("--repeat", type=int, default=20)
+    args = argparser.parse_args()
+
+    prelude.build()
+    print(" ".join(args.command))
+    print(f"{'prelude':8} {'min ms':>8} {'median ms':>10}")
+    for mode in args.modes:
+        env = {**os.environ, **MODES[mode]}
+        timings = [first_prompt(args.command, env) for _ in range(args.repeat)]
+        print(
+            f"{mode:8} {min(timings) * 1e3:8.1f}"
+            f" {statistics.median(timings) * 1e3:10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Peak memory of parse_program() against consuming iter_statements().
+
+Run from the repository root with ``python -m benchmarks.streaming``.
+"""
+
+import argparse
+import tracemalloc
+
+from benchmarks.reparse import generate
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+
+
+def whole_program(source: str) -> int:
+    program = Parser(Lexer(source)).parse_program()
+    assert program is not None
+    return len(program.statements)
+
+
+def streamed(source: str) -> int:
+    count = 0
+    for statement, _ in Parser(Lexer(source)).iter_statements():
+        count += statement is not None
+    return count
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--lines", type=int, default=20_000)
+    argparser.add_argument("--seed", type=int, default=0)
+    args = argparser.parse_args()
+
+    source = generate(args.lines, args.seed)
+    print(f"{args.lines} lines, {len(source) / 2**20:.2f} MiB of source")
+    for name, function in (
+        ("parse_program", whole_program),
+        ("iter_statements", streamed),
+    ):
+        tracemalloc.start()
+        function(source)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:16} peak {peak / 2**20:8.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
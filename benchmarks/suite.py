@@ -0,0 +1,162 @@
+"""Front-end benchmark suite over the shapes in benchmarks.generators.
+
+Run from the repository root with ``python -m benchmarks.suite``. Results are
+printed as JSON and can be saved with --output; --compare reads a saved
+baseline and exits with status 1 if any metric regressed by more than
+--threshold.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from benchmarks.generators import GENERATORS
+from monkeypie.ast import Node
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+from monkeypie.token import TokenKind
+
+# Whether a larger value of each metric is an improvement.
+HIGHER_IS_BETTER = {
+    "lex_tokens_per_s": True,
+    "parse_nodes_per_s": True,
+    "parse_peak_bytes": False,
+    "parser_construction_us": False,
+}
+
+
+def count_tokens(source: str) -> int:
+    lexer = Lexer(source)
+    count = 1
+    while lexer.next_token().kind != TokenKind.EOF:
+        count += 1
+    return count
+
+
+def count_nodes(root: Node) -> int:
+    count = 0
+    stack: list[object] = [root]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, Node):
+            count += 1
+            stack.extend(vars(item).values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return count
+
+
+def parse(source: str) -> Node:
+    program = Parser(Lexer(source)).parse_program()
+    assert program is not None
+    return program
+
+
+def best_of(repeat: int, function: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def peak_memory(function: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_shape(source: str, repeat: int) -> dict[str, float]:
+    tokens = count_tokens(source)
+    nodes = count_nodes(parse(source))
+    return {
+        "lex_tokens_per_s": tokens / best_of(repeat, lambda: count_tokens(source)),
+        "parse_nodes_per_s": nodes / best_of(repeat, lambda: parse(source)),
+        "parse_peak_bytes": peak_memory(lambda: parse(source)),
+    }
+
+
+def measure_construction(repeat: int, number: int = 1000) -> float:
+    def construct() -> None:
+        for _ in range(number):
+            Parser(Lexer(""))
+
+    return best_of(repeat, construct) / number * 1e6
+
+
+def run(size: int, seed: int, repeat: int) -> dict[str, Any]:
+    results: dict[str, dict[str, float]] = {}
+    for shape, generate in GENERATORS.items():
+        results[shape] = measure_shape(generate(random.Random(seed), size), repeat)
+    results["parser"] = {"parser_construction_us": measure_construction(repeat)}
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "size": size,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> list[str]:
+    """Print every metric against baseline and return the regressions."""
+    regressions = []
+    for shape, metrics in current["results"].items():
+        for metric, value in metrics.items():
+            old = baseline["results"].get(shape, {}).get(metric)
+            if not old:
+                print(f"{shape:14} {metric:24} {value:16,.1f}  (new)")
+                continue
+            change = value / old - 1
+            worse = -change if HIGHER_IS_BETTER[metric] else change
+            flag = "REGRESSION" if worse > threshold else ""
+            print(
+                f"{shape:14} {metric:24} {old:16,.1f} -> {value:16,.1f}"
+                f"  {change:+7.1%}  {flag}"
+            )
+            if flag:
+                regressions.append(f"{shape}.{metric}")
+    return regressions
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--size", type=int, default=200_000)
+    argparser.add_argument("--seed", type=int, default=0)
+    argparser.add_argument("--repeat", type=int, default=5)
+    argparser.add_argument("--output", metavar="PATH", help="save the results")
+    argparser.add_argument("--compare", metavar="PATH", help="baseline to compare")
+    argparser.add_argument("--threshold", type=float, default=0.10)
+    args = argparser.parse_args()
+
+    current = run(args.size, args.seed, args.repeat)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(current, file, indent=2)
+    if not args.compare:
+        print(json.dumps(current, indent=2))
+        return
+
+    with open(args.compare) as file:
+        baseline = json.load(file)
+    if (baseline["size"], baseline["seed"]) != (args.size, args.seed):
+        print("warning: baseline was generated with a different --size or --seed")
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regressions: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Memory retained by a parsed program with and without shared identifiers.
+
+Run from the repository root with ``python -m benchmarks.symbols``.
+"""
+
+import argparse
+import random
+import string
+import tracemalloc
+
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+from monkeypie.symbols import SymbolTable
+
+
+class PerOccurrenceSymbolTable(SymbolTable):
+    """Hands every occurrence its own string, as the lexer used to."""
+
+    def intern(self, name: str) -> tuple[str, int]:
+        return name, super().intern(name)[1]
+
+
+def generate(lines: int, names: int, seed: int) -> str:
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(6, 16)))
+        for _ in range(names)
+    ]
+    out = []
+    for _ in range(lines):
+        a, b, c, d = (rng.choice(vocabulary) for _ in range(4))
+        out.append(
+            rng.choice(
+                [
+                    f"let {a} = {b} + {c} * {d};",
+                    f"let {a} = fn({b}, {c}) {{ {b} * {c} - {d} }};",
+                    f"{a}({b}, {c}({d}, {b}));",
+                ]
+            )
+        )
+    return "\n".join(out)
+
+
+def retained(source: str, symbols: SymbolTable) -> int:
+    tracemalloc.start()
+    program = Parser(Lexer(source, symbols=symbols)).parse_program()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del program
+    return size
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--lines", type=int, default=20_000)
+    argparser.add_argument("--names", type=int, default=500)
+    argparser.add_argument("--seed", type=int, default=0)
+    args = argparser.parse_args()
+
+    source = generate(args.lines, args.names, args.seed)
+    shared = retained(source, SymbolTable())
+    per_occurrence = retained(source, PerOccurrenceSymbolTable())
+
+    kib = len(source) / 1024
+    print(f"{args.lines} lines, {args.names} names, {kib:.0f} KiB")
+    print(f"per occurrence: {per_occurrence / 2**20:8.2f} MiB")
+    print(f"interned:       {shared / 2**20:8.2f} MiB")
+    saved = per_occurrence - shared
+    print(
+        f"saved:          {saved / 2**20:8.2f} MiB "
+        f"({saved / per_occurrence:.1%}, {saved / kib:.0f} B per source KiB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
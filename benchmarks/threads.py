@@ -0,0 +1,46 @@
+"""Parser throughput with 1..N threads parsing independent sources.
+
+Run from the repository root with ``python -m benchmarks.threads``. Throughput
+only scales on a free-threaded build; with the GIL it shows the locking cost.
+"""
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.reparse import generate
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+
+
+def parse(source: str) -> None:
+    Parser(Lexer(source)).parse_program()
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--lines", type=int, default=2_000)
+    argparser.add_argument("--jobs", type=int, default=32)
+    argparser.add_argument("--max-threads", type=int, default=8)
+    argparser.add_argument("--seed", type=int, default=0)
+    args = argparser.parse_args()
+
+    sources = [generate(args.lines, args.seed + job) for job in range(args.jobs)]
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"{args.jobs} sources of {args.lines} lines, GIL enabled: {is_gil_enabled}")
+
+    threads = 1
+    baseline = 0.0
+    while threads <= args.max_threads:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(threads) as executor:
+            list(executor.map(parse, sources))
+        rate = args.jobs * args.lines / (time.perf_counter() - started)
+        baseline = baseline or rate
+        print(f"{threads:3} threads {rate:12,.0f} lines/s  x{rate / baseline:.2f}")
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,18 @@
 # -*- mode: python ; coding: utf-8 -*-
+import sys
+
+sys.path.insert(0, SPECPATH)
+from monkeypie import prelude
+
+# The executable bundles the prelude pre-evaluated, without its source.
+prelude.build()
 
 
 a = Analysis(
     ['repl.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[(prelude.SNAPSHOT, 'monkeypie')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
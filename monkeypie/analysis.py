@@ -0,0 +1,98 @@
+from monkeypie.ast import (
+    ArrayLiteralExpression,
+    BlockStatement,
+    BooleanLiteralExpression,
+    CallExpression,
+    ExpressionStatement,
+    FunctionLiteralExpression,
+    HashLiteralExpression,
+    IdentifierExpression,
+    IfExpression,
+    ImportStatement,
+    IndexExpression,
+    InfixExpression,
+    IntegerLiteralExpression,
+    LetStatement,
+    Node,
+    PrefixExpression,
+    ProgramNode,
+    ReturnStatement,
+)
+from monkeypie.hashcons import SubtreeCache
+
+EMPTY: frozenset[str] = frozenset()
+
+
+def free_identifiers(
+    node: Node | None, cache: SubtreeCache[frozenset[str]] | None = None
+) -> frozenset[str]:
+    """Return the names node may resolve outside of itself.
+
+    Function parameters and names bound by an earlier let in the same block are
+    not free. A let's own name counts as free in its value, which makes the
+    result a superset for recursive functions.
+    """
+    if node is None:
+        return EMPTY
+    if cache is not None and (cached := cache.get(node)) is not None:
+        return cached
+
+    free: frozenset[str]
+    match node:
+        case IdentifierExpression():
+            free = frozenset((node.value,))
+        case IntegerLiteralExpression() | BooleanLiteralExpression():
+            free = EMPTY
+        case PrefixExpression():
+            free = free_identifiers(node.right, cache)
+        case InfixExpression():
+            free = free_identifiers(node.left, cache) | free_identifiers(
+                node.right, cache
+            )
+        case IfExpression():
+            free = (
+                free_identifiers(node.condition, cache)
+                | free_identifiers(node.consequence, cache)
+                | free_identifiers(node.alternative, cache)
+            )
+        case FunctionLiteralExpression():
+            free = free_identifiers(node.body, cache) - {
+                p.value for p in node.parameters
+            }
+        case CallExpression():
+            free = free_identifiers(node.function, cache).union(
+                *(free_identifiers(a, cache) for a in node.arguments)
+            )
+        case ArrayLiteralExpression():
+            free = EMPTY.union(*(free_identifiers(e, cache) for e in node.elements))
+        case HashLiteralExpression():
+            free = EMPTY.union(
+                *(free_identifiers(k, cache) for k in node.keys),
+                *(free_identifiers(v, cache) for v in node.values),
+            )
+        case IndexExpression():
+            free = free_identifiers(node.left, cache) | free_identifiers(
+                node.index, cache
+            )
+        case ExpressionStatement():
+            free = free_identifiers(node.expression, cache)
+        case ReturnStatement():
+            free = free_identifiers(node.return_value, cache)
+        case LetStatement():
+            free = free_identifiers(node.value, cache)
+        case ImportStatement():
+            free = EMPTY
+        case BlockStatement() | ProgramNode():
+            names: set[str] = set()
+            bound: set[str] = set()
+            for statement in node.statements:
+                names |= free_identifiers(statement, cache) - bound
+                if isinstance(statement, LetStatement):
+                    bound.add(statement.name.value)
+            free = frozenset(names)
+        case _:
+            raise TypeError(f"unexpected node {type(node).__name__}")
+
+    if cache is not None:
+        cache.put(node, free)
+    return free
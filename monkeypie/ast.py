@@ -1,13 +1,61 @@
 from abc import ABCMeta, abstractmethod
+from typing import TYPE_CHECKING
 
+from monkeypie.symbols import SymbolTable
 from monkeypie.token import Token, TokenType
 
+if TYPE_CHECKING:
+    from monkeypie.inline_cache import CallSiteCache
+    from monkeypie.modules import Module
+
 
 class Node(metaclass=ABCMeta):
+    token: Token
+    last_token: Token | None = None
+    # Computed on first use: nodes are not changed once parsed.
+    _hash: int | None = None
+
+    @property
+    def start(self) -> int:
+        return self.token.start
+
+    @property
+    def end(self) -> int:
+        return (self.last_token or self.token).end
+
     @abstractmethod
     def token_literal(self) -> str:
         raise NotImplementedError
 
+    @abstractmethod
+    def structure(self) -> tuple:
+        """Return the fields that structural equality and hashing compare.
+
+        Source positions are left out, so equal nodes may come from different
+        places in the input.
+        """
+        raise NotImplementedError
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        return (
+            isinstance(other, Node)
+            and type(self) is type(other)
+            and self.structure() == other.structure()
+        )
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash((type(self), self.structure()))
+        return self._hash
+
+    def __getstate__(self) -> dict:
+        # String hashes differ from one process to the next.
+        state = self.__dict__.copy()
+        state.pop("_hash", None)
+        return state
+
     @abstractmethod
     def __str__(self) -> str:
         return ""
@@ -32,22 +80,41 @@ class ExpressionNode(Node, metaclass=ABCMeta):
 class ProgramNode(Node):
     def __init__(self) -> None:
         self.statements: list[StatementNode] = []
+        self.tokens: list[Token] = []
+        self.symbols: SymbolTable | None = None
+        # Whether pure expressions were shared by an InternTable.
+        self.hash_consed = False
+
+    @property
+    def start(self) -> int:
+        return self.statements[0].start if self.statements else 0
+
+    @property
+    def end(self) -> int:
+        return self.statements[-1].end if self.statements else 0
 
     def token_literal(self) -> str:
         return "".join([str(s) for s in self.statements])
 
+    def structure(self) -> tuple:
+        return tuple(self.statements)
+
     def __str__(self) -> str:
         return "".join(str(s) for s in self.statements)
 
 
 class IdentifierExpression(ExpressionNode):
-    def __init__(self, token=Token(TokenType.ILLEGAL, ""), value: str = ""):
-        self.token = token
+    def __init__(self, token: Token | None = None, value: str = ""):
+        self.token = token or Token(TokenType.ILLEGAL, "")
         self.value = value
+        self.symbol: int = self.token.symbol
 
     def token_literal(self) -> str:
         return self.token.literal
 
+    def structure(self) -> tuple:
+        return (self.value,)
+
     def __str__(self) -> str:
         return self.value
 
@@ -55,14 +122,17 @@ class IdentifierExpression(ExpressionNode):
 class LetStatement(StatementNode):
     def __init__(
         self,
-        token: Token = Token(TokenType.ILLEGAL, ""),
-        name: IdentifierExpression = IdentifierExpression(),
+        token: Token | None = None,
+        name: IdentifierExpression | None = None,
         value: ExpressionNode | None = None,
     ):
-        super().__init__(token)
-        self.name = name
+        super().__init__(token or Token(TokenType.ILLEGAL, ""))
+        self.name = name or IdentifierExpression()
         self.value = value
 
+    def structure(self) -> tuple:
+        return (self.name, self.value)
+
     def __str__(self) -> str:
         return f"{self.token_literal()} {self.name}{' = '+str(self.value) if self.value else ''};"
 
@@ -70,37 +140,60 @@ class LetStatement(StatementNode):
 class ReturnStatement(StatementNode):
     def __init__(
         self,
-        token=Token(TokenType.ILLEGAL, ""),
+        token: Token | None = None,
         return_value: ExpressionNode | None = None,
     ):
-        super().__init__(token)
+        super().__init__(token or Token(TokenType.ILLEGAL, ""))
         self.return_value = return_value
 
+    def structure(self) -> tuple:
+        return (self.return_value,)
+
     def __str__(self) -> str:
         return f"{self.token_literal()}{' '+str(self.return_value) if self.return_value else ''};"
 
 
+class ImportStatement(StatementNode):
+    def __init__(self, token: Token | None = None, path: str = ""):
+        super().__init__(token or Token(TokenType.ILLEGAL, ""))
+        self.path = path
+        # The module path names, once a ModuleLoader has loaded it.
+        self.module: "Module | None" = None
+
+    def structure(self) -> tuple:
+        return (self.path,)
+
+    def __str__(self) -> str:
+        return f'{self.token_literal()} "{self.path}";'
+
+
 class ExpressionStatement(StatementNode):
     def __init__(
         self,
-        token=Token(TokenType.ILLEGAL, ""),
+        token: Token | None = None,
         expression: ExpressionNode | None = None,
     ):
-        super().__init__(token)
+        super().__init__(token or Token(TokenType.ILLEGAL, ""))
         self.expression = expression
 
+    def structure(self) -> tuple:
+        return (self.expression,)
+
     def __str__(self) -> str:
         return str(self.expression) if self.expression else ""
 
 
 class IntegerLiteralExpression(ExpressionNode):
-    def __init__(self, token=Token(TokenType.ILLEGAL, ""), value: int = 0):
-        self.token = token
+    def __init__(self, token: Token | None = None, value: int = 0):
+        self.token = token or Token(TokenType.ILLEGAL, "")
         self.value: int = value
 
     def token_literal(self) -> str:
         return self.token.literal
 
+    def structure(self) -> tuple:
+        return (self.token.literal,)
+
     def __str__(self) -> str:
         return self.token.literal
 
@@ -108,17 +201,20 @@ class IntegerLiteralExpression(ExpressionNode):
 class PrefixExpression(ExpressionNode):
     def __init__(
         self,
-        token=Token(TokenType.ILLEGAL, ""),
+        token: Token | None = None,
         operator: str = "",
         right: ExpressionNode | None = None,
     ):
-        self.token = token
+        self.token = token or Token(TokenType.ILLEGAL, "")
         self.operator = operator
         self.right = right
 
     def token_literal(self) -> str:
         return self.token.literal
 
+    def structure(self) -> tuple:
+        return (self.operator, self.right)
+
     def __str__(self) -> str:
         return f"({self.operator}{str(self.right)})"
 
@@ -126,12 +222,12 @@ class PrefixExpression(ExpressionNode):
 class InfixExpression(ExpressionNode):
     def __init__(
         self,
-        token=Token(TokenType.ILLEGAL, ""),
+        token: Token | None = None,
         left: ExpressionNode | None = None,
         operator: str = "",
         right: ExpressionNode | None = None,
     ):
-        self.token = token
+        self.token = token or Token(TokenType.ILLEGAL, "")
         self.left = left
         self.operator = operator
         self.right = right
@@ -139,32 +235,43 @@ class InfixExpression(ExpressionNode):
     def token_literal(self) -> str:
         return self.token.literal
 
+    @property
+    def start(self) -> int:
+        return self.left.start if self.left else self.token.start
+
+    def structure(self) -> tuple:
+        return (self.left, self.operator, self.right)
+
     def __str__(self) -> str:
         return f"({str(self.left)} {str(self.operator)} {str(self.right)})"
 
 
 class BooleanLiteralExpression(ExpressionNode):
-    def __init__(
-        self, token: Token = Token(TokenType.ILLEGAL, ""), value: bool = False
-    ):
-        self.token = token
+    def __init__(self, token: Token | None = None, value: bool = False):
+        self.token = token or Token(TokenType.ILLEGAL, "")
         self.value = value
 
     def token_literal(self) -> str:
         return self.token.literal
 
+    def structure(self) -> tuple:
+        return (self.value,)
+
     def __str__(self) -> str:
         return self.token.literal
 
 
 class BlockStatement(StatementNode):
-    def __init__(self, token: Token = Token(TokenType.ILLEGAL, "")):
-        super().__init__(token)
+    def __init__(self, token: Token | None = None):
+        super().__init__(token or Token(TokenType.ILLEGAL, ""))
         self.statements: list[StatementNode] = []
 
     def token_literal(self) -> str:
         return self.token.literal
 
+    def structure(self) -> tuple:
+        return tuple(self.statements)
+
     def __str__(self) -> str:
         return "".join(str(s) for s in self.statements)
 
@@ -172,19 +279,22 @@ class BlockStatement(StatementNode):
 class IfExpression(ExpressionNode):
     def __init__(
         self,
-        token: Token = Token(TokenType.ILLEGAL, ""),
+        token: Token | None = None,
         condition: ExpressionNode | None = None,
-        consequence: BlockStatement = BlockStatement(),
+        consequence: BlockStatement | None = None,
         alternative: BlockStatement | None = None,
     ):
-        self.token = token
+        self.token = token or Token(TokenType.ILLEGAL, "")
         self.condition = condition
-        self.consequence = consequence
+        self.consequence = consequence or BlockStatement()
         self.alternative = alternative
 
     def token_literal(self) -> str:
         return self.token.literal
 
+    def structure(self) -> tuple:
+        return (self.condition, self.consequence, self.alternative)
+
     def __str__(self) -> str:
         out = f"if {str(self.condition)} {str(self.consequence)}"
         if self.alternative:
@@ -195,17 +305,20 @@ class IfExpression(ExpressionNode):
 class FunctionLiteralExpression(ExpressionNode):
     def __init__(
         self,
-        token: Token = Token(TokenType.ILLEGAL, ""),
-        parameters: list[IdentifierExpression] = [],
-        body: BlockStatement = BlockStatement(),
+        token: Token | None = None,
+        parameters: list[IdentifierExpression] | None = None,
+        body: BlockStatement | None = None,
     ):
-        self.token = token
-        self.parameters = parameters
-        self.body = body
+        self.token = token or Token(TokenType.ILLEGAL, "")
+        self.parameters = [] if parameters is None else parameters
+        self.body = body or BlockStatement()
 
     def token_literal(self) -> str:
         return self.token.literal
 
+    def structure(self) -> tuple:
+        return (tuple(self.parameters), self.body)
+
     def __str__(self) -> str:
         return f"{self.token.literal}({', '.join(str(p) for p in self.parameters)}) {str(self.body)}"
 
@@ -213,16 +326,92 @@ class FunctionLiteralExpression(ExpressionNode):
 class CallExpression(ExpressionNode):
     def __init__(
         self,
-        token: Token = Token(TokenType.ILLEGAL, ""),
+        token: Token | None = None,
         function: ExpressionNode | None = None,
-        arguments: list[ExpressionNode] = [],
+        arguments: list[ExpressionNode] | None = None,
     ):
-        self.token = token
+        self.token = token or Token(TokenType.ILLEGAL, "")
         self.function = function
-        self.arguments = arguments
+        self.arguments = [] if arguments is None else arguments
+        self.inline_cache: "CallSiteCache | None" = None
 
     def token_literal(self) -> str:
         return self.token.literal
 
+    @property
+    def start(self) -> int:
+        return self.function.start if self.function else self.token.start
+
+    def structure(self) -> tuple:
+        return (self.function, tuple(self.arguments))
+
     def __str__(self) -> str:
         return f"{str(self.function)}({', '.join(str(a) for a in self.arguments)})"
+
+
+class ArrayLiteralExpression(ExpressionNode):
+    def __init__(
+        self,
+        token: Token | None = None,
+        elements: list[ExpressionNode] | None = None,
+    ):
+        self.token = token or Token(TokenType.ILLEGAL, "")
+        self.elements = [] if elements is None else elements
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def structure(self) -> tuple:
+        return tuple(self.elements)
+
+    def __str__(self) -> str:
+        return f"[{', '.join(str(e) for e in self.elements)}]"
+
+
+class IndexExpression(ExpressionNode):
+    def __init__(
+        self,
+        token: Token | None = None,
+        left: ExpressionNode | None = None,
+        index: ExpressionNode | None = None,
+    ):
+        self.token = token or Token(TokenType.ILLEGAL, "")
+        self.left = left
+        self.index = index
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    @property
+    def start(self) -> int:
+        return self.left.start if self.left else self.token.start
+
+    def structure(self) -> tuple:
+        return (self.left, self.index)
+
+    def __str__(self) -> str:
+        return f"({str(self.left)}[{str(self.index)}])"
+
+
+class HashLiteralExpression(ExpressionNode):
+    """A hash literal, its pairs kept as parallel lists in source order."""
+
+    def __init__(
+        self,
+        token: Token | None = None,
+        keys: list[ExpressionNode] | None = None,
+        values: list[ExpressionNode] | None = None,
+    ):
+        self.token = token or Token(TokenType.ILLEGAL, "")
+        self.keys = [] if keys is None else keys
+        self.values = [] if values is None else values
+
+    def token_literal(self) -> str:
+        return self.token.literal
+
+    def structure(self) -> tuple:
+        return (tuple(self.keys), tuple(self.values))
+
+    def __str__(self) -> str:
+        pairs = (f"{str(k)}:{str(v)}" for k, v in zip(self.keys, self.values))
+        return f"{{{', '.join(pairs)}}}"
@@ -0,0 +1,229 @@
+"""Execution engine benchmarks: ``monkey bench``.
+
+Runs a fixed corpus of Monkey workloads through every registered execution
+backend and prints wall time, peak traced memory and per-call overhead for
+each. Backends are registered with register_backend(); a backend prepares a
+source once and returns a function that runs it and returns its value.
+"""
+
+import argparse
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+from typing import Callable
+
+from monkeypie.ast import ProgramNode
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.limits import LimitedEvaluator, Limits
+from monkeypie.object import Object
+from monkeypie.optimizer import optimize
+from monkeypie.parser import Parser
+from monkeypie.pipeline import run_pipelined
+from monkeypie.tiered import TieredEvaluator
+
+Run = Callable[[], Object]
+PrepareFn = Callable[[str], Run]
+
+BACKENDS: dict[str, PrepareFn] = {}
+
+
+def register_backend(name: str, prepare: PrepareFn) -> None:
+    BACKENDS[name] = prepare
+
+
+def _parse(source: str) -> ProgramNode:
+    parser = Parser(Lexer(source))
+    program = parser.parse_program()
+    if parser.errors() or program is None:
+        raise ValueError("\n".join(parser.errors()))
+    return program
+
+
+def prepare_evaluator(source: str) -> Run:
+    program = _parse(source)
+    evaluator = Evaluator()
+    return lambda: evaluator.evaluate(program, Environment())
+
+
+def prepare_uncached(source: str) -> Run:
+    program = _parse(source)
+    evaluator = Evaluator(inline_caches=False)
+    return lambda: evaluator.evaluate(program, Environment())
+
+
+def prepare_optimized(source: str) -> Run:
+    program = optimize(_parse(source))
+    evaluator = Evaluator()
+    return lambda: evaluator.evaluate(program, Environment())
+
+
+def prepare_tiered(source: str) -> Run:
+    # Warmup runs compile the hot functions, which stay compiled across runs
+    # as their tiers are kept by the evaluator.
+    program = _parse(source)
+    evaluator = TieredEvaluator()
+    return lambda: evaluator.evaluate(program, Environment())
+
+
+def prepare_metered(source: str) -> Run:
+    # Limits that are never hit, to measure the cost of metering alone.
+    program = _parse(source)
+    evaluator = LimitedEvaluator(Limits(fuel=10**12, max_depth=10**6, timeout=3600))
+
+    def run() -> Object:
+        evaluator.reset()
+        return evaluator.evaluate(program, Environment())
+
+    return run
+
+
+def prepare_pipelined(source: str) -> Run:
+    # Parsing is part of every run, as the pipeline interleaves it with
+    # evaluation.
+    return lambda: run_pipelined(source).value
+
+
+register_backend("evaluator", prepare_evaluator)
+register_backend("uncached", prepare_uncached)
+register_backend("optimized", prepare_optimized)
+register_backend("tiered", prepare_tiered)
+register_backend("metered", prepare_metered)
+register_backend("pipelined", prepare_pipelined)
+
+
+def arithmetic(statements: int = 100, terms: int = 200, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(statements):
+        expression = str(rng.randrange(1, 100))
+        for _ in range(terms):
+            operator = rng.choice(["+", "-", "*", "/"])
+            expression += f" {operator} {rng.randrange(1, 100)}"
+        out.append(f"{expression};")
+    return "\n".join(out)
+
+
+WORKLOADS: dict[str, str] = {
+    "fib": """
+        let fib = fn(n) { if (n < 2) { return n; } fib(n - 1) + fib(n - 2) };
+        fib(18);
+    """,
+    "closures": """
+        let make = fn(n) { let base = n * 2; fn(x) { fn(y) { base + x + y } } };
+        let run = fn(lo, hi) {
+            if (lo == hi) { make(lo)(1)(2) } else {
+                let mid = (lo + hi) / 2;
+                run(lo, mid) + run(mid + 1, hi)
+            }
+        };
+        run(1, 3000);
+    """,
+    "map_reduce": """
+        let mapreduce = fn(m, r, lo, hi) {
+            if (lo == hi) { m(lo) } else {
+                let mid = (lo + hi) / 2;
+                r(mapreduce(m, r, lo, mid), mapreduce(m, r, mid + 1, hi))
+            }
+        };
+        mapreduce(fn(x) { x * x }, fn(a, b) { a + b }, 1, 3000);
+    """,
+    "helpers": """
+        let add = fn(a, b) { a + b };
+        let mul = fn(a, b) { a * b };
+        let inc = fn(x) { x + 1 };
+        let square = fn(x) { mul(x, x) };
+        let max = fn(a, b) { if (a > b) { a } else { b } };
+        let sum = fn(lo, hi) {
+            if (lo == hi) { return add(square(lo), inc(max(lo, 3))); }
+            let mid = (lo + hi) / 2;
+            add(sum(lo, mid), sum(inc(mid), hi))
+        };
+        sum(1, 3000);
+    """,
+    "arithmetic": arithmetic(),
+}
+
+# Per-call overhead is the time difference between CALLS top-level calls of
+# an identity function and as many bare literals, divided by CALLS.
+CALLS = 5000
+CALL_OVERHEAD_BASE = "let id = fn(x) { x };\n" + "1;\n" * CALLS
+CALL_OVERHEAD_CALLS = "let id = fn(x) { x };\n" + "id(1);\n" * CALLS
+
+
+def time_runs(run: Run, repeat: int, warmup: int) -> list[float]:
+    for _ in range(warmup):
+        run()
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def peak_memory(run: Run) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def call_overhead(prepare: PrepareFn, repeat: int, warmup: int) -> float:
+    base = min(time_runs(prepare(CALL_OVERHEAD_BASE), repeat, warmup))
+    calls = min(time_runs(prepare(CALL_OVERHEAD_CALLS), repeat, warmup))
+    return (calls - base) / CALLS
+
+
+def main(argv: list[str] | None = None) -> None:
+    argparser = argparse.ArgumentParser(prog="monkey bench", description=__doc__)
+    argparser.add_argument(
+        "--engine",
+        action="append",
+        choices=sorted(BACKENDS),
+        help="backend to run, may be repeated (default: all)",
+    )
+    argparser.add_argument(
+        "--workload",
+        action="append",
+        choices=sorted(WORKLOADS),
+        help="workload to run, may be repeated (default: all)",
+    )
+    argparser.add_argument("--repeat", type=int, default=5)
+    argparser.add_argument("--warmup", type=int, default=1)
+    args = argparser.parse_args(argv)
+    engines = args.engine or list(BACKENDS)
+    workloads = args.workload or list(WORKLOADS)
+
+    print(
+        f"{'workload':12} {'engine':12} {'best ms':>10} {'median ms':>10}"
+        f" {'peak KiB':>10}  result"
+    )
+    for workload in workloads:
+        results = set()
+        for engine in engines:
+            run = BACKENDS[engine](WORKLOADS[workload])
+            timings = time_runs(run, args.repeat, args.warmup)
+            result = run().inspect()
+            results.add(result)
+            print(
+                f"{workload:12} {engine:12} {min(timings) * 1e3:10.2f}"
+                f" {statistics.median(timings) * 1e3:10.2f}"
+                f" {peak_memory(run) / 1024:10.0f}  {result}"
+            )
+        if len(results) > 1:
+            print(f"warning: engines disagree on {workload}")
+    for engine in engines:
+        overhead = call_overhead(BACKENDS[engine], args.repeat, args.warmup)
+        print(f"{'call':12} {engine:12} {overhead * 1e6:10.2f} us per call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Builtin functions, resolved by name where no binding in scope shadows them.
+
+Builtins are registered with register_builtin() and called with the evaluated
+arguments of a call, one Python argument per Monkey argument, after the
+evaluator for higher-order builtins; the evaluator checks the number of
+arguments against the function's signature before calling it. None of the
+array builtins copy the elements of an array: rest() returns a view of the
+same elements and push() appends to a persistent vector.
+"""
+
+from typing import Callable
+
+from monkeypie.object import NULL, Array, Builtin, Error, Hash, Integer, Object
+from monkeypie.parallel import builtin_pmap, builtin_preduce
+
+BUILTINS: dict[str, Builtin] = {}
+
+
+def register_builtin(
+    name: str, function: Callable[..., Object], higher_order: bool = False
+) -> None:
+    BUILTINS[name] = Builtin(name, function, higher_order)
+
+
+def _must_be_array(name: str, value: Object) -> Error:
+    return Error(f"argument to `{name}` must be ARRAY, got {value.type().value}")
+
+
+def builtin_len(value: Object) -> Object:
+    if isinstance(value, Array):
+        return Integer(value.length())
+    if isinstance(value, Hash):
+        return Integer(len(value.pairs))
+    return Error(f"argument to `len` not supported, got {value.type().value}")
+
+
+def builtin_first(value: Object) -> Object:
+    if not isinstance(value, Array):
+        return _must_be_array("first", value)
+    element = value.get(0)
+    return NULL if element is None else element
+
+
+def builtin_last(value: Object) -> Object:
+    if not isinstance(value, Array):
+        return _must_be_array("last", value)
+    element = value.get(value.length() - 1)
+    return NULL if element is None else element
+
+
+def builtin_rest(value: Object) -> Object:
+    if not isinstance(value, Array):
+        return _must_be_array("rest", value)
+    if value.length() == 0:
+        return NULL
+    return value.rest()
+
+
+def builtin_push(array: Object, value: Object) -> Object:
+    if not isinstance(array, Array):
+        return _must_be_array("push", array)
+    return array.push(value)
+
+
+register_builtin("len", builtin_len)
+register_builtin("first", builtin_first)
+register_builtin("last", builtin_last)
+register_builtin("rest", builtin_rest)
+register_builtin("push", builtin_push)
+register_builtin("pmap", builtin_pmap, higher_order=True)
+register_builtin("preduce", builtin_preduce, higher_order=True)
@@ -0,0 +1,28 @@
+from typing import ItemsView
+
+from monkeypie.object import Object
+
+
+class Environment:
+    def __init__(
+        self, outer: "Environment | None" = None, store: dict[str, Object] | None = None
+    ):
+        self._store: dict[str, Object] = {} if store is None else store
+        self._outer = outer
+
+    def get(self, name: str) -> Object | None:
+        env: Environment | None = self
+        while env is not None:
+            value = env._store.get(name)
+            if value is not None:
+                return value
+            env = env._outer
+        return None
+
+    def set(self, name: str, value: Object) -> Object:
+        self._store[name] = value
+        return value
+
+    def items(self) -> ItemsView[str, Object]:
+        """The names bound in this environment, not in the ones around it."""
+        return self._store.items()
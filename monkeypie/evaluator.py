@@ -0,0 +1,410 @@
+from functools import partial
+from typing import Callable
+
+from monkeypie.ast import (
+    ArrayLiteralExpression,
+    BlockStatement,
+    BooleanLiteralExpression,
+    CallExpression,
+    ExpressionNode,
+    ExpressionStatement,
+    FunctionLiteralExpression,
+    HashLiteralExpression,
+    IdentifierExpression,
+    IfExpression,
+    ImportStatement,
+    IndexExpression,
+    InfixExpression,
+    IntegerLiteralExpression,
+    LetStatement,
+    Node,
+    PrefixExpression,
+    ProgramNode,
+    ReturnStatement,
+)
+from monkeypie.builtins import BUILTINS
+from monkeypie.environment import Environment
+from monkeypie.inline_cache import CallSiteCache
+from monkeypie.object import (
+    FALSE,
+    NULL,
+    TRUE,
+    Array,
+    Boolean,
+    Builtin,
+    Error,
+    Function,
+    Hash,
+    Integer,
+    Object,
+    ReturnValue,
+)
+from monkeypie.persistent import HashTrie, PersistentVector
+
+EvaluateFn = Callable[[Node, Environment], Object]
+
+
+def native_bool_to_boolean(value: bool) -> Boolean:
+    return TRUE if value else FALSE
+
+
+def is_truthy(value: Object) -> bool:
+    return value is not NULL and value is not FALSE
+
+
+def is_error(value: Object | None) -> bool:
+    return isinstance(value, Error)
+
+
+def divide(left: int, right: int) -> int:
+    # Monkey integers divide like Go's, truncating towards zero.
+    quotient = abs(left) // abs(right)
+    return quotient if (left < 0) == (right < 0) else -quotient
+
+
+class Evaluator:
+    """Tree-walking evaluator for parsed Monkey programs."""
+
+    def __init__(self, inline_caches: bool = True) -> None:
+        self.inline_caches = inline_caches
+        self._evaluate_functions: dict[type[Node], EvaluateFn] = {}
+
+        self.register_evaluate_function(ProgramNode, self.evaluate_program)
+        self.register_evaluate_function(BlockStatement, self.evaluate_block_statement)
+        self.register_evaluate_function(
+            ExpressionStatement, self.evaluate_expression_statement
+        )
+        self.register_evaluate_function(ReturnStatement, self.evaluate_return_statement)
+        self.register_evaluate_function(LetStatement, self.evaluate_let_statement)
+        self.register_evaluate_function(ImportStatement, self.evaluate_import_statement)
+        self.register_evaluate_function(
+            IntegerLiteralExpression, self.evaluate_integer_literal
+        )
+        self.register_evaluate_function(
+            BooleanLiteralExpression, self.evaluate_boolean_literal
+        )
+        self.register_evaluate_function(PrefixExpression, self.evaluate_prefix)
+        self.register_evaluate_function(InfixExpression, self.evaluate_infix)
+        self.register_evaluate_function(IfExpression, self.evaluate_if)
+        self.register_evaluate_function(IdentifierExpression, self.evaluate_identifier)
+        self.register_evaluate_function(
+            FunctionLiteralExpression, self.evaluate_function_literal
+        )
+        self.register_evaluate_function(CallExpression, self.evaluate_call)
+        self.register_evaluate_function(
+            ArrayLiteralExpression, self.evaluate_array_literal
+        )
+        self.register_evaluate_function(
+            HashLiteralExpression, self.evaluate_hash_literal
+        )
+        self.register_evaluate_function(IndexExpression, self.evaluate_index)
+
+    def register_evaluate_function(
+        self, node_type: type[Node], evaluate_function: Callable[..., Object]
+    ) -> None:
+        self._evaluate_functions[node_type] = evaluate_function
+
+    def evaluate(self, node: Node | None, env: Environment) -> Object:
+        if node is None:
+            return NULL
+        return self._evaluate_functions[type(node)](node, env)
+
+    def evaluate_program(self, program: ProgramNode, env: Environment) -> Object:
+        result: Object = NULL
+        for statement in program.statements:
+            result = self.evaluate(statement, env)
+            if isinstance(result, ReturnValue):
+                return result.value
+            if isinstance(result, Error):
+                return result
+        return result
+
+    def evaluate_block_statement(
+        self, block: BlockStatement, env: Environment
+    ) -> Object:
+        result: Object = NULL
+        for statement in block.statements:
+            result = self.evaluate(statement, env)
+            if isinstance(result, (ReturnValue, Error)):
+                return result
+        return result
+
+    def evaluate_expression_statement(
+        self, statement: ExpressionStatement, env: Environment
+    ) -> Object:
+        return self.evaluate(statement.expression, env)
+
+    def evaluate_return_statement(
+        self, statement: ReturnStatement, env: Environment
+    ) -> Object:
+        value = self.evaluate(statement.return_value, env)
+        if is_error(value):
+            return value
+        return ReturnValue(value)
+
+    def evaluate_let_statement(
+        self, statement: LetStatement, env: Environment
+    ) -> Object:
+        value = self.evaluate(statement.value, env)
+        if is_error(value):
+            return value
+        env.set(statement.name.value, value)
+        return NULL
+
+    def evaluate_import_statement(
+        self, statement: ImportStatement, env: Environment
+    ) -> Object:
+        if statement.module is None:
+            return Error(f"module not loaded: {statement.path}")
+        exports = statement.module.exports(self)
+        if isinstance(exports, Error):
+            return exports
+        for name, value in exports.items():
+            env.set(name, value)
+        return NULL
+
+    def evaluate_integer_literal(
+        self, literal: IntegerLiteralExpression, env: Environment
+    ) -> Object:
+        return Integer(literal.value)
+
+    def evaluate_boolean_literal(
+        self, literal: BooleanLiteralExpression, env: Environment
+    ) -> Object:
+        return native_bool_to_boolean(literal.value)
+
+    def evaluate_prefix(self, expression: PrefixExpression, env: Environment) -> Object:
+        right = self.evaluate(expression.right, env)
+        if is_error(right):
+            return right
+        match expression.operator:
+            case "!":
+                return native_bool_to_boolean(not is_truthy(right))
+            case "-":
+                if not isinstance(right, Integer):
+                    return Error(f"unknown operator: -{right.type().value}")
+                return Integer(-right.value)
+        return Error(f"unknown operator: {expression.operator}{right.type().value}")
+
+    def evaluate_infix(self, expression: InfixExpression, env: Environment) -> Object:
+        left = self.evaluate(expression.left, env)
+        if is_error(left):
+            return left
+        right = self.evaluate(expression.right, env)
+        if is_error(right):
+            return right
+        return self.evaluate_infix_operator(expression.operator, left, right)
+
+    def evaluate_infix_operator(
+        self, operator: str, left: Object, right: Object
+    ) -> Object:
+        if isinstance(left, Integer) and isinstance(right, Integer):
+            return self.evaluate_integer_infix_operator(operator, left, right)
+        if operator == "==":
+            return native_bool_to_boolean(left is right)
+        if operator == "!=":
+            return native_bool_to_boolean(left is not right)
+        if left.type() != right.type():
+            return Error(
+                f"type mismatch: {left.type().value} {operator} {right.type().value}"
+            )
+        return Error(
+            f"unknown operator: {left.type().value} {operator} {right.type().value}"
+        )
+
+    def evaluate_integer_infix_operator(
+        self, operator: str, left: Integer, right: Integer
+    ) -> Object:
+        match operator:
+            case "+":
+                return Integer(left.value + right.value)
+            case "-":
+                return Integer(left.value - right.value)
+            case "*":
+                return Integer(left.value * right.value)
+            case "/":
+                if right.value == 0:
+                    return Error("division by zero")
+                return Integer(divide(left.value, right.value))
+            case "<":
+                return native_bool_to_boolean(left.value < right.value)
+            case ">":
+                return native_bool_to_boolean(left.value > right.value)
+            case "==":
+                return native_bool_to_boolean(left.value == right.value)
+            case "!=":
+                return native_bool_to_boolean(left.value != right.value)
+        return Error(f"unknown operator: INTEGER {operator} INTEGER")
+
+    def evaluate_if(self, expression: IfExpression, env: Environment) -> Object:
+        condition = self.evaluate(expression.condition, env)
+        if is_error(condition):
+            return condition
+        if is_truthy(condition):
+            return self.evaluate(expression.consequence, env)
+        if expression.alternative is not None:
+            return self.evaluate(expression.alternative, env)
+        return NULL
+
+    def evaluate_identifier(
+        self, identifier: IdentifierExpression, env: Environment
+    ) -> Object:
+        value = env.get(identifier.value)
+        if value is None:
+            value = BUILTINS.get(identifier.value)
+            if value is None:
+                return Error(f"identifier not found: {identifier.value}")
+        return value
+
+    def evaluate_function_literal(
+        self, literal: FunctionLiteralExpression, env: Environment
+    ) -> Object:
+        return Function(literal.parameters, literal.body, env)
+
+    def evaluate_call(self, expression: CallExpression, env: Environment) -> Object:
+        function = self.evaluate(expression.function, env)
+        if is_error(function):
+            return function
+        arguments = self.evaluate_expressions(expression.arguments, env)
+        if len(arguments) == 1 and is_error(arguments[0]):
+            return arguments[0]
+        return self.apply_function(
+            function, arguments, expression if self.inline_caches else None
+        )
+
+    def evaluate_expressions(
+        self, expressions: list[ExpressionNode], env: Environment
+    ) -> list[Object]:
+        results: list[Object] = []
+        for expression in expressions:
+            value = self.evaluate(expression, env)
+            if is_error(value):
+                return [value]
+            results.append(value)
+        return results
+
+    def evaluate_array_literal(
+        self, literal: ArrayLiteralExpression, env: Environment
+    ) -> Object:
+        elements = self.evaluate_expressions(literal.elements, env)
+        if len(elements) == 1 and is_error(elements[0]):
+            return elements[0]
+        return Array(PersistentVector.from_iterable(elements))
+
+    def evaluate_hash_literal(
+        self, literal: HashLiteralExpression, env: Environment
+    ) -> Object:
+        pairs: HashTrie = HashTrie()
+        for key_node, value_node in zip(literal.keys, literal.values):
+            key = self.evaluate(key_node, env)
+            if is_error(key):
+                return key
+            if not isinstance(key, (Integer, Boolean)):
+                return Error(f"unusable as hash key: {key.type().value}")
+            value = self.evaluate(value_node, env)
+            if is_error(value):
+                return value
+            pairs = pairs.set(key.hash_key(), (key, value))
+        return Hash(pairs)
+
+    def evaluate_index(self, expression: IndexExpression, env: Environment) -> Object:
+        left = self.evaluate(expression.left, env)
+        if is_error(left):
+            return left
+        index = self.evaluate(expression.index, env)
+        if is_error(index):
+            return index
+        if isinstance(left, Array) and isinstance(index, Integer):
+            element = left.get(index.value)
+            return NULL if element is None else element
+        if isinstance(left, Hash):
+            if not isinstance(index, (Integer, Boolean)):
+                return Error(f"unusable as hash key: {index.type().value}")
+            pair = left.pairs.get(index.hash_key())
+            return NULL if pair is None else pair[1]
+        return Error(f"index operator not supported: {left.type().value}")
+
+    def apply_function(
+        self,
+        function: Object,
+        arguments: list[Object],
+        call: CallExpression | None = None,
+    ) -> Object:
+        if not isinstance(function, Function):
+            return self.apply_builtin(function, arguments)
+        cache = call.inline_cache if call is not None else None
+        # target is read once, as another thread may replace it in between.
+        if cache is not None and (target := cache.target)[0] is function.body:
+            cache.hits += 1
+            parameters = target[1]
+        else:
+            checked = self.check_call(function, arguments, call)
+            if isinstance(checked, Error):
+                return checked
+            parameters = checked
+        extended = Environment(function.env, dict(zip(parameters, arguments)))
+        result = self.evaluate(function.body, extended)
+        if isinstance(result, ReturnValue):
+            return result.value
+        return result
+
+    def apply_builtin(self, function: Object, arguments: list[Object]) -> Object:
+        if not isinstance(function, Builtin):
+            return Error(f"not a function: {function.type().value}")
+        if len(arguments) != function.arity:
+            return Error(
+                f"wrong number of arguments: want={function.arity},"
+                f" got={len(arguments)}"
+            )
+        if function.higher_order:
+            return function.function(self, *arguments)
+        return function.function(*arguments)
+
+    def worker_factory(self) -> Callable[[], "Evaluator"] | None:
+        """A picklable way to create an evaluator like this one elsewhere.
+
+        Higher-order builtins such as pmap use it to apply functions in worker
+        processes; None keeps them applying every function in this process.
+        """
+        return partial(Evaluator, self.inline_caches)
+
+    def check_call(
+        self,
+        function: Function,
+        arguments: list[Object],
+        call: CallExpression | None = None,
+    ) -> tuple[str, ...] | Error:
+        """Check the arguments of a call and return the callee's parameter names.
+
+        This is the slow path of apply_function(); given the call site, its
+        inline cache is pointed at the callee once the call has been checked.
+        """
+        parameters = tuple(parameter.value for parameter in function.parameters)
+        if len(parameters) != len(arguments):
+            return Error(
+                f"wrong number of arguments: want={len(parameters)},"
+                f" got={len(arguments)}"
+            )
+        if call is not None:
+            if call.inline_cache is None:
+                call.inline_cache = CallSiteCache(function.body, parameters)
+            else:
+                call.inline_cache.target = (function.body, parameters)
+                call.inline_cache.misses += 1
+        return parameters
+
+
+def inline_cache_stats(node: Node) -> tuple[int, int]:
+    """Total hits and misses of the inline caches of the calls under node."""
+    hits = misses = 0
+    stack: list[object] = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, Node):
+            if isinstance(item, CallExpression) and item.inline_cache is not None:
+                hits += item.inline_cache.hits
+                misses += item.inline_cache.misses
+            stack.extend(vars(item).values())
+    return hits, misses
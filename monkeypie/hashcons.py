@@ -0,0 +1,96 @@
+from typing import Generic, TypeVar
+from weakref import WeakValueDictionary
+
+from monkeypie.ast import (
+    BooleanLiteralExpression,
+    ExpressionNode,
+    IdentifierExpression,
+    InfixExpression,
+    IntegerLiteralExpression,
+    Node,
+    PrefixExpression,
+)
+
+T = TypeVar("T")
+
+PURE_EXPRESSIONS: tuple[type[ExpressionNode], ...] = (
+    IdentifierExpression,
+    IntegerLiteralExpression,
+    BooleanLiteralExpression,
+    PrefixExpression,
+    InfixExpression,
+)
+
+
+class InternTable:
+    """Shares structurally identical pure expressions between occurrences.
+
+    Expressions must be interned bottom-up, as the parser does, so that the
+    children of a pure expression are already canonical and its key only needs
+    their identities. The table holds its nodes weakly: an entry lives exactly
+    as long as some tree still uses the node.
+
+    A shared node keeps the tokens, and so the span, of its first occurrence.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: WeakValueDictionary[tuple, ExpressionNode] = WeakValueDictionary()
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def intern(self, expression: ExpressionNode) -> ExpressionNode:
+        key = self._key(expression)
+        if key is None:
+            return expression
+        canonical = self._nodes.get(key)
+        if canonical is None:
+            self._nodes[key] = expression
+            return expression
+        self.hits += 1
+        return canonical
+
+    @staticmethod
+    def _key(expression: ExpressionNode) -> tuple | None:
+        match expression:
+            case IdentifierExpression():
+                return IdentifierExpression, expression.value
+            case IntegerLiteralExpression():
+                return IntegerLiteralExpression, expression.token.literal
+            case BooleanLiteralExpression():
+                return BooleanLiteralExpression, expression.value
+            case PrefixExpression(right=right) if isinstance(right, PURE_EXPRESSIONS):
+                return PrefixExpression, expression.operator, id(right)
+            case InfixExpression(left=left, right=right) if isinstance(
+                left, PURE_EXPRESSIONS
+            ) and isinstance(right, PURE_EXPRESSIONS):
+                return InfixExpression, id(left), expression.operator, id(right)
+        return None
+
+
+class SubtreeCache(Generic[T]):
+    """Results of a pass over an AST, keyed by node identity.
+
+    Looking a node up costs the same however large its subtree is, and on a
+    hash-consed tree every occurrence of a shared subtree hits the same entry.
+    """
+
+    def __init__(self) -> None:
+        # The node is kept alongside its result so that its id stays unique.
+        self._entries: dict[int, tuple[Node, T]] = {}
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, node: Node) -> T | None:
+        entry = self._entries.get(id(node))
+        if entry is None:
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def put(self, node: Node, result: T) -> T:
+        self._entries[id(node)] = (node, result)
+        return result
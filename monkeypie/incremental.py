@@ -0,0 +1,91 @@
+from bisect import bisect_left, bisect_right
+
+from monkeypie.ast import ProgramNode, StatementNode
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+from monkeypie.token import Token, TokenKind
+
+
+def _statement_end(statement: StatementNode) -> int:
+    return statement.end
+
+
+def _token_start(token: Token) -> int:
+    return token.start
+
+
+def _token_end(token: Token) -> int:
+    return token.end
+
+
+def _ends_with_semicolon(statement: StatementNode, source: str) -> bool:
+    # The EOF token is the only zero-width token and always sits at
+    # len(source), so a statement ending before that ends on a real token.
+    return statement.end < len(source) and source[statement.end - 1] == ";"
+
+
+def reparse(
+    old_program: ProgramNode,
+    old_source: str,
+    edit_range: tuple[int, int],
+    new_text: str,
+) -> ProgramNode:
+    """Parse old_source with edit_range replaced by new_text.
+
+    Top-level statements that end on a ';' before the edit are reused as they
+    are, and relexing stops as soon as a freshly parsed statement ends on the
+    same ';' as a statement of old_program, whose remaining statements are then
+    shifted into place. Parsing resumes from a ';' only because the parser
+    state after a ';'-terminated top-level statement never depends on what
+    precedes it, so the result is the program a full parse would produce.
+    Spans of reused statements follow from their tokens, which are shifted in
+    place through old_program.tokens without walking the trees.
+
+    old_program must be the result of parsing old_source without an
+    InternTable; its statements are moved into the returned program and it
+    must not be used afterwards.
+    """
+    if old_program.hash_consed:
+        raise ValueError("cannot reparse a hash-consed program")
+    start, end = edit_range
+    new_source = old_source[:start] + new_text + old_source[end:]
+    delta = len(new_text) - (end - start)
+    edit_end = start + len(new_text)
+    old_statements = old_program.statements
+    old_tokens = old_program.tokens
+
+    reused = bisect_right(old_statements, start, key=_statement_end)
+    while reused and not _ends_with_semicolon(old_statements[reused - 1], old_source):
+        reused -= 1
+    resume = old_statements[reused - 1].end if reused else 0
+
+    program = ProgramNode()
+    program.statements = old_statements[:reused]
+    program.symbols = old_program.symbols
+    program.tokens = old_tokens[: bisect_right(old_tokens, resume, key=_token_end)]
+
+    parser = Parser(Lexer(new_source, resume, symbols=old_program.symbols))
+    tokens = parser.record_tokens()
+    while not parser.current_token_is(TokenKind.EOF):
+        statement = parser.parse_statement()
+        if statement:
+            program.statements.append(statement)
+            if statement.end > edit_end and _ends_with_semicolon(statement, new_source):
+                old_end = statement.end - delta
+                index = bisect_left(old_statements, old_end, key=_statement_end)
+                if index < len(old_statements) and old_statements[index].end == old_end:
+                    suffix = old_tokens[
+                        bisect_left(old_tokens, old_end, key=_token_start) :
+                    ]
+                    if delta:
+                        for token in suffix:
+                            token.start += delta
+                            token.end += delta
+                    program.statements.extend(old_statements[index + 1 :])
+                    program.tokens.extend(tokens[:-1])
+                    program.tokens.extend(suffix)
+                    return program
+        parser.next_token()
+
+    program.tokens.extend(tokens)
+    return program
@@ -0,0 +1,364 @@
+"""Cross-file index of where let-bound names are defined and used.
+
+A SymbolIndex keeps, in a SQLite database, every definition of a name by a
+let statement and every reference to a name, with the references that are
+the function of a call told apart, across any number of source files.
+Queries are answered from the database alone, without reading or parsing a
+source file.
+
+update() brings the index up to date with the files under the given paths.
+A file is only parsed again when its contents changed: files whose
+modification time and size are those recorded are passed over without being
+read, and files that were only touched are recognised by the SHA-256 digest
+of their contents. Files that no longer exist are dropped.
+
+References are resolved by name only, not to a particular definition, with
+one exception: a function's parameters shadow let-bound names, so names
+referring to a parameter are not recorded. Run ``python -m monkeypie.index``
+to update an index and query it from the command line.
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+from typing import Final, Iterable, NamedTuple
+
+from monkeypie.ast import (
+    ArrayLiteralExpression,
+    BlockStatement,
+    BooleanLiteralExpression,
+    CallExpression,
+    ExpressionStatement,
+    FunctionLiteralExpression,
+    HashLiteralExpression,
+    IdentifierExpression,
+    IfExpression,
+    ImportStatement,
+    IndexExpression,
+    InfixExpression,
+    IntegerLiteralExpression,
+    LetStatement,
+    Node,
+    PrefixExpression,
+    ProgramNode,
+    ReturnStatement,
+)
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+
+DEFINITION: Final = "definition"
+REFERENCE: Final = "reference"
+CALL: Final = "call"
+
+EXTENSION: Final = ".monkey"
+
+# Bumped whenever the schema changes; an index in another version is rebuilt.
+_SCHEMA_VERSION: Final = 1
+_SCHEMA: Final = """
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    digest BLOB NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE occurrences (
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    file INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+    start INTEGER NOT NULL,
+    "end" INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    "column" INTEGER NOT NULL
+);
+CREATE INDEX occurrences_by_name ON occurrences (name, kind);
+CREATE INDEX occurrences_by_file ON occurrences (file);
+"""
+
+_NO_PARAMETERS: Final[frozenset[str]] = frozenset()
+
+
+class Occurrence(NamedTuple):
+    """A definition of or reference to name in the file at path.
+
+    start and end are character offsets; line and column are 1-based.
+    """
+
+    name: str
+    kind: str
+    path: str
+    start: int
+    end: int
+    line: int
+    column: int
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}:{self.column}: {self.kind} {self.name}"
+
+
+class Updated(NamedTuple):
+    """The files an update() parsed again and those it dropped."""
+
+    indexed: list[str]
+    removed: list[str]
+
+
+def occurrences(
+    node: Node | None,
+    parameters: frozenset[str] = _NO_PARAMETERS,
+) -> list[tuple[str, str, int, int]]:
+    """Return the name, kind, start and end of what node defines and references.
+
+    Names in parameters are bound by an enclosing function and not recorded.
+    """
+    found: list[tuple[str, str, int, int]] = []
+    _walk(node, parameters, found)
+    return found
+
+
+def _walk(
+    node: Node | None,
+    parameters: frozenset[str],
+    found: list[tuple[str, str, int, int]],
+) -> None:
+    match node:
+        case None | IntegerLiteralExpression() | BooleanLiteralExpression():
+            pass
+        case ImportStatement():
+            pass
+        case IdentifierExpression():
+            if node.value not in parameters:
+                found.append((node.value, REFERENCE, node.start, node.end))
+        case LetStatement():
+            name = node.name
+            found.append((name.value, DEFINITION, name.start, name.end))
+            _walk(node.value, parameters, found)
+        case CallExpression():
+            function = node.function
+            if (
+                isinstance(function, IdentifierExpression)
+                and function.value not in parameters
+            ):
+                found.append((function.value, CALL, function.start, function.end))
+            else:
+                _walk(function, parameters, found)
+            for argument in node.arguments:
+                _walk(argument, parameters, found)
+        case FunctionLiteralExpression():
+            _walk(
+                node.body,
+                parameters | {parameter.value for parameter in node.parameters},
+                found,
+            )
+        case BlockStatement() | ProgramNode():
+            for statement in node.statements:
+                _walk(statement, parameters, found)
+                if isinstance(statement, LetStatement):
+                    # The let's name refers to it, not to a parameter, from
+                    # here on.
+                    parameters = parameters - {statement.name.value}
+        case PrefixExpression():
+            _walk(node.right, parameters, found)
+        case InfixExpression():
+            _walk(node.left, parameters, found)
+            _walk(node.right, parameters, found)
+        case IfExpression():
+            _walk(node.condition, parameters, found)
+            _walk(node.consequence, parameters, found)
+            _walk(node.alternative, parameters, found)
+        case ArrayLiteralExpression():
+            for element in node.elements:
+                _walk(element, parameters, found)
+        case HashLiteralExpression():
+            for key, value in zip(node.keys, node.values):
+                _walk(key, parameters, found)
+                _walk(value, parameters, found)
+        case IndexExpression():
+            _walk(node.left, parameters, found)
+            _walk(node.index, parameters, found)
+        case ExpressionStatement():
+            _walk(node.expression, parameters, found)
+        case ReturnStatement():
+            _walk(node.return_value, parameters, found)
+        case _:
+            raise TypeError(f"unexpected node {type(node).__name__}")
+
+
+def _source_files(path: str) -> Iterable[str]:
+    if not os.path.isdir(path):
+        yield path
+        return
+    for directory, directories, files in os.walk(path):
+        directories.sort()
+        for name in sorted(files):
+            if name.endswith(EXTENSION):
+                yield os.path.join(directory, name)
+
+
+class SymbolIndex:
+    """Definitions and references of names in source files, kept in a database.
+
+    An index is meant to be used from one thread; separate processes may open
+    the same database, which SQLite serialises writes to.
+    """
+
+    def __init__(self, database: str = ":memory:"):
+        self._connection = sqlite3.connect(database)
+        self._connection.execute("PRAGMA foreign_keys = ON")
+        (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+        if version != _SCHEMA_VERSION:
+            with self._connection:
+                self._connection.execute("DROP TABLE IF EXISTS occurrences")
+                self._connection.execute("DROP TABLE IF EXISTS files")
+                self._connection.executescript(_SCHEMA)
+                self._connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "SymbolIndex":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def update(self, *paths: str) -> Updated:
+        """Index the files at paths and the .monkey files in directories there.
+
+        Indexed files under paths that no longer exist are dropped. Files
+        that fail to parse are indexed as far as they parse.
+        """
+        indexed: list[str] = []
+        removed: list[str] = []
+        roots = [os.path.abspath(path) for path in paths]
+        with self._connection:
+            seen = set()
+            for root in roots:
+                for path in _source_files(root):
+                    try:
+                        if self._update_file(path):
+                            indexed.append(path)
+                    except OSError:
+                        continue
+                    seen.add(path)
+            for root in roots:
+                for file, path in self._connection.execute(
+                    "SELECT id, path FROM files WHERE path = ? OR path LIKE ? ESCAPE '\\'",
+                    (root, _like_prefix(root + os.sep)),
+                ).fetchall():
+                    if path not in seen:
+                        self._connection.execute(
+                            "DELETE FROM files WHERE id = ?", (file,)
+                        )
+                        removed.append(path)
+        return Updated(indexed, removed)
+
+    def _update_file(self, path: str) -> bool:
+        # Whether the file was parsed again; raises OSError if it cannot be
+        # read.
+        row = self._connection.execute(
+            "SELECT id, digest, mtime_ns, size FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        stat = os.stat(path)
+        if row is not None and (row[2], row[3]) == (stat.st_mtime_ns, stat.st_size):
+            return False
+        with open(path, "rb") as file:
+            source = file.read()
+        digest = hashlib.sha256(source).digest()
+        if row is not None and row[1] == digest:
+            self._connection.execute(
+                "UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?",
+                (stat.st_mtime_ns, stat.st_size, row[0]),
+            )
+            return False
+
+        if row is not None:
+            self._connection.execute("DELETE FROM files WHERE id = ?", (row[0],))
+        file_id = self._connection.execute(
+            "INSERT INTO files (path, digest, mtime_ns, size) VALUES (?, ?, ?, ?)",
+            (path, digest, stat.st_mtime_ns, stat.st_size),
+        ).lastrowid
+        lexer = Lexer(source.decode("utf-8", "replace"))
+        program = Parser(lexer).parse_program()
+        self._connection.executemany(
+            "INSERT INTO occurrences VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (name, kind, file_id, start, end, *lexer.line_column(start))
+                for name, kind, start, end in occurrences(program)
+            ),
+        )
+        return True
+
+    def _query(self, where: str, parameters: tuple) -> list[Occurrence]:
+        return [
+            Occurrence(*row)
+            for row in self._connection.execute(
+                'SELECT name, kind, path, start, "end", line, "column"'
+                " FROM occurrences JOIN files ON files.id = occurrences.file"
+                f" WHERE {where} ORDER BY path, start",
+                parameters,
+            )
+        ]
+
+    def definitions(self, name: str) -> list[Occurrence]:
+        """Where let statements bind name."""
+        return self._query("name = ? AND kind = ?", (name, DEFINITION))
+
+    def references(self, name: str, calls_only: bool = False) -> list[Occurrence]:
+        """Where name is referred to, or with calls_only, called."""
+        if calls_only:
+            return self._query("name = ? AND kind = ?", (name, CALL))
+        return self._query("name = ? AND kind != ?", (name, DEFINITION))
+
+    def symbols(self, path: str) -> list[Occurrence]:
+        """Everything the file at path defines and references."""
+        return self._query("path = ?", (os.path.abspath(path),))
+
+    def files(self) -> list[str]:
+        return [
+            path
+            for (path,) in self._connection.execute(
+                "SELECT path FROM files ORDER BY path"
+            )
+        ]
+
+
+def _like_prefix(prefix: str) -> str:
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+def main(argv: list[str] | None = None) -> None:
+    argparser = argparse.ArgumentParser(
+        description="Index where names are defined and referenced across files."
+    )
+    argparser.add_argument("--index", default="monkeypie-index.sqlite3")
+    commands = argparser.add_subparsers(dest="command", required=True)
+    update = commands.add_parser("update", help="index files and directories")
+    update.add_argument("paths", nargs="+")
+    definitions = commands.add_parser("definitions", help="where name is defined")
+    definitions.add_argument("name")
+    references = commands.add_parser("references", help="where name is used")
+    references.add_argument("name")
+    references.add_argument("--calls", action="store_true", help="only calls")
+    args = argparser.parse_args(argv)
+
+    with SymbolIndex(args.index) as index:
+        match args.command:
+            case "update":
+                updated = index.update(*args.paths)
+                print(
+                    f"indexed {len(updated.indexed)} files,"
+                    f" removed {len(updated.removed)}"
+                )
+            case "definitions":
+                for occurrence in index.definitions(args.name):
+                    print(occurrence)
+            case "references":
+                for occurrence in index.references(args.name, args.calls):
+                    print(occurrence)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+from monkeypie.ast import BlockStatement
+
+
+class CallSiteCache:
+    """Inline cache of a CallExpression for its last callee.
+
+    target pairs the body of the last function called from the site with the
+    names of its parameters, whose count has already been checked against
+    the site's arguments. A call whose callee has the same body, including any
+    closure created from the same literal, binds its arguments by those names
+    without looking at the function literal again. target is replaced as a
+    whole, so evaluations sharing a program in several threads never see a
+    body paired with the wrong parameters.
+    """
+
+    __slots__ = ("target", "hits", "misses")
+
+    def __init__(self, body: BlockStatement, parameters: tuple[str, ...]):
+        self.target = (body, parameters)
+        self.hits = 0
+        self.misses = 1
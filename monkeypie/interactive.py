@@ -0,0 +1,175 @@
+"""Multi-line input for the REPL.
+
+An InteractiveParser is fed the REPL's input one line at a time and tells
+whether the lines so far form a complete entry. Each line is lexed once, when
+it is fed, and its tokens are kept until the entry completes: an entry is
+incomplete while a bracket or a string is left open, and parsing is only
+attempted once every bracket is closed. A parse that runs into the end of the
+input mid-statement, as in ``let x =``, leaves the entry incomplete too; the
+statements parsed before the unfinished one are kept, and the next line
+resumes parsing from the unfinished statement's first token rather than from
+the start of the entry.
+
+Offsets, and so the line and column of errors, count from the start of the
+entry. Identifiers are interned in one SymbolTable for the whole session.
+"""
+
+from bisect import bisect_right
+from typing import Final, NamedTuple
+
+from monkeypie.ast import StatementNode
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+from monkeypie.symbols import SymbolTable
+from monkeypie.token import Token, TokenKind
+
+_CLOSING: Final[dict[int, int]] = {
+    TokenKind.LPAREN: TokenKind.RPAREN,
+    TokenKind.LBRACE: TokenKind.RBRACE,
+    TokenKind.LBRACKET: TokenKind.RBRACKET,
+}
+_CLOSERS: Final = frozenset(_CLOSING.values())
+
+
+class Parsed(NamedTuple):
+    """What feeding a line produced.
+
+    statements are those of a completed entry, errors are its parser errors,
+    and complete is False while the entry needs more lines.
+    """
+
+    statements: list[StatementNode]
+    errors: list[str]
+    complete: bool
+
+
+class _TokenReplay:
+    """A token source over tokens lexed earlier, ending in EOF."""
+
+    def __init__(
+        self,
+        tokens: list[Token],
+        end: int,
+        line_starts: list[int],
+        symbols: SymbolTable,
+    ):
+        self.symbols = symbols
+        self._tokens = tokens
+        self._eof = Token(TokenKind.EOF, "\0", end, end)
+        self._line_starts = line_starts
+        # Calls to next_token(), counting those answered with EOF.
+        self.read = 0
+
+    def next_token(self) -> Token:
+        index = self.read
+        self.read += 1
+        return self._tokens[index] if index < len(self._tokens) else self._eof
+
+    def line_column(self, offset: int) -> tuple[int, int]:
+        line = bisect_right(self._line_starts, offset)
+        return line, offset - self._line_starts[line - 1] + 1
+
+
+class _ResumableParser(Parser):
+    """A Parser that tells errors at the end of its input from the rest."""
+
+    def __init__(self, lexer: _TokenReplay):
+        self.errors_at_end = 0
+        super().__init__(lexer)
+
+    def error(self, token: Token, message: str) -> None:
+        if token.kind == TokenKind.EOF:
+            self.errors_at_end += 1
+        super().error(token, message)
+
+
+class InteractiveParser:
+    """Parses REPL input fed line by line into complete entries."""
+
+    def __init__(self, symbols: SymbolTable | None = None):
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop the input of the current entry."""
+        self._tokens: list[Token] = []
+        self._statements: list[StatementNode] = []
+        self._open: list[int] = []
+        self._mismatched = False
+        # An unterminated string is lexed again with the next line appended.
+        self._string = ""
+        self._string_start = 0
+        self._line_starts = [0]
+        self._length = 0
+
+    def pending(self) -> bool:
+        """Whether lines of an incomplete entry have been fed."""
+        return self._length > 0
+
+    def feed(self, line: str) -> Parsed:
+        """Add line, which ends in a newline, to the current entry.
+
+        A blank line fed while every bracket is closed ends the entry, which
+        is then parsed as it is. Blank lines inside brackets or strings are
+        part of the entry.
+        """
+        blank = not line.strip()
+        if blank and not self._tokens and not self._string:
+            self.reset()
+            return Parsed([], [], True)
+        final = blank and not self._open and not self._string
+
+        start = self._length
+        self._length += len(line)
+        self._line_starts.append(self._length)
+        if self._string:
+            start = self._string_start
+            line = self._string + line
+            self._string = ""
+        self._lex(line, start)
+
+        if not final and (self._string or (self._open and not self._mismatched)):
+            return Parsed([], [], False)
+        return self._parse(final)
+
+    def _lex(self, text: str, offset: int) -> None:
+        lexer = Lexer(text, symbols=self.symbols)
+        while (token := lexer.next_token()).kind != TokenKind.EOF:
+            if token.kind == TokenKind.ILLEGAL and token.literal.startswith('"'):
+                self._string = token.literal
+                self._string_start = token.start + offset
+                return
+            token.start += offset
+            token.end += offset
+            self._tokens.append(token)
+            if token.kind in _CLOSING:
+                self._open.append(_CLOSING[token.kind])
+            elif token.kind in _CLOSERS:
+                if not self._open or self._open.pop() != token.kind:
+                    self._mismatched = True
+
+    def _parse(self, final: bool) -> Parsed:
+        replay = _TokenReplay(
+            self._tokens, self._length, self._line_starts, self.symbols
+        )
+        parser = _ResumableParser(replay)
+        while parser.current_token.kind != TokenKind.EOF:
+            # The parser has read the current token and the one after it.
+            first = replay.read - 2
+            errors_at_end = parser.errors_at_end
+            statement = parser.parse_statement()
+            parser.next_token()
+            if parser.errors_at_end > errors_at_end and not final:
+                if len(parser.errors()) == parser.errors_at_end:
+                    # Unfinished rather than wrong: wait for more input.
+                    self._tokens = self._tokens[first:]
+                    return Parsed([], [], False)
+                break
+            if statement:
+                self._statements.append(statement)
+
+        statements, errors = self._statements, parser.errors()
+        self.reset()
+        if errors:
+            return Parsed([], errors, True)
+        return Parsed(statements, [], True)
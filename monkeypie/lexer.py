@@ -1,12 +1,94 @@
-from monkeypie.token import Token, TokenType, KEYWORDS
+from bisect import bisect_right
+from typing import Final
+
+from monkeypie.symbols import SymbolTable
+from monkeypie.token import KEYWORD_KINDS, Token, TokenKind
+
+# Character classes of the ASCII fast path, one per byte value. They are
+# derived from the predicates of the Unicode path so both classify every
+# ASCII character the same way.
+_OTHER: Final = 0
+_SPACE: Final = 1
+_LETTER: Final = 2
+_DIGIT: Final = 3
+_PUNCTUATION: Final = 4
+_NON_ASCII: Final = 5
+
+_PUNCTUATION_KINDS: Final[dict[str, int]] = {
+    "=": TokenKind.ASSIGN,
+    ";": TokenKind.SEMICOLON,
+    "(": TokenKind.LPAREN,
+    ")": TokenKind.RPAREN,
+    "{": TokenKind.LBRACE,
+    "}": TokenKind.RBRACE,
+    "[": TokenKind.LBRACKET,
+    "]": TokenKind.RBRACKET,
+    ":": TokenKind.COLON,
+    ",": TokenKind.COMMA,
+    "+": TokenKind.PLUS,
+    "-": TokenKind.MINUS,
+    "!": TokenKind.BANG,
+    "/": TokenKind.SLASH,
+    "*": TokenKind.ASTERISK,
+    "<": TokenKind.LT,
+    ">": TokenKind.GT,
+}
+
+
+def _classify(byte: int) -> int:
+    ch = chr(byte)
+    if byte >= 0x80:
+        return _NON_ASCII
+    if ch == "\0":
+        return _OTHER
+    if ch in _PUNCTUATION_KINDS:
+        return _PUNCTUATION
+    if ch.isspace() or ch in ("\t", "\n", "\r"):
+        return _SPACE
+    if ch.isalpha() or ch == "_":
+        return _LETTER
+    if ch.isdigit():
+        return _DIGIT
+    return _OTHER
+
+
+_CLASSES: Final[bytes] = bytes(_classify(byte) for byte in range(256))
+_BYTE_KINDS: Final[list[int]] = [
+    _PUNCTUATION_KINDS.get(chr(byte), TokenKind.ILLEGAL) for byte in range(256)
+]
+_BYTE_LITERALS: Final[list[str]] = [chr(byte) for byte in range(256)]
+_EQUALS: Final = ord("=")
+_BANG: Final = ord("!")
 
 
 class Lexer:
-    def __init__(self, input_: str):
-        self._input: str = input_
-        self._position: int = 0
-        self._read_position: int = 0
+    def __init__(
+        self,
+        input_: str | bytes | bytearray | memoryview,
+        position: int = 0,
+        ascii_fast_path: bool = True,
+        symbols: SymbolTable | None = None,
+    ):
+        """Tokenize input_ from position, given in characters.
+
+        Bytes-like input must be UTF-8. With ascii_fast_path, characters are
+        classified through byte tables for as long as the input is ASCII, and
+        lexing continues on the Unicode path from the first non-ASCII byte.
+        Identifiers are interned in symbols, a fresh SymbolTable by default.
+        """
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self._input: str = input_ if isinstance(input_, str) else str(input_, "utf-8")
+        self._position: int = position
+        self._read_position: int = position
         self._ch: str = ""
+        self._line_starts: list[int] | None = None
+        self._data: bytes | None = None
+
+        if ascii_fast_path and self._input[:position].isascii():
+            if isinstance(input_, str):
+                self._data = input_.encode("utf-8", "surrogatepass") + b"\0"
+            else:
+                self._data = bytes(input_) + b"\0"
 
         self.read_char()
 
@@ -18,6 +100,21 @@ class Lexer:
     def is_digit(ch: str) -> bool:
         return ch.isdigit()
 
+    def line_column(self, offset: int) -> tuple[int, int]:
+        """Return the 1-based line and column of an offset into the input.
+
+        The index of line starts is only built on first use, so lexing itself
+        never has to count newlines.
+        """
+        if self._line_starts is None:
+            self._line_starts = [0]
+            newline = self._input.find("\n")
+            while newline != -1:
+                self._line_starts.append(newline + 1)
+                newline = self._input.find("\n", newline + 1)
+        line = bisect_right(self._line_starts, offset)
+        return line, offset - self._line_starts[line - 1] + 1
+
     def read_char(self):
         if self._read_position >= len(self._input):
             self._ch = "\0"
@@ -37,6 +134,20 @@ class Lexer:
             self.read_char()
         return self._input[position : self._position]
 
+    def read_string(self) -> str | None:
+        # From the opening quote to the closing one, which is left as the
+        # current character; None, with the last character current, if the
+        # input ends first.
+        position = self._position + 1
+        end = self._input.find('"', position)
+        if end == -1:
+            self._read_position = len(self._input) - 1
+            self.read_char()
+            return None
+        self._read_position = end
+        self.read_char()
+        return self._input[position:end]
+
     def read_identifier(self) -> str:
         position = self._position
         while self.is_letter(self._ch):
@@ -44,70 +155,162 @@ class Lexer:
         return self._input[position : self._position]
 
     @staticmethod
-    def lookup_identifier(identifier: str) -> TokenType:
-        try:
-            return KEYWORDS[identifier]
-        except KeyError:
-            return TokenType.IDENT
+    def lookup_identifier(identifier: str) -> int:
+        return KEYWORD_KINDS.get(identifier, TokenKind.IDENT)
+
+    def identifier_token(self, literal: str, start: int, end: int) -> Token:
+        kind = self.lookup_identifier(literal)
+        if kind != TokenKind.IDENT:
+            return Token(kind, literal, start, end)
+        literal, symbol = self.symbols.intern(literal)
+        token = Token(kind, literal, start, end)
+        token.symbol = symbol
+        return token
 
     def skip_whitespace(self):
         while self._ch.isspace() or self._ch in ("\t", "\n", "\r"):
             self.read_char()
 
     def next_token(self) -> Token:
+        if self._data is not None:
+            return self._next_ascii_token(self._data)
+        return self._next_unicode_token()
+
+    def _next_ascii_token(self, data: bytes) -> Token:
+        # data ends in a NUL sentinel, which classifies as _OTHER, so the
+        # scanning loops below never need a bounds check.
+        classes = _CLASSES
+        position = self._position
+        byte_class = classes[data[position]]
+        while byte_class == _SPACE:
+            position += 1
+            byte_class = classes[data[position]]
+        start = position
+
+        if byte_class == _LETTER:
+            position += 1
+            while (byte_class := classes[data[position]]) == _LETTER:
+                position += 1
+            if byte_class == _NON_ASCII:
+                return self._leave_ascii_path(start)
+            self._position = position
+            return self.identifier_token(self._input[start:position], start, position)
+
+        if byte_class == _DIGIT:
+            position += 1
+            while (byte_class := classes[data[position]]) == _DIGIT:
+                position += 1
+            if byte_class == _NON_ASCII:
+                return self._leave_ascii_path(start)
+            self._position = position
+            return Token(TokenKind.INT, self._input[start:position], start, position)
+
+        if byte_class == _PUNCTUATION:
+            byte = data[position]
+            if data[position + 1] == _EQUALS and (byte == _EQUALS or byte == _BANG):
+                self._position = position + 2
+                return Token(
+                    TokenKind.EQ if byte == _EQUALS else TokenKind.NOT_EQ,
+                    self._input[start : position + 2],
+                    start,
+                    position + 2,
+                )
+            self._position = position + 1
+            return Token(_BYTE_KINDS[byte], _BYTE_LITERALS[byte], start, position + 1)
+
+        if byte_class == _NON_ASCII:
+            return self._leave_ascii_path(start)
+
+        # NUL, the end of input, strings and illegal characters are rare
+        # enough to be left to the Unicode path one token at a time.
+        self._read_position = start
+        self.read_char()
+        token = self._next_unicode_token()
+        if token.kind == TokenKind.EOF and start >= len(self._input):
+            self._data = None
+        elif not token.literal.isascii():
+            # Offsets past a string with non-ASCII characters in it no longer
+            # agree with byte offsets.
+            self._data = None
+        return token
+
+    def _leave_ascii_path(self, position: int) -> Token:
+        # Offsets only agree with byte offsets up to the first non-ASCII byte.
+        self._data = None
+        self._read_position = position
+        self.read_char()
+        return self._next_unicode_token()
+
+    def _next_unicode_token(self) -> Token:
         token: Token
 
         self.skip_whitespace()
+        start = self._position
 
         match self._ch:
             case "=":
                 if self.peek_char() == "=":
                     ch: str = str(self._ch)
                     self.read_char()
-                    token = Token(TokenType.EQ, ch + self._ch)
+                    token = Token(TokenKind.EQ, ch + self._ch)
                 else:
-                    token = Token(TokenType.ASSIGN, self._ch)
+                    token = Token(TokenKind.ASSIGN, self._ch)
             case ";":
-                token = Token(TokenType.SEMICOLON, self._ch)
+                token = Token(TokenKind.SEMICOLON, self._ch)
             case "(":
-                token = Token(TokenType.LPAREN, self._ch)
+                token = Token(TokenKind.LPAREN, self._ch)
             case ")":
-                token = Token(TokenType.RPAREN, self._ch)
+                token = Token(TokenKind.RPAREN, self._ch)
             case "{":
-                token = Token(TokenType.LBRACE, self._ch)
+                token = Token(TokenKind.LBRACE, self._ch)
             case "}":
-                token = Token(TokenType.RBRACE, self._ch)
+                token = Token(TokenKind.RBRACE, self._ch)
+            case "[":
+                token = Token(TokenKind.LBRACKET, self._ch)
+            case "]":
+                token = Token(TokenKind.RBRACKET, self._ch)
+            case ":":
+                token = Token(TokenKind.COLON, self._ch)
             case ",":
-                token = Token(TokenType.COMMA, self._ch)
+                token = Token(TokenKind.COMMA, self._ch)
             case "+":
-                token = Token(TokenType.PLUS, self._ch)
+                token = Token(TokenKind.PLUS, self._ch)
             case "-":
-                token = Token(TokenType.MINUS, self._ch)
+                token = Token(TokenKind.MINUS, self._ch)
             case "!":
                 if self.peek_char() == "=":
                     ch = str(self._ch)
                     self.read_char()
-                    token = Token(TokenType.NOT_EQ, ch + self._ch)
+                    token = Token(TokenKind.NOT_EQ, ch + self._ch)
                 else:
-                    token = Token(TokenType.BANG, self._ch)
+                    token = Token(TokenKind.BANG, self._ch)
             case "/":
-                token = Token(TokenType.SLASH, self._ch)
+                token = Token(TokenKind.SLASH, self._ch)
             case "*":
-                token = Token(TokenType.ASTERISK, self._ch)
+                token = Token(TokenKind.ASTERISK, self._ch)
             case "<":
-                token = Token(TokenType.LT, self._ch)
+                token = Token(TokenKind.LT, self._ch)
             case ">":
-                token = Token(TokenType.GT, self._ch)
+                token = Token(TokenKind.GT, self._ch)
+            case '"':
+                string = self.read_string()
+                if string is None:
+                    token = Token(TokenKind.ILLEGAL, self._input[start:])
+                else:
+                    token = Token(TokenKind.STRING, string)
             case "\0":
-                token = Token(TokenType.EOF, self._ch)
+                token = Token(TokenKind.EOF, self._ch)
             case _:
                 if self.is_letter(self._ch):
                     literal = self.read_identifier()
-                    return Token(self.lookup_identifier(literal), literal)
+                    return self.identifier_token(literal, start, self._position)
                 elif self.is_digit(self._ch):
-                    return Token(TokenType.INT, self.read_number())
+                    literal = self.read_number()
+                    return Token(TokenKind.INT, literal, start, self._position)
                 else:
-                    token = Token(TokenType.ILLEGAL, self._ch)
+                    token = Token(TokenKind.ILLEGAL, self._ch)
 
+        token.start = start
+        token.end = min(self._read_position, len(self._input))
         self.read_char()
         return token
@@ -0,0 +1,156 @@
+import sys
+import time
+from types import FrameType
+
+from monkeypie.ast import CallExpression
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.object import Error, Function, Object, ReturnValue
+
+EVALUATE_CALL_CODE = Evaluator.evaluate_call.__code__
+
+# Fuel is charged against the limit, and the deadline checked, once per
+# block of this many steps rather than on every step.
+FUEL_BLOCK = 256
+
+
+class LimitExceeded(Exception):
+    """Raised when an evaluation runs out of fuel, depth or time.
+
+    stack holds the call expressions being evaluated when the limit was hit,
+    outermost first.
+    """
+
+    def __init__(self, message: str, stack: list[CallExpression]):
+        super().__init__(message)
+        self.stack = stack
+
+    def format_stack(self) -> list[str]:
+        return [f"{call.function} at offset {call.start}" for call in self.stack]
+
+
+class Limits:
+    """Execution limits for LimitedEvaluator; None means unlimited.
+
+    fuel is the number of steps an evaluation may take, where a step is a
+    function call; everything else a Monkey program does is bounded by the
+    size of its source. max_depth bounds the number of nested calls and
+    timeout is a wall-clock limit in seconds. Each of these should stay well
+    below what the Python recursion limit allows, as the evaluator recurses
+    for every nested call.
+    """
+
+    def __init__(
+        self,
+        fuel: int | None = None,
+        max_depth: int | None = None,
+        timeout: float | None = None,
+    ):
+        self.fuel = fuel
+        self.max_depth = max_depth
+        self.timeout = timeout
+
+
+def _call_stack() -> list[CallExpression]:
+    # Recovered from the Python stack only once a limit is hit, so that
+    # calls do not have to maintain a Monkey-level stack of their own.
+    stack = []
+    frame: FrameType | None = sys._getframe()
+    while frame is not None:
+        if frame.f_code is EVALUATE_CALL_CODE:
+            expression = frame.f_locals.get("expression")
+            if isinstance(expression, CallExpression):
+                stack.append(expression)
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+class LimitedEvaluator(Evaluator):
+    """Evaluator that enforces Limits from construction or the last reset().
+
+    The limits cover every evaluate() call in between, so a program run one
+    statement at a time shares a single budget. Calls count down a budget
+    for the current block and only every FUEL_BLOCK steps is the fuel total
+    charged and the deadline read, so the cost per call is a decrement and a
+    comparison on top of the depth bookkeeping.
+    """
+
+    def __init__(self, limits: Limits):
+        super().__init__()
+        self.limits = limits
+        self._max_depth = sys.maxsize if limits.max_depth is None else limits.max_depth
+        self.reset()
+
+    def reset(self) -> None:
+        self._charged = 0
+        self._fuel = sys.maxsize if self.limits.fuel is None else self.limits.fuel
+        self._block = self._countdown = 0
+        self._depth = 0
+        self._deadline = (
+            float("inf")
+            if self.limits.timeout is None
+            else time.monotonic() + self.limits.timeout
+        )
+
+    @property
+    def steps(self) -> int:
+        return self._charged + self._block - self._countdown
+
+    def _next_block(self) -> None:
+        self._charged += self._block
+        self._fuel -= self._block
+        self._block = self._countdown = 0
+        if self._fuel <= 0:
+            raise LimitExceeded(
+                f"fuel exhausted after {self._charged} steps", _call_stack()
+            )
+        if time.monotonic() > self._deadline:
+            raise LimitExceeded(
+                f"deadline of {self.limits.timeout} s exceeded after"
+                f" {self._charged} steps",
+                _call_stack(),
+            )
+        self._block = self._countdown = min(FUEL_BLOCK, self._fuel)
+
+    def worker_factory(self) -> None:
+        # Calls made in other processes would escape the limits.
+        return None
+
+    def apply_function(
+        self,
+        function: Object,
+        arguments: list[Object],
+        call: CallExpression | None = None,
+    ) -> Object:
+        # Evaluator.apply_function is inlined rather than called through
+        # super(), which would add a Python call to every Monkey call.
+        self._countdown -= 1
+        if self._countdown < 0:
+            self._next_block()
+            self._countdown -= 1
+        if not isinstance(function, Function):
+            return self.apply_builtin(function, arguments)
+        cache = call.inline_cache if call is not None else None
+        # target is read once, as another thread may replace it in between.
+        if cache is not None and (target := cache.target)[0] is function.body:
+            cache.hits += 1
+            parameters = target[1]
+        else:
+            checked = self.check_call(function, arguments, call)
+            if isinstance(checked, Error):
+                return checked
+            parameters = checked
+        if self._depth == self._max_depth:
+            raise LimitExceeded(
+                f"maximum call depth of {self._max_depth} exceeded", _call_stack()
+            )
+        extended = Environment(function.env, dict(zip(parameters, arguments)))
+        self._depth += 1
+        try:
+            result = self.evaluate(function.body, extended)
+        finally:
+            self._depth -= 1
+        if isinstance(result, ReturnValue):
+            return result.value
+        return result
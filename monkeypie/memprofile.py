@@ -0,0 +1,143 @@
+"""Memory profile of a parsed program, by node type and by allocation site.
+
+Run with ``python -m monkeypie.memprofile FILE``. The report lists, for each
+AST node class as well as for tokens, literal strings and node lists, the
+number of instances reachable from the program, their total size and their
+size per KB of source, followed by the top allocation sites in the lexer and
+the parser. --save writes the report as JSON and --diff compares the current
+report against a saved one.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+from typing import Any
+
+from monkeypie.ast import Node, ProgramNode
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+from monkeypie.token import Token
+
+SITE_FILES = ("lexer.py", "parser.py")
+
+
+def _size(obj: object) -> int:
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(vars(obj))
+    return size
+
+
+def object_sizes(program: ProgramNode) -> dict[str, tuple[int, int]]:
+    """Count and total size of the objects reachable from program by kind.
+
+    Every object is counted once however often it is referenced, so shared
+    tokens and interned strings are not double counted.
+    """
+    seen: set[int] = set()
+    sizes: dict[str, tuple[int, int]] = {}
+
+    def add(kind: str, obj: object) -> None:
+        count, total = sizes.get(kind, (0, 0))
+        sizes[kind] = (count + 1, total + _size(obj))
+
+    stack: list[object] = [program]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if isinstance(item, Node):
+            add(type(item).__name__, item)
+            stack.extend(vars(item).values())
+        elif isinstance(item, Token):
+            add("Token", item)
+            stack.append(item.literal)
+        elif isinstance(item, list):
+            add("list", item)
+            stack.extend(item)
+        elif isinstance(item, str):
+            add("str", item)
+    return sizes
+
+
+def profile(source: str, top: int = 10) -> dict[str, Any]:
+    tracemalloc.start()
+    try:
+        program = Parser(Lexer(source)).parse_program()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    assert program is not None
+
+    kilobytes = max(len(source.encode()) / 1024, 1 / 1024)
+    objects = {
+        kind: {"count": count, "bytes": total, "bytes_per_kb": total / kilobytes}
+        for kind, (count, total) in sorted(
+            object_sizes(program).items(), key=lambda item: -item[1][1]
+        )
+    }
+    snapshot = snapshot.filter_traces(
+        [tracemalloc.Filter(True, f"*{os.sep}monkeypie{os.sep}{f}") for f in SITE_FILES]
+    )
+    sites = {
+        f"{os.path.basename(s.traceback[0].filename)}:{s.traceback[0].lineno}": {
+            "count": s.count,
+            "bytes": s.size,
+        }
+        for s in snapshot.statistics("lineno")[:top]
+    }
+    return {"source_bytes": len(source.encode()), "objects": objects, "sites": sites}
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(f"source: {report['source_bytes'] / 1024:.1f} KB")
+    print(f"{'object':28} {'count':>10} {'bytes':>12} {'bytes/KB':>10}")
+    for kind, entry in report["objects"].items():
+        print(
+            f"{kind:28} {entry['count']:10} {entry['bytes']:12}"
+            f" {entry['bytes_per_kb']:10.0f}"
+        )
+    print(f"\n{'allocation site':28} {'count':>10} {'bytes':>12}")
+    for site, entry in report["sites"].items():
+        print(f"{site:28} {entry['count']:10} {entry['bytes']:12}")
+
+
+def print_diff(baseline: dict[str, Any], report: dict[str, Any]) -> None:
+    for section, key in (("objects", "bytes_per_kb"), ("sites", "bytes")):
+        print(f"{section:28} {'before':>12} {'after':>12} {'change':>12}")
+        old, new = baseline[section], report[section]
+        for name in sorted(old.keys() | new.keys()):
+            before = old.get(name, {}).get(key, 0)
+            after = new.get(name, {}).get(key, 0)
+            if before != after:
+                print(f"{name:28} {before:12.0f} {after:12.0f} {after - before:+12.0f}")
+        print()
+
+
+def main(argv: list[str] | None = None) -> None:
+    argparser = argparse.ArgumentParser(
+        prog="python -m monkeypie.memprofile", description=__doc__
+    )
+    argparser.add_argument("file")
+    argparser.add_argument("--top", type=int, default=10)
+    argparser.add_argument("--save", metavar="PATH", help="write the report as JSON")
+    argparser.add_argument("--diff", metavar="PATH", help="saved report to compare")
+    args = argparser.parse_args(argv)
+
+    with open(args.file, encoding="utf-8") as file:
+        report = profile(file.read(), args.top)
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.diff:
+        with open(args.diff) as file:
+            print_diff(json.load(file), report)
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
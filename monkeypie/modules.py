@@ -0,0 +1,239 @@
+"""Modules: Monkey source files brought into a program with ``import "path";``.
+
+ModuleLoader.load(path) reads the file at path and every file it imports,
+directly or not, parsing files concurrently as their imports are
+discovered. It then checks the import graph for cycles and links each import
+statement to the Module it names. Paths in import statements are relative to
+the directory of the importing file.
+
+Modules are cached for the life of the loader, by default the process-wide
+one behind load() and link(). A cached module is reused while its file's
+modification time and size are unchanged, or its contents still hash the
+same, and the modules it imports are themselves reused. A Module's top-level
+statements are evaluated once, the first time it is imported, and every
+importer gets the same bindings.
+"""
+
+import hashlib
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING
+
+from monkeypie.ast import ImportStatement, Node, ProgramNode
+from monkeypie.environment import Environment
+from monkeypie.lexer import Lexer
+from monkeypie.object import Error, Object
+from monkeypie.parser import Parser
+
+if TYPE_CHECKING:
+    from monkeypie.evaluator import Evaluator
+
+
+class ModuleError(Exception):
+    """A module could not be read or parsed."""
+
+
+class ImportCycleError(ModuleError):
+    def __init__(self, cycle: list[str]):
+        super().__init__("import cycle: " + " -> ".join(cycle))
+        self.cycle = cycle
+
+
+def _imports(program: ProgramNode) -> list[ImportStatement]:
+    # Import statements at any depth, as blocks and function bodies may
+    # import too.
+    imports = []
+    stack: list[object] = [program]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(reversed(item))
+        elif isinstance(item, ImportStatement):
+            imports.append(item)
+        elif isinstance(item, Node):
+            stack.extend(reversed(vars(item).values()))
+    return imports
+
+
+class Module:
+    """A parsed source file and, once evaluated, the names it binds."""
+
+    def __init__(self, path: str, source: bytes, mtime_ns: int = 0, size: int = 0):
+        self.path = path
+        self.source = source
+        self.digest = hashlib.sha256(source).digest()
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+        parser = Parser(Lexer(source))
+        program = parser.parse_program()
+        if program is None or parser.errors():
+            raise ModuleError("\n".join(f"{path}:{e}" for e in parser.errors()))
+        self.program = program
+
+        directory = os.path.dirname(path)
+        self.imports = [
+            (statement, os.path.normpath(os.path.join(directory, statement.path)))
+            for statement in _imports(self.program)
+        ]
+        # The modules imports were linked to, by path; None until linked.
+        self.dependencies: dict[str, Module] | None = None
+        self._exports: dict[str, Object] | Error | None = None
+        self._lock = threading.Lock()
+
+    def dependency_paths(self) -> list[str]:
+        return list(dict.fromkeys(path for _, path in self.imports))
+
+    def unchanged(self, stat: os.stat_result) -> bool:
+        return (self.mtime_ns, self.size) == (stat.st_mtime_ns, stat.st_size)
+
+    def exports(self, evaluator: "Evaluator") -> dict[str, Object] | Error:
+        """Evaluate the module the first time and return what it binds.
+
+        An error stopping the module is returned prefixed with its path, and
+        returned again to later importers.
+        """
+        with self._lock:
+            if self._exports is None:
+                env = Environment()
+                result = evaluator.evaluate(self.program, env)
+                if isinstance(result, Error):
+                    self._exports = Error(f"{self.path}: {result.message}")
+                else:
+                    self._exports = dict(env.items())
+            return self._exports
+
+
+class ModuleLoader:
+    """Loads modules and what they import, caching them by path.
+
+    workers is the number of threads reading and parsing files, by default
+    chosen by ThreadPoolExecutor.
+    """
+
+    def __init__(self, workers: int | None = None):
+        self.workers = workers
+        self._cache: dict[str, Module] = {}
+        self._lock = threading.Lock()
+
+    def load(self, path: str) -> Module:
+        """Load the module at path with everything it imports.
+
+        Raises ModuleError if a module cannot be read or parsed, and
+        ImportCycleError if modules import each other.
+        """
+        root = os.path.abspath(path)
+        return self._load([root])[root]
+
+    def link(self, program: ProgramNode, directory: str = ".") -> None:
+        """Load what program imports, relative to directory, and link it.
+
+        For programs that were not read from a file, such as REPL input.
+        """
+        directory = os.path.abspath(directory)
+        imports = [
+            (statement, os.path.normpath(os.path.join(directory, statement.path)))
+            for statement in _imports(program)
+        ]
+        modules = self._load(list(dict.fromkeys(path for _, path in imports)))
+        for statement, path in imports:
+            statement.module = modules[path]
+
+    def cached(self, path: str) -> Module | None:
+        with self._lock:
+            return self._cache.get(os.path.abspath(path))
+
+    def _load(self, roots: list[str]) -> dict[str, Module]:
+        modules: dict[str, Module] = {}
+        submitted = set(roots)
+        with ThreadPoolExecutor(self.workers, "monkeypie-import") as executor:
+            pending: set[Future[Module]] = {
+                executor.submit(self._read, path) for path in roots
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    module = future.result()
+                    modules[module.path] = module
+                    for path in module.dependency_paths():
+                        if path not in submitted:
+                            submitted.add(path)
+                            pending.add(executor.submit(self._read, path))
+
+        linked: dict[str, Module] = {}
+        for path in _dependencies_first(roots, modules):
+            linked[path] = self._link(modules[path], linked)
+        return linked
+
+    def _read(self, path: str) -> Module:
+        try:
+            stat = os.stat(path)
+            with self._lock:
+                cached = self._cache.get(path)
+            if cached is not None and cached.unchanged(stat):
+                return cached
+            with open(path, "rb") as file:
+                source = file.read()
+        except OSError as e:
+            raise ModuleError(f"cannot read {path}: {e.strerror}") from e
+        if cached is not None and cached.digest == hashlib.sha256(source).digest():
+            cached.mtime_ns, cached.size = stat.st_mtime_ns, stat.st_size
+            return cached
+        return Module(path, source, stat.st_mtime_ns, stat.st_size)
+
+    def _link(self, module: Module, linked: dict[str, Module]) -> Module:
+        dependencies = {path: linked[path] for path in module.dependency_paths()}
+        if module.dependencies is not None:
+            if all(
+                module.dependencies[path] is dependency
+                for path, dependency in dependencies.items()
+            ):
+                return module
+            # The file is unchanged but something it imports is not, so what
+            # it binds may differ too. Reparse rather than relink, as the
+            # cached module's statements may still be evaluated elsewhere.
+            module = Module(module.path, module.source, module.mtime_ns, module.size)
+        for statement, path in module.imports:
+            statement.module = dependencies[path]
+        module.dependencies = dependencies
+        with self._lock:
+            self._cache[module.path] = module
+        return module
+
+
+def _dependencies_first(roots: list[str], modules: dict[str, Module]) -> list[str]:
+    # Every module after the ones it imports; raises ImportCycleError if
+    # there is no such order.
+    order: list[str] = []
+    done: set[str] = set()
+    stack: list[str] = []
+
+    def visit(path: str) -> None:
+        stack.append(path)
+        for dependency in modules[path].dependency_paths():
+            if dependency in stack:
+                raise ImportCycleError(stack[stack.index(dependency) :] + [dependency])
+            if dependency not in done:
+                visit(dependency)
+        stack.pop()
+        done.add(path)
+        order.append(path)
+
+    for root in roots:
+        if root not in done:
+            visit(root)
+    return order
+
+
+_loader = ModuleLoader()
+
+
+def load(path: str) -> Module:
+    """Load the module at path through the process-wide loader."""
+    return _loader.load(path)
+
+
+def link(program: ProgramNode, directory: str = ".") -> None:
+    """Link what program imports through the process-wide loader."""
+    _loader.link(program, directory)
@@ -0,0 +1,205 @@
+from abc import ABCMeta, abstractmethod
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from monkeypie.ast import BlockStatement, IdentifierExpression
+from monkeypie.persistent import HashTrie, PersistentVector
+
+if TYPE_CHECKING:
+    from monkeypie.environment import Environment
+
+
+class ObjectType(Enum):
+    INTEGER = "INTEGER"
+    BOOLEAN = "BOOLEAN"
+    NULL = "NULL"
+    RETURN_VALUE = "RETURN_VALUE"
+    ERROR = "ERROR"
+    FUNCTION = "FUNCTION"
+    ARRAY = "ARRAY"
+    HASH = "HASH"
+    BUILTIN = "BUILTIN"
+
+
+# Hash keys identify the value of a hashable object, by type and value.
+HashKey = tuple[ObjectType, int]
+
+
+class Object(metaclass=ABCMeta):
+    @abstractmethod
+    def type(self) -> ObjectType:
+        raise NotImplementedError
+
+    @abstractmethod
+    def inspect(self) -> str:
+        raise NotImplementedError
+
+
+class Integer(Object):
+    def __init__(self, value: int):
+        self.value = value
+
+    def type(self) -> ObjectType:
+        return ObjectType.INTEGER
+
+    def inspect(self) -> str:
+        return str(self.value)
+
+    def hash_key(self) -> HashKey:
+        return (ObjectType.INTEGER, self.value)
+
+
+class Boolean(Object):
+    def __init__(self, value: bool):
+        self.value = value
+
+    def type(self) -> ObjectType:
+        return ObjectType.BOOLEAN
+
+    def inspect(self) -> str:
+        return str(self.value).lower()
+
+    def hash_key(self) -> HashKey:
+        return (ObjectType.BOOLEAN, self.value)
+
+    def __reduce__(self) -> str:
+        # Unpickled as the singleton, as booleans compare by identity.
+        return "TRUE" if self.value else "FALSE"
+
+
+class Null(Object):
+    def type(self) -> ObjectType:
+        return ObjectType.NULL
+
+    def inspect(self) -> str:
+        return "null"
+
+    def __reduce__(self) -> str:
+        return "NULL"
+
+
+class ReturnValue(Object):
+    def __init__(self, value: Object):
+        self.value = value
+
+    def type(self) -> ObjectType:
+        return ObjectType.RETURN_VALUE
+
+    def inspect(self) -> str:
+        return self.value.inspect()
+
+
+class Error(Object):
+    def __init__(self, message: str):
+        self.message = message
+
+    def type(self) -> ObjectType:
+        return ObjectType.ERROR
+
+    def inspect(self) -> str:
+        return f"ERROR: {self.message}"
+
+
+class Function(Object):
+    def __init__(
+        self,
+        parameters: list[IdentifierExpression],
+        body: BlockStatement,
+        env: "Environment",
+    ):
+        self.parameters = parameters
+        self.body = body
+        self.env = env
+
+    def type(self) -> ObjectType:
+        return ObjectType.FUNCTION
+
+    def inspect(self) -> str:
+        return f"fn({', '.join(str(p) for p in self.parameters)}) {{\n{self.body}\n}}"
+
+
+class Array(Object):
+    """An array, viewing the elements of a vector from offset on.
+
+    Views made by rest() share the vector of the array they are made from, so
+    walking an array with rest() copies nothing. The elements before the
+    offset are only dropped, by materialize(), once a push would otherwise
+    keep more of them alive than there are elements in the view.
+    """
+
+    def __init__(self, elements: PersistentVector[Object], offset: int = 0):
+        self.elements = elements
+        self.offset = offset
+
+    def type(self) -> ObjectType:
+        return ObjectType.ARRAY
+
+    def inspect(self) -> str:
+        return f"[{', '.join(element.inspect() for element in self.iterate())}]"
+
+    def length(self) -> int:
+        return len(self.elements) - self.offset
+
+    def iterate(self) -> Iterator[Object]:
+        return self.elements.iterate(self.offset)
+
+    def get(self, index: int) -> Object | None:
+        if not 0 <= index < self.length():
+            return None
+        return self.elements[self.offset + index]
+
+    def rest(self) -> "Array":
+        return Array(self.elements, self.offset + 1)
+
+    def push(self, value: Object) -> "Array":
+        array = self if self.offset <= self.length() else self.materialize()
+        return Array(array.elements.append(value), array.offset)
+
+    def materialize(self) -> "Array":
+        """Return this array with the elements before the offset dropped."""
+        if self.offset == 0:
+            return self
+        return Array(PersistentVector.from_iterable(self.iterate()))
+
+
+class Hash(Object):
+    """A hash, whose pairs map the hash key of each key to the key and value."""
+
+    def __init__(self, pairs: HashTrie[HashKey, tuple[Object, Object]]):
+        self.pairs = pairs
+
+    def type(self) -> ObjectType:
+        return ObjectType.HASH
+
+    def inspect(self) -> str:
+        pairs = (
+            f"{key.inspect()}: {value.inspect()}" for key, value in self.pairs.values()
+        )
+        return f"{{{', '.join(pairs)}}}"
+
+
+class Builtin(Object):
+    """A builtin function.
+
+    A higher-order builtin is passed the evaluator ahead of its arguments, to
+    apply the functions it is given with.
+    """
+
+    def __init__(
+        self, name: str, function: Callable[..., Object], higher_order: bool = False
+    ):
+        self.name = name
+        self.function = function
+        self.higher_order = higher_order
+        self.arity = function.__code__.co_argcount - higher_order
+
+    def type(self) -> ObjectType:
+        return ObjectType.BUILTIN
+
+    def inspect(self) -> str:
+        return f"builtin function {self.name}"
+
+
+TRUE = Boolean(True)
+FALSE = Boolean(False)
+NULL = Null()
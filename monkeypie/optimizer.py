@@ -0,0 +1,526 @@
+from collections import Counter
+
+from monkeypie.analysis import free_identifiers
+from monkeypie.ast import (
+    ArrayLiteralExpression,
+    BlockStatement,
+    BooleanLiteralExpression,
+    CallExpression,
+    ExpressionNode,
+    ExpressionStatement,
+    FunctionLiteralExpression,
+    HashLiteralExpression,
+    IdentifierExpression,
+    IfExpression,
+    ImportStatement,
+    IndexExpression,
+    InfixExpression,
+    IntegerLiteralExpression,
+    LetStatement,
+    Node,
+    PrefixExpression,
+    ProgramNode,
+    ReturnStatement,
+    StatementNode,
+)
+
+# Largest function body, in nodes, that is inlined at its call sites.
+DEFAULT_BUDGET = 16
+
+LITERALS = (IntegerLiteralExpression, BooleanLiteralExpression)
+
+
+def size(node: Node | None) -> int:
+    """Number of nodes in the tree rooted at node."""
+    total = 0
+    stack: list[object] = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, Node):
+            total += 1
+            stack.extend(vars(item).values())
+    return total
+
+
+def _bindings(program: ProgramNode) -> Counter[str]:
+    # How often each name is bound by a let or a parameter anywhere.
+    names: Counter[str] = Counter()
+    stack: list[object] = [program]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, Node):
+            if isinstance(item, LetStatement):
+                names[item.name.value] += 1
+            elif isinstance(item, FunctionLiteralExpression):
+                names.update(parameter.value for parameter in item.parameters)
+            stack.extend(vars(item).values())
+    return names
+
+
+def _has_import(program: ProgramNode) -> bool:
+    stack: list[object] = [program]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, ImportStatement):
+            return True
+        elif isinstance(item, Node):
+            stack.extend(vars(item).values())
+    return False
+
+
+def _local_names(literal: FunctionLiteralExpression) -> set[str]:
+    # Parameters and the names of lets in the body at any depth, all of
+    # which live in the environment of a call to the function.
+    names = {parameter.value for parameter in literal.parameters}
+    stack: list[object] = [literal.body]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, Node) and not isinstance(item, FunctionLiteralExpression):
+            if isinstance(item, LetStatement):
+                names.add(item.name.value)
+            stack.extend(vars(item).values())
+    return names
+
+
+def _has_let(node: Node | None) -> bool:
+    # True if evaluating node may bind a name in the current environment.
+    stack: list[object] = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, LetStatement):
+            return True
+        elif isinstance(item, Node) and not isinstance(item, FunctionLiteralExpression):
+            stack.extend(vars(item).values())
+    return False
+
+
+def _only_expressions(node: Node | None) -> bool:
+    # True if node has no lets, returns or function literals, so that it
+    # means the same wherever it is placed.
+    match node:
+        case None | IdentifierExpression() | IntegerLiteralExpression():
+            return True
+        case BooleanLiteralExpression():
+            return True
+        case PrefixExpression():
+            return _only_expressions(node.right)
+        case InfixExpression():
+            return _only_expressions(node.left) and _only_expressions(node.right)
+        case IfExpression():
+            return (
+                _only_expressions(node.condition)
+                and _only_expressions(node.consequence)
+                and _only_expressions(node.alternative)
+            )
+        case CallExpression():
+            return _only_expressions(node.function) and all(
+                _only_expressions(argument) for argument in node.arguments
+            )
+        case ArrayLiteralExpression():
+            return all(_only_expressions(element) for element in node.elements)
+        case HashLiteralExpression():
+            return all(map(_only_expressions, node.keys)) and all(
+                map(_only_expressions, node.values)
+            )
+        case IndexExpression():
+            return _only_expressions(node.left) and _only_expressions(node.index)
+        case BlockStatement():
+            return all(
+                isinstance(statement, ExpressionStatement)
+                and _only_expressions(statement.expression)
+                for statement in node.statements
+            )
+    return False
+
+
+def _evaluation_order(node: ExpressionNode | None, out: list[ExpressionNode]) -> None:
+    # The expressions evaluated whatever the branches taken, in the order the
+    # evaluator evaluates them.
+    match node:
+        case PrefixExpression():
+            _evaluation_order(node.right, out)
+        case InfixExpression():
+            _evaluation_order(node.left, out)
+            _evaluation_order(node.right, out)
+        case IfExpression():
+            _evaluation_order(node.condition, out)
+        case CallExpression():
+            _evaluation_order(node.function, out)
+            for argument in node.arguments:
+                _evaluation_order(argument, out)
+        case ArrayLiteralExpression():
+            for element in node.elements:
+                _evaluation_order(element, out)
+        case HashLiteralExpression():
+            for key, value in zip(node.keys, node.values):
+                _evaluation_order(key, out)
+                _evaluation_order(value, out)
+        case IndexExpression():
+            _evaluation_order(node.left, out)
+            _evaluation_order(node.index, out)
+    if node is not None:
+        out.append(node)
+
+
+def _body_expression(literal: FunctionLiteralExpression) -> ExpressionNode | None:
+    if len(literal.body.statements) != 1:
+        return None
+    match literal.body.statements[0]:
+        case (
+            ExpressionStatement(expression=expression)
+            | ReturnStatement(return_value=expression)
+        ):
+            return expression if _only_expressions(expression) else None
+    return None
+
+
+def _substitute(
+    node: ExpressionNode | None, arguments: dict[str, ExpressionNode]
+) -> ExpressionNode | None:
+    match node:
+        case IdentifierExpression() if node.value in arguments:
+            return arguments[node.value]
+        case PrefixExpression():
+            return PrefixExpression(
+                node.token, node.operator, _substitute(node.right, arguments)
+            )
+        case InfixExpression():
+            return InfixExpression(
+                node.token,
+                _substitute(node.left, arguments),
+                node.operator,
+                _substitute(node.right, arguments),
+            )
+        case IfExpression():
+            return IfExpression(
+                node.token,
+                _substitute(node.condition, arguments),
+                _substitute_block(node.consequence, arguments),
+                None
+                if node.alternative is None
+                else _substitute_block(node.alternative, arguments),
+            )
+        case CallExpression():
+            return CallExpression(
+                node.token,
+                _substitute(node.function, arguments),
+                [_substitute(argument, arguments) for argument in node.arguments],  # type: ignore[misc]
+            )
+        case ArrayLiteralExpression():
+            return ArrayLiteralExpression(
+                node.token,
+                [_substitute(element, arguments) for element in node.elements],  # type: ignore[misc]
+            )
+        case HashLiteralExpression():
+            return HashLiteralExpression(
+                node.token,
+                [_substitute(key, arguments) for key in node.keys],  # type: ignore[misc]
+                [_substitute(value, arguments) for value in node.values],  # type: ignore[misc]
+            )
+        case IndexExpression():
+            return IndexExpression(
+                node.token,
+                _substitute(node.left, arguments),
+                _substitute(node.index, arguments),
+            )
+    return node
+
+
+def _substitute_block(
+    block: BlockStatement, arguments: dict[str, ExpressionNode]
+) -> BlockStatement:
+    substituted = BlockStatement(block.token)
+    substituted.last_token = block.last_token
+    for statement in block.statements:
+        assert isinstance(statement, ExpressionStatement)
+        substituted.statements.append(
+            ExpressionStatement(
+                statement.token, _substitute(statement.expression, arguments)
+            )
+        )
+    return substituted
+
+
+class _Scope:
+    """A function literal enclosing the expression being optimized."""
+
+    def __init__(self, literal: FunctionLiteralExpression):
+        self.parameters = {parameter.value for parameter in literal.parameters}
+        self.names = _local_names(literal)
+
+
+class Optimizer:
+    """Inlines small helper functions and drops unreachable statements.
+
+    A function is inlined at a call site when it is bound by a top-level let
+    of a name bound nowhere else, the call comes after that let, its body is
+    a single expression of at most budget nodes without lets, returns or
+    function literals, it is not recursive, and none of its free identifiers
+    is bound by a function around the call. The call is replaced by the body
+    with the arguments substituted for the parameters. Errors, and which
+    error a program stops with, are preserved: an argument that may fail or
+    be costly to repeat is substituted only if its parameter is used exactly
+    once, outside of any branch, in parameter order, with nothing that may
+    fail evaluated before it. Nothing is inlined in programs with imports,
+    which bind names that are only known once the modules are loaded.
+
+    Statements after a return in a block or in the program are removed.
+    Optimizing builds new nodes where anything changes and shares the rest
+    with the original program, which is left as it is.
+    """
+
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        self.budget = budget
+        self.inlined = 0
+        self.eliminated = 0
+        self._bindings: Counter[str] = Counter()
+        self._helpers: dict[str, tuple[FunctionLiteralExpression, ExpressionNode]] = {}
+        self._globals: set[str] = set()
+
+    def optimize(self, program: ProgramNode) -> ProgramNode:
+        self._bindings = _bindings(program)
+        self._helpers = {}
+        self._globals = set()
+        inlining = not _has_import(program)
+        optimized = ProgramNode()
+        optimized.tokens = program.tokens
+        optimized.symbols = program.symbols
+        for statement in program.statements:
+            statement = self._statement(statement, [])
+            optimized.statements.append(statement)
+            if isinstance(statement, ReturnStatement):
+                self.eliminated += len(program.statements) - len(optimized.statements)
+                break
+            if isinstance(statement, LetStatement) and inlining:
+                self._add_global(statement)
+        return optimized
+
+    def _add_global(self, statement: LetStatement) -> None:
+        name = statement.name.value
+        self._globals.add(name)
+        literal = statement.value
+        if not isinstance(literal, FunctionLiteralExpression):
+            return
+        parameters = [parameter.value for parameter in literal.parameters]
+        body = _body_expression(literal)
+        if (
+            body is not None
+            and size(body) <= self.budget
+            and self._bindings[name] == 1
+            and len(set(parameters)) == len(parameters)
+            and name not in free_identifiers(literal)
+        ):
+            self._helpers[name] = (literal, body)
+
+    def _block(self, block: BlockStatement, scopes: list[_Scope]) -> BlockStatement:
+        statements: list[StatementNode] = []
+        for statement in block.statements:
+            statements.append(self._statement(statement, scopes))
+            if isinstance(statement, ReturnStatement):
+                self.eliminated += len(block.statements) - len(statements)
+                break
+        if all(new is old for new, old in zip(statements, block.statements)) and len(
+            statements
+        ) == len(block.statements):
+            return block
+        optimized = BlockStatement(block.token)
+        optimized.last_token = block.last_token
+        optimized.statements = statements
+        return optimized
+
+    def _statement(
+        self, statement: StatementNode, scopes: list[_Scope]
+    ) -> StatementNode:
+        match statement:
+            case ExpressionStatement():
+                expression = self._expression(statement.expression, scopes)
+                if expression is statement.expression:
+                    return statement
+                optimized: StatementNode = ExpressionStatement(
+                    statement.token, expression
+                )
+            case ReturnStatement():
+                expression = self._expression(statement.return_value, scopes)
+                if expression is statement.return_value:
+                    return statement
+                optimized = ReturnStatement(statement.token, expression)
+            case LetStatement():
+                expression = self._expression(statement.value, scopes)
+                if expression is statement.value:
+                    return statement
+                optimized = LetStatement(statement.token, statement.name, expression)
+            case _:
+                return statement
+        optimized.last_token = statement.last_token
+        return optimized
+
+    def _expression(
+        self, node: ExpressionNode | None, scopes: list[_Scope]
+    ) -> ExpressionNode | None:
+        match node:
+            case PrefixExpression():
+                right = self._expression(node.right, scopes)
+                if right is node.right:
+                    return node
+                return PrefixExpression(node.token, node.operator, right)
+            case InfixExpression():
+                left = self._expression(node.left, scopes)
+                right = self._expression(node.right, scopes)
+                if left is node.left and right is node.right:
+                    return node
+                return InfixExpression(node.token, left, node.operator, right)
+            case IfExpression():
+                condition = self._expression(node.condition, scopes)
+                consequence = self._block(node.consequence, scopes)
+                alternative = (
+                    None
+                    if node.alternative is None
+                    else self._block(node.alternative, scopes)
+                )
+                if (
+                    condition is node.condition
+                    and consequence is node.consequence
+                    and alternative is node.alternative
+                ):
+                    return node
+                return IfExpression(node.token, condition, consequence, alternative)
+            case FunctionLiteralExpression():
+                body = self._block(node.body, [*scopes, _Scope(node)])
+                if body is node.body:
+                    return node
+                return FunctionLiteralExpression(node.token, node.parameters, body)
+            case CallExpression():
+                function = self._expression(node.function, scopes)
+                arguments = [
+                    self._expression(argument, scopes) for argument in node.arguments
+                ]
+                inlined = self._inline(function, arguments, scopes)
+                if inlined is not None:
+                    self.inlined += 1
+                    return inlined
+                if function is node.function and all(
+                    new is old for new, old in zip(arguments, node.arguments)
+                ):
+                    return node
+                call = CallExpression(node.token, function, arguments)  # type: ignore[arg-type]
+                call.last_token = node.last_token
+                return call
+            case ArrayLiteralExpression():
+                elements = [
+                    self._expression(element, scopes) for element in node.elements
+                ]
+                if all(new is old for new, old in zip(elements, node.elements)):
+                    return node
+                array = ArrayLiteralExpression(node.token, elements)  # type: ignore[arg-type]
+                array.last_token = node.last_token
+                return array
+            case HashLiteralExpression():
+                keys = [self._expression(key, scopes) for key in node.keys]
+                values = [self._expression(value, scopes) for value in node.values]
+                if all(new is old for new, old in zip(keys, node.keys)) and all(
+                    new is old for new, old in zip(values, node.values)
+                ):
+                    return node
+                hash_literal = HashLiteralExpression(node.token, keys, values)  # type: ignore[arg-type]
+                hash_literal.last_token = node.last_token
+                return hash_literal
+            case IndexExpression():
+                left = self._expression(node.left, scopes)
+                index = self._expression(node.index, scopes)
+                if left is node.left and index is node.index:
+                    return node
+                indexed = IndexExpression(node.token, left, index)
+                indexed.last_token = node.last_token
+                return indexed
+        return node
+
+    def _inline(
+        self,
+        function: ExpressionNode | None,
+        arguments: list[ExpressionNode | None],
+        scopes: list[_Scope],
+    ) -> ExpressionNode | None:
+        if not isinstance(function, IdentifierExpression):
+            return None
+        helper = self._helpers.get(function.value)
+        if helper is None:
+            return None
+        literal, body = helper
+        parameters = [parameter.value for parameter in literal.parameters]
+        if len(parameters) != len(arguments) or None in arguments:
+            return None
+        # A let in an argument changes the environment the rest of the call
+        # is evaluated in, which makes evaluation order matter.
+        if any(_has_let(argument) for argument in arguments):
+            return None
+        local = set().union(*(scope.names for scope in scopes))
+        if free_identifiers(literal) & local:
+            return None
+
+        # Arguments that can neither fail nor cost anything to evaluate may
+        # be substituted any number of times, including none.
+        parameters_in_scope = set().union(*(scope.parameters for scope in scopes))
+        substitutions: dict[str, ExpressionNode] = {}
+        ordered = []
+        for parameter, argument in zip(parameters, arguments):
+            assert argument is not None
+            substitutions[parameter] = argument
+            if not (
+                isinstance(argument, LITERALS)
+                or isinstance(argument, IdentifierExpression)
+                and (
+                    argument.value in parameters_in_scope
+                    or argument.value in self._globals
+                )
+            ):
+                ordered.append(parameter)
+
+        if ordered:
+            evaluated: list[ExpressionNode] = []
+            _evaluation_order(body, evaluated)
+            uses = [
+                i
+                for i, node in enumerate(evaluated)
+                if isinstance(node, IdentifierExpression) and node.value in ordered
+            ]
+            if [evaluated[i].value for i in uses] != ordered:  # type: ignore[attr-defined]
+                return None
+            if any(_count(body, parameter) != 1 for parameter in ordered):
+                return None
+            for node in evaluated[: uses[-1]]:
+                if not (
+                    isinstance(node, LITERALS)
+                    or isinstance(node, IdentifierExpression)
+                    and node.value in substitutions
+                ):
+                    return None
+        return _substitute(body, substitutions)
+
+
+def _count(node: Node | None, name: str) -> int:
+    count = 0
+    stack: list[object] = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, IdentifierExpression):
+            count += item.value == name
+        elif isinstance(item, Node):
+            stack.extend(vars(item).values())
+    return count
+
+
+def optimize(program: ProgramNode, budget: int = DEFAULT_BUDGET) -> ProgramNode:
+    """Return program with small helpers inlined and dead code removed."""
+    return Optimizer(budget).optimize(program)
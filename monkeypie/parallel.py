@@ -0,0 +1,203 @@
+"""Parallel map and reduce builtins, applying Monkey functions in other processes.
+
+pmap(array, fn) and preduce(array, initial, fn) split an array into chunks,
+send fn to a pool of worker processes along with each chunk and combine the
+results of the chunks in order. fn travels pickled as its AST together with
+the values of its free identifiers, rather than with the environment it
+closes over, which would drag every global of the program along. Monkey
+functions have no side effects, so where they run changes nothing but the
+time taken.
+
+Arrays shorter than the pool's min_elements, functions that cannot be
+pickled and evaluators that must see every call, such as LimitedEvaluator,
+apply fn serially in this process instead.
+"""
+
+import os
+import pickle
+from itertools import repeat
+from typing import TYPE_CHECKING
+
+from monkeypie.analysis import free_identifiers
+from monkeypie.environment import Environment
+from monkeypie.object import Array, Builtin, Error, Function, Object
+from monkeypie.persistent import PersistentVector
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+    from monkeypie.evaluator import Evaluator
+
+# Arrays with fewer elements are not worth shipping to other processes.
+MIN_ELEMENTS = 1024
+
+# Each worker gets this many chunks on average, which evens out chunks that
+# take longer than others.
+CHUNKS_PER_WORKER = 4
+
+
+class WorkerPool:
+    """Worker processes for pmap and preduce, started on first use.
+
+    workers defaults to the number of CPUs; with a single worker everything
+    runs serially.
+    """
+
+    def __init__(self, workers: int | None = None, min_elements: int = MIN_ELEMENTS):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.min_elements = min_elements
+        self._executor: "ProcessPoolExecutor | None" = None
+
+    def executor(self) -> "ProcessPoolExecutor":
+        if self._executor is None:
+            # Imported here as it pulls in multiprocessing, which would
+            # otherwise slow down every start of the REPL.
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._executor = ProcessPoolExecutor(
+                self.workers, initializer=_serial_worker
+            )
+        return self._executor
+
+    def chunks(self, elements: list[Object]) -> list[list[Object]]:
+        # At least one element per chunk, which also keeps the step of the
+        # range below from being zero for an empty array.
+        count = max(1, -(-len(elements) // (self.workers * CHUNKS_PER_WORKER)))
+        return [elements[i : i + count] for i in range(0, len(elements), count)]
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+_pool = WorkerPool()
+
+
+def use_pool(pool: WorkerPool) -> WorkerPool:
+    """Make pmap and preduce use pool and return the pool they used before."""
+    global _pool
+    previous, _pool = _pool, pool
+    return previous
+
+
+def _serial_worker() -> None:
+    # A forked worker inherits this process's pool, executor included;
+    # a pmap nested in fn would wait on that executor forever.
+    use_pool(WorkerPool(1))
+
+
+def detach(function: Function, memo: dict[int, Function] | None = None) -> Function:
+    """Copy of function closing over the values of its free identifiers only.
+
+    Functions among those values are detached in turn, memo keeping recursive
+    and mutually recursive functions pointing at each other's copies.
+    """
+    memo = {} if memo is None else memo
+    copy = memo.get(id(function))
+    if copy is not None:
+        return copy
+    env = Environment()
+    copy = memo[id(function)] = Function(function.parameters, function.body, env)
+    names = free_identifiers(function.body) - {p.value for p in function.parameters}
+    for name in names:
+        value = function.env.get(name)
+        if isinstance(value, Function):
+            value = detach(value, memo)
+        if value is not None:
+            env.set(name, value)
+    return copy
+
+
+def _payload(evaluator: "Evaluator", function: Object, count: int) -> bytes | None:
+    # What workers need to apply function, or None to apply it here.
+    if _pool.workers <= 1 or count < _pool.min_elements:
+        return None
+    if not isinstance(function, (Function, Builtin)):
+        return None
+    factory = evaluator.worker_factory()
+    if factory is None:
+        return None
+    try:
+        # Both walk the body recursively, which bodies nested deeply enough
+        # do not survive.
+        if isinstance(function, Function):
+            function = detach(function)
+        return pickle.dumps((factory, function))
+    except (pickle.PicklingError, AttributeError, TypeError, RecursionError):
+        return None
+
+
+def _map(
+    evaluator: "Evaluator", function: Object, elements: list[Object]
+) -> list[Object]:
+    results = []
+    for element in elements:
+        result = evaluator.apply_function(function, [element])
+        if isinstance(result, Error):
+            return [result]
+        results.append(result)
+    return results
+
+
+def _fold(
+    evaluator: "Evaluator", function: Object, initial: Object, elements: list[Object]
+) -> Object:
+    accumulator = initial
+    for element in elements:
+        accumulator = evaluator.apply_function(function, [accumulator, element])
+        if isinstance(accumulator, Error):
+            return accumulator
+    return accumulator
+
+
+def _map_chunk(payload: bytes, elements: list[Object]) -> list[Object]:
+    factory, function = pickle.loads(payload)
+    return _map(factory(), function, elements)
+
+
+def _reduce_chunk(payload: bytes, elements: list[Object]) -> Object:
+    factory, function = pickle.loads(payload)
+    return _fold(factory(), function, elements[0], elements[1:])
+
+
+def builtin_pmap(evaluator: "Evaluator", array: Object, function: Object) -> Object:
+    if not isinstance(array, Array):
+        return Error(f"argument to `pmap` must be ARRAY, got {array.type().value}")
+    elements = list(array.iterate())
+    payload = _payload(evaluator, function, len(elements))
+    if payload is None:
+        results = _map(evaluator, function, elements)
+    else:
+        results = []
+        chunks = _pool.chunks(elements)
+        for chunk in _pool.executor().map(_map_chunk, repeat(payload), chunks):
+            results.extend(chunk)
+            if isinstance(chunk[-1], Error):
+                break
+    if results and isinstance(results[-1], Error):
+        return results[-1]
+    return Array(PersistentVector.from_iterable(results))
+
+
+def builtin_preduce(
+    evaluator: "Evaluator", array: Object, initial: Object, function: Object
+) -> Object:
+    """Fold array into initial with function, which must be associative.
+
+    Chunks are folded separately, starting from their first element, and the
+    results folded into initial in order.
+    """
+    if not isinstance(array, Array):
+        return Error(f"argument to `preduce` must be ARRAY, got {array.type().value}")
+    elements = list(array.iterate())
+    payload = _payload(evaluator, function, len(elements))
+    if payload is None:
+        return _fold(evaluator, function, initial, elements)
+    partials = []
+    chunks = _pool.chunks(elements)
+    for partial in _pool.executor().map(_reduce_chunk, repeat(payload), chunks):
+        if isinstance(partial, Error):
+            return partial
+        partials.append(partial)
+    return _fold(evaluator, function, initial, partials)
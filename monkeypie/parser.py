@@ -1,7 +1,7 @@
 import os
 from enum import auto, IntEnum
-from functools import partial
-from typing import Callable, Final
+from types import MethodType
+from typing import Callable, Final, Generator, Protocol
 
 from monkeypie.ast import (
     ProgramNode,
@@ -9,6 +9,7 @@ from monkeypie.ast import (
     LetStatement,
     IdentifierExpression,
     ReturnStatement,
+    ImportStatement,
     ExpressionNode,
     ExpressionStatement,
     IntegerLiteralExpression,
@@ -19,12 +20,16 @@ from monkeypie.ast import (
     BlockStatement,
     FunctionLiteralExpression,
     CallExpression,
+    ArrayLiteralExpression,
+    IndexExpression,
+    HashLiteralExpression,
 )
-from monkeypie.lexer import Lexer
-from monkeypie.token import Token, TokenType
+from monkeypie.hashcons import InternTable
+from monkeypie.symbols import SymbolTable
+from monkeypie.token import TOKEN_TYPES, Token, TokenKind
 
 PrefixParseFn = Callable[[], ExpressionNode | None]
-InfixParseFn = Callable[[ExpressionNode], ExpressionNode]
+InfixParseFn = Callable[[ExpressionNode], ExpressionNode | None]
 
 
 class Precedence(IntEnum):
@@ -35,23 +40,29 @@ class Precedence(IntEnum):
     PRODUCT = auto()
     PREFIX = auto()
     CALL = auto()
+    INDEX = auto()
 
 
-PRECEDENCES: Final[dict[TokenType, Precedence]] = {
-    TokenType.EQ: Precedence.EQUALS,
-    TokenType.NOT_EQ: Precedence.EQUALS,
-    TokenType.LT: Precedence.LESS_GREATER,
-    TokenType.GT: Precedence.LESS_GREATER,
-    TokenType.PLUS: Precedence.SUM,
-    TokenType.MINUS: Precedence.SUM,
-    TokenType.SLASH: Precedence.PRODUCT,
-    TokenType.ASTERISK: Precedence.PRODUCT,
-    TokenType.LPAREN: Precedence.CALL,
-}
+PRECEDENCES: Final[list[Precedence]] = [Precedence.LOWEST] * len(TOKEN_TYPES)
+PRECEDENCES[TokenKind.EQ] = Precedence.EQUALS
+PRECEDENCES[TokenKind.NOT_EQ] = Precedence.EQUALS
+PRECEDENCES[TokenKind.LT] = Precedence.LESS_GREATER
+PRECEDENCES[TokenKind.GT] = Precedence.LESS_GREATER
+PRECEDENCES[TokenKind.PLUS] = Precedence.SUM
+PRECEDENCES[TokenKind.MINUS] = Precedence.SUM
+PRECEDENCES[TokenKind.SLASH] = Precedence.PRODUCT
+PRECEDENCES[TokenKind.ASTERISK] = Precedence.PRODUCT
+PRECEDENCES[TokenKind.LPAREN] = Precedence.CALL
+PRECEDENCES[TokenKind.LBRACKET] = Precedence.INDEX
 
 
 class Trace:
-    level: int = 0
+    """Print entry into and exit from a parse function.
+
+    Tracing is enabled by setting MONKEYPIE_PARSE_TRACE_ENABLED. The nesting
+    level is kept on the parser being traced, so parsers running concurrently
+    trace independently; when disabled, the wrapped function is bound directly.
+    """
 
     def __init__(self, wrapped: Callable):
         self._wrapped = wrapped
@@ -61,69 +72,105 @@ class Trace:
             self._action = self._wrapped
 
     def __get__(self, instance, owner):
-        return partial(self.__call__, instance)
+        if instance is None:
+            return self
+        return MethodType(self._action, instance)
 
     def __call__(self, *args, **kwargs):
         return self._action(*args, **kwargs)
 
-    def _trace_action(self, *args, **kwargs):
-        Trace.level += 1
-        indent = "\t" * (Trace.level - 1)
-        print(f"{indent}BEGIN:", self._wrapped.__name__, args[1:], kwargs)
-        result = self._wrapped(*args, **kwargs)
-        print(f"{indent}END:", self._wrapped.__name__)
-        Trace.level -= 1
-        return result
+    def _trace_action(self, parser: "Parser", *args, **kwargs):
+        parser._trace_level += 1
+        indent = "\t" * (parser._trace_level - 1)
+        print(f"{indent}BEGIN:", self._wrapped.__name__, args, kwargs)
+        try:
+            return self._wrapped(parser, *args, **kwargs)
+        finally:
+            print(f"{indent}END:", self._wrapped.__name__)
+            parser._trace_level -= 1
 
 
-class Parser:
-    current_token: Token = Token(TokenType.ILLEGAL, "")
-    peek_token: Token = Token(TokenType.ILLEGAL, "")
+class TokenSource(Protocol):
+    """What a Parser reads tokens from: a Lexer, or tokens lexed earlier."""
+
+    symbols: SymbolTable
+
+    def next_token(self) -> Token: ...
+
+    def line_column(self, offset: int) -> tuple[int, int]: ...
 
-    def __init__(self, lexer: Lexer):
+
+class Parser:
+    def __init__(self, lexer: TokenSource, intern_table: InternTable | None = None):
+        """Parse the tokens of lexer.
+
+        Given an intern_table, structurally identical pure expressions are
+        hash-consed into shared instances as they are parsed. A shared
+        expression keeps the tokens of its first occurrence, so the spans of
+        later occurrences, and of the expressions around them, are wrong:
+        leave intern_table out wherever spans are used, as by incremental
+        reparsing, the profiler and the symbol index. Programs parsed with
+        one do not record ProgramNode.tokens, and reparse() refuses them.
+        """
         self._lexer = lexer
+        self._intern_table = intern_table
+        self.current_token = Token(TokenKind.ILLEGAL, "")
+        self.peek_token = Token(TokenKind.ILLEGAL, "")
+        self._trace_level = 0
         self._errors: list[str] = []
+        self._tokens: list[Token] | None = None
 
-        self._prefix_parse_functions: dict[TokenType, PrefixParseFn] = {}
-        self._infix_parse_functions: dict[TokenType, InfixParseFn] = {}
+        self._prefix_parse_functions: list[PrefixParseFn | None] = [None] * len(
+            TOKEN_TYPES
+        )
+        self._infix_parse_functions: list[InfixParseFn | None] = [None] * len(
+            TOKEN_TYPES
+        )
 
-        self.register_prefix_parse_function(TokenType.IDENT, self.parse_identifier)
+        self.register_prefix_parse_function(TokenKind.IDENT, self.parse_identifier)
+        self.register_prefix_parse_function(
+            TokenKind.INT, self.parse_integer_literal_expression
+        )
         self.register_prefix_parse_function(
-            TokenType.INT, self.parse_integer_literal_expression
+            TokenKind.BANG, self.parse_prefix_expression
         )
         self.register_prefix_parse_function(
-            TokenType.BANG, self.parse_prefix_expression
+            TokenKind.MINUS, self.parse_prefix_expression
         )
         self.register_prefix_parse_function(
-            TokenType.MINUS, self.parse_prefix_expression
+            TokenKind.TRUE, self.parse_boolean_literal_expression
         )
         self.register_prefix_parse_function(
-            TokenType.TRUE, self.parse_boolean_literal_expression
+            TokenKind.FALSE, self.parse_boolean_literal_expression
         )
         self.register_prefix_parse_function(
-            TokenType.FALSE, self.parse_boolean_literal_expression
+            TokenKind.LPAREN, self.parse_grouped_expression
         )
+        self.register_prefix_parse_function(TokenKind.IF, self.parse_if_expression)
         self.register_prefix_parse_function(
-            TokenType.LPAREN, self.parse_grouped_expression
+            TokenKind.FUNCTION, self.parse_function_literal
         )
-        self.register_prefix_parse_function(TokenType.IF, self.parse_if_expression)
         self.register_prefix_parse_function(
-            TokenType.FUNCTION, self.parse_function_literal
+            TokenKind.LBRACKET, self.parse_array_literal
         )
+        self.register_prefix_parse_function(TokenKind.LBRACE, self.parse_hash_literal)
 
-        self.register_infix_parse_function(TokenType.PLUS, self.parse_infix_expression)
-        self.register_infix_parse_function(TokenType.MINUS, self.parse_infix_expression)
-        self.register_infix_parse_function(TokenType.SLASH, self.parse_infix_expression)
+        self.register_infix_parse_function(TokenKind.PLUS, self.parse_infix_expression)
+        self.register_infix_parse_function(TokenKind.MINUS, self.parse_infix_expression)
+        self.register_infix_parse_function(TokenKind.SLASH, self.parse_infix_expression)
         self.register_infix_parse_function(
-            TokenType.ASTERISK, self.parse_infix_expression
+            TokenKind.ASTERISK, self.parse_infix_expression
         )
-        self.register_infix_parse_function(TokenType.EQ, self.parse_infix_expression)
+        self.register_infix_parse_function(TokenKind.EQ, self.parse_infix_expression)
         self.register_infix_parse_function(
-            TokenType.NOT_EQ, self.parse_infix_expression
+            TokenKind.NOT_EQ, self.parse_infix_expression
+        )
+        self.register_infix_parse_function(TokenKind.LT, self.parse_infix_expression)
+        self.register_infix_parse_function(TokenKind.GT, self.parse_infix_expression)
+        self.register_infix_parse_function(TokenKind.LPAREN, self.parse_call_expression)
+        self.register_infix_parse_function(
+            TokenKind.LBRACKET, self.parse_index_expression
         )
-        self.register_infix_parse_function(TokenType.LT, self.parse_infix_expression)
-        self.register_infix_parse_function(TokenType.GT, self.parse_infix_expression)
-        self.register_infix_parse_function(TokenType.LPAREN, self.parse_call_expression)
 
         self.next_token()
         self.next_token()
@@ -134,80 +181,115 @@ class Parser:
     def next_token(self):
         self.current_token = self.peek_token
         self.peek_token = self._lexer.next_token()
+        if self._tokens is not None:
+            self._tokens.append(self.peek_token)
+
+    def record_tokens(self) -> list[Token]:
+        """Collect every token read from here on, starting with the current one."""
+        self._tokens = [self.current_token, self.peek_token]
+        return self._tokens
 
-    def current_token_is(self, type: TokenType) -> bool:
-        return self.current_token.type == type
+    def current_token_is(self, kind: int) -> bool:
+        return self.current_token.kind == kind
 
-    def peek_token_is(self, type: TokenType) -> bool:
-        return self.peek_token.type == type
+    def peek_token_is(self, kind: int) -> bool:
+        return self.peek_token.kind == kind
 
-    def peek_error(self, type: TokenType):
-        self._errors.append(
-            f"expected next token to be {type}, got {self.peek_token.type} instead"
+    def error(self, token: Token, message: str) -> None:
+        line, column = self._lexer.line_column(token.start)
+        self._errors.append(f"{line}:{column}: {message}")
+
+    def peek_error(self, kind: int):
+        self.error(
+            self.peek_token,
+            f"expected next token to be {TOKEN_TYPES[kind]}, "
+            f"got {self.peek_token.type} instead",
         )
 
     def peek_precedence(self) -> Precedence:
-        try:
-            return PRECEDENCES[self.peek_token.type]
-        except KeyError:
-            return Precedence.LOWEST
+        return PRECEDENCES[self.peek_token.kind]
 
     def current_precedence(self) -> Precedence:
-        try:
-            return PRECEDENCES[self.current_token.type]
-        except KeyError:
-            return Precedence.LOWEST
+        return PRECEDENCES[self.current_token.kind]
 
-    def expect_peek(self, type: TokenType) -> bool:
-        if self.peek_token_is(type):
+    def expect_peek(self, kind: int) -> bool:
+        if self.peek_token.kind == kind:
             self.next_token()
             return True
-        self.peek_error(type)
+        self.peek_error(kind)
         return False
 
     def register_prefix_parse_function(
-        self, token_type: TokenType, prefix_parse_function: PrefixParseFn
+        self, kind: int, prefix_parse_function: PrefixParseFn
     ) -> None:
-        self._prefix_parse_functions[token_type] = prefix_parse_function
+        self._prefix_parse_functions[kind] = prefix_parse_function
 
     def register_infix_parse_function(
-        self, token_type: TokenType, infix_parse_function: InfixParseFn
+        self, kind: int, infix_parse_function: InfixParseFn
     ) -> None:
-        self._infix_parse_functions[token_type] = infix_parse_function
+        self._infix_parse_functions[kind] = infix_parse_function
 
     def parse_program(self) -> ProgramNode | None:
         program = ProgramNode()
-        while self.current_token.type != TokenType.EOF:
-            statement = self.parse_statement()
+        if self._intern_table is None:
+            program.tokens = self.record_tokens()
+        else:
+            program.hash_consed = True
+        program.symbols = self._lexer.symbols
+        for statement, _ in self.iter_statements():
             if statement:
                 program.statements.append(statement)
-            self.next_token()
 
         return program
 
+    def iter_statements(
+        self,
+    ) -> Generator[tuple[StatementNode | None, list[str]], None, None]:
+        """Parse the program one top-level statement at a time.
+
+        Each statement is yielded together with the errors reported while
+        parsing it, and a statement that failed to parse is yielded as None if
+        it reported any. The parser keeps no reference to a statement once it
+        has been yielded, so consuming statements as they come needs memory
+        for the largest statement rather than for the whole program.
+        """
+        while self.current_token.kind != TokenKind.EOF:
+            mark = len(self._errors)
+            statement = self.parse_statement()
+            self.next_token()
+            if statement or len(self._errors) > mark:
+                yield statement, self._errors[mark:]
+            del statement
+
     def parse_statement(self) -> StatementNode | None:
-        match self.current_token.type:
-            case TokenType.LET:
-                return self.parse_let_statement()
-            case TokenType.RETURN:
-                return self.parse_return_statement()
+        statement: StatementNode | None
+        match self.current_token.kind:
+            case TokenKind.LET:
+                statement = self.parse_let_statement()
+            case TokenKind.RETURN:
+                statement = self.parse_return_statement()
+            case TokenKind.IMPORT:
+                statement = self.parse_import_statement()
             case _:
-                return self.parse_expression_statement()
+                statement = self.parse_expression_statement()
+        if statement:
+            statement.last_token = self.current_token
+        return statement
 
     def parse_let_statement(self) -> LetStatement | None:
         statement = LetStatement(self.current_token)
-        if not self.expect_peek(TokenType.IDENT):
+        if not self.expect_peek(TokenKind.IDENT):
             return None
 
         statement.name = IdentifierExpression(
             self.current_token, self.current_token.literal
         )
-        if not self.expect_peek(TokenType.ASSIGN):
+        if not self.expect_peek(TokenKind.ASSIGN):
             return None
 
         self.next_token()
         statement.value = self.parse_expression(Precedence.LOWEST)
-        if self.peek_token_is(TokenType.SEMICOLON):
+        if self.peek_token_is(TokenKind.SEMICOLON):
             self.next_token()
 
         return statement
@@ -218,7 +300,18 @@ class Parser:
         self.next_token()
 
         statement.return_value = self.parse_expression(Precedence.LOWEST)
-        if self.peek_token_is(TokenType.SEMICOLON):
+        if self.peek_token_is(TokenKind.SEMICOLON):
+            self.next_token()
+
+        return statement
+
+    def parse_import_statement(self) -> ImportStatement | None:
+        statement = ImportStatement(self.current_token)
+        if not self.expect_peek(TokenKind.STRING):
+            return None
+
+        statement.path = self.current_token.literal
+        if self.peek_token_is(TokenKind.SEMICOLON):
             self.next_token()
 
         return statement
@@ -227,33 +320,41 @@ class Parser:
     def parse_expression_statement(self) -> ExpressionStatement:
         statement = ExpressionStatement(self.current_token)
         statement.expression = self.parse_expression(Precedence.LOWEST)
-        if self.peek_token_is(TokenType.SEMICOLON):
+        if self.peek_token_is(TokenKind.SEMICOLON):
             self.next_token()
         return statement
 
     @Trace
     def parse_expression(self, precedence: Precedence) -> ExpressionNode | None:
-        try:
-            prefix = self._prefix_parse_functions[self.current_token.type]
-        except KeyError:
-            self._errors.append(
-                f"no prefix parse function found for {self.current_token.type.value} found"
+        prefix = self._prefix_parse_functions[self.current_token.kind]
+        if prefix is None:
+            self.error(
+                self.current_token,
+                f"no prefix parse function found for {self.current_token.type.value} found",
             )
             return None
 
         left = prefix()
         if not left:
             return None
+        if left.last_token is None:
+            left.last_token = self.current_token
+            if self._intern_table is not None:
+                left = self._intern_table.intern(left)
         while (
-            not self.peek_token_is(TokenType.SEMICOLON)
-            and precedence < self.peek_precedence()
+            self.peek_token.kind != TokenKind.SEMICOLON
+            and precedence < PRECEDENCES[self.peek_token.kind]
         ):
-            try:
-                infix = self._infix_parse_functions[self.peek_token.type]
-            except KeyError:
+            infix = self._infix_parse_functions[self.peek_token.kind]
+            if infix is None:
                 return left
             self.next_token()
             left = infix(left)
+            if left is None:
+                return None
+            left.last_token = self.current_token
+            if self._intern_table is not None:
+                left = self._intern_table.intern(left)
 
         return left
 
@@ -268,8 +369,9 @@ class Parser:
             literal.value = int(self.current_token.literal)
             return literal
         except ValueError:
-            self._errors.append(
-                f"could not parse {self.current_token.literal} as integer"
+            self.error(
+                self.current_token,
+                f"could not parse {self.current_token.literal} as integer",
             )
             return None
 
@@ -293,33 +395,33 @@ class Parser:
     @Trace
     def parse_boolean_literal_expression(self) -> ExpressionNode:
         return BooleanLiteralExpression(
-            self.current_token, self.current_token_is(TokenType.TRUE)
+            self.current_token, self.current_token_is(TokenKind.TRUE)
         )
 
     @Trace
     def parse_grouped_expression(self) -> ExpressionNode | None:
         self.next_token()
         expression = self.parse_expression(Precedence.LOWEST)
-        if not self.expect_peek(TokenType.RPAREN):
+        if not self.expect_peek(TokenKind.RPAREN):
             return None
         return expression
 
     @Trace
     def parse_if_expression(self) -> ExpressionNode | None:
         expression = IfExpression(self.current_token)
-        if not self.expect_peek(TokenType.LPAREN):
+        if not self.expect_peek(TokenKind.LPAREN):
             return None
         self.next_token()
         expression.condition = self.parse_expression(Precedence.LOWEST)
-        if not self.expect_peek(TokenType.RPAREN):
+        if not self.expect_peek(TokenKind.RPAREN):
             return None
-        if not self.expect_peek(TokenType.LBRACE):
+        if not self.expect_peek(TokenKind.LBRACE):
             return None
         expression.consequence = self.parse_block_statement()
 
-        if self.peek_token_is(TokenType.ELSE):
+        if self.peek_token_is(TokenKind.ELSE):
             self.next_token()
-            if not self.expect_peek(TokenType.LBRACE):
+            if not self.expect_peek(TokenKind.LBRACE):
                 return None
             expression.alternative = self.parse_block_statement()
         return expression
@@ -328,29 +430,30 @@ class Parser:
     def parse_block_statement(self) -> StatementNode | None:
         block = BlockStatement(self.current_token)
         self.next_token()
-        while not self.current_token_is(TokenType.RBRACE) and not self.current_token_is(
-            TokenType.EOF
+        while not self.current_token_is(TokenKind.RBRACE) and not self.current_token_is(
+            TokenKind.EOF
         ):
             statement = self.parse_statement()
             if statement:
                 block.statements.append(statement)
             self.next_token()
+        block.last_token = self.current_token
         return block
 
     @Trace
     def parse_function_literal(self) -> ExpressionNode | None:
         literal = FunctionLiteralExpression(self.current_token)
-        if not self.expect_peek(TokenType.LPAREN):
+        if not self.expect_peek(TokenKind.LPAREN):
             return None
         literal.parameters = self.parse_function_parameters()
-        if not self.expect_peek(TokenType.LBRACE):
+        if not self.expect_peek(TokenKind.LBRACE):
             return None
         literal.body = self.parse_block_statement()
         return literal
 
     def parse_function_parameters(self) -> list[IdentifierExpression]:
         identifiers: list[IdentifierExpression] = []
-        if self.peek_token_is(TokenType.RPAREN):
+        if self.peek_token_is(TokenKind.RPAREN):
             self.next_token()
             return identifiers
         self.next_token()
@@ -358,14 +461,14 @@ class Parser:
             self.current_token, self.current_token.literal
         )
         identifiers.append(identifier)
-        while self.peek_token_is(TokenType.COMMA):
+        while self.peek_token_is(TokenKind.COMMA):
             self.next_token()
             self.next_token()
             identifier = IdentifierExpression(
                 self.current_token, self.current_token.literal
             )
             identifiers.append(identifier)
-        if not self.expect_peek(TokenType.RPAREN):
+        if not self.expect_peek(TokenKind.RPAREN):
             return []
         return identifiers
 
@@ -376,16 +479,54 @@ class Parser:
         return expression
 
     def parse_call_arguments(self) -> list[ExpressionNode]:
-        arguments: list[ExpressionNode] = []
-        if self.peek_token_is(TokenType.RPAREN):
+        return self.parse_expression_list(TokenKind.RPAREN)
+
+    def parse_expression_list(self, end: int) -> list[ExpressionNode]:
+        expressions: list[ExpressionNode] = []
+        if self.peek_token_is(end):
             self.next_token()
-            return arguments
+            return expressions
         self.next_token()
-        arguments.append(self.parse_expression(Precedence.LOWEST))
-        while self.peek_token_is(TokenType.COMMA):
+        expressions.append(self.parse_expression(Precedence.LOWEST))
+        while self.peek_token_is(TokenKind.COMMA):
             self.next_token()
             self.next_token()
-            arguments.append(self.parse_expression(Precedence.LOWEST))
-        if not self.expect_peek(TokenType.RPAREN):
+            expressions.append(self.parse_expression(Precedence.LOWEST))
+        if not self.expect_peek(end):
             return []
-        return arguments
+        return expressions
+
+    @Trace
+    def parse_array_literal(self) -> ExpressionNode | None:
+        array = ArrayLiteralExpression(self.current_token)
+        array.elements = self.parse_expression_list(TokenKind.RBRACKET)
+        return array
+
+    @Trace
+    def parse_index_expression(self, left: ExpressionNode) -> ExpressionNode | None:
+        expression = IndexExpression(self.current_token, left)
+        self.next_token()
+        expression.index = self.parse_expression(Precedence.LOWEST)
+        if not self.expect_peek(TokenKind.RBRACKET):
+            return None
+        return expression
+
+    @Trace
+    def parse_hash_literal(self) -> ExpressionNode | None:
+        hash_literal = HashLiteralExpression(self.current_token)
+        while not self.peek_token_is(TokenKind.RBRACE):
+            self.next_token()
+            key = self.parse_expression(Precedence.LOWEST)
+            if not self.expect_peek(TokenKind.COLON):
+                return None
+            self.next_token()
+            value = self.parse_expression(Precedence.LOWEST)
+            hash_literal.keys.append(key)
+            hash_literal.values.append(value)
+            if not self.peek_token_is(TokenKind.RBRACE) and not self.expect_peek(
+                TokenKind.COMMA
+            ):
+                return None
+        if not self.expect_peek(TokenKind.RBRACE):
+            return None
+        return hash_literal
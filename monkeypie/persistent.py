@@ -0,0 +1,348 @@
+"""Persistent vector and hash map with structural sharing.
+
+Both structures are immutable: every update returns a new version that shares
+all but O(log32 n) of its nodes with the version it was made from, so building
+a collection one element at a time costs O(n log32 n) rather than the O(n²) of
+copying a flat list on every step.
+
+PersistentVector is a bit-partitioned trie of 32-way nodes, with the last,
+possibly partial, leaf kept aside as a tail so that appends only touch the
+trie once every 32 elements. HashTrie is a hash array mapped trie: each node
+holds a 32-bit bitmap of the 5-bit hash chunks present below it and a packed
+tuple of entries, each either a key-value pair, a child node or, for keys
+whose 32-bit hashes are equal, a collision bucket.
+"""
+
+from typing import Any, Generic, Hashable, Iterable, Iterator, TypeVar
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Nodes of the vector trie: an inner node holds up to 32 child nodes and a
+# leaf up to 32 elements. Nodes are tuples, copied along the path on update.
+_Node = tuple
+
+
+class PersistentVector(Generic[T]):
+    __slots__ = ("_count", "_shift", "_root", "_tail")
+
+    def __init__(
+        self,
+        count: int = 0,
+        shift: int = BITS,
+        root: _Node = (),
+        tail: tuple = (),
+    ):
+        self._count = count
+        self._shift = shift
+        self._root = root
+        self._tail = tail
+
+    @classmethod
+    def from_iterable(cls, items: Iterable[T]) -> "PersistentVector[T]":
+        """Build a vector bottom-up, without intermediate versions."""
+        elements = list(items)
+        count = len(elements)
+        tail_offset = ((count - 1) >> BITS) << BITS if count else 0
+        nodes: list[tuple] = [
+            tuple(elements[i : i + WIDTH]) for i in range(0, tail_offset, WIDTH)
+        ]
+        shift = BITS
+        while len(nodes) > WIDTH:
+            nodes = [tuple(nodes[i : i + WIDTH]) for i in range(0, len(nodes), WIDTH)]
+            shift += BITS
+        return cls(count, shift, tuple(nodes), tuple(elements[tail_offset:]))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _tail_offset(self) -> int:
+        return self._count - len(self._tail)
+
+    def _leaf(self, index: int) -> tuple:
+        if index >= self._tail_offset():
+            return self._tail
+        node = self._root
+        for level in range(self._shift, 0, -BITS):
+            node = node[(index >> level) & MASK]
+        return node
+
+    def __getitem__(self, index: int) -> T:
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._leaf(index)[index & MASK]
+
+    def __iter__(self) -> Iterator[T]:
+        return self.iterate()
+
+    def iterate(self, start: int = 0) -> Iterator[T]:
+        """Iterate over the elements from index start on."""
+        if start >= self._count:
+            return
+        yield from self._leaf(start)[start & MASK :]
+        for leaf_start in range((start | MASK) + 1, self._count, WIDTH):
+            yield from self._leaf(leaf_start)
+
+    def __reduce__(self) -> tuple:
+        return (PersistentVector.from_iterable, (list(self),))
+
+    def append(self, value: T) -> "PersistentVector[T]":
+        count = self._count
+        if len(self._tail) < WIDTH:
+            return PersistentVector(
+                count + 1, self._shift, self._root, self._tail + (value,)
+            )
+        # The tail is full: move it into the trie and start a new one.
+        shift = self._shift
+        if (count >> BITS) > (1 << shift):
+            root: _Node = (self._root, _new_path(shift, self._tail))
+            shift += BITS
+        else:
+            root = self._push_tail(shift, self._root, self._tail)
+        return PersistentVector(count + 1, shift, root, (value,))
+
+    def _push_tail(self, level: int, parent: _Node, tail: tuple) -> _Node:
+        index = ((self._count - 1) >> level) & MASK
+        if level == BITS:
+            child: _Node = tail
+        elif index < len(parent):
+            child = self._push_tail(level - BITS, parent[index], tail)
+        else:
+            child = _new_path(level - BITS, tail)
+        return parent[:index] + (child,) + parent[index + 1 :]
+
+    def set(self, index: int, value: T) -> "PersistentVector[T]":
+        """Return a copy with the element at index replaced by value."""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        if index >= self._tail_offset():
+            position = index & MASK
+            tail = self._tail[:position] + (value,) + self._tail[position + 1 :]
+            return PersistentVector(self._count, self._shift, self._root, tail)
+        return PersistentVector(
+            self._count,
+            self._shift,
+            _assoc(self._shift, self._root, index, value),
+            self._tail,
+        )
+
+
+def _new_path(level: int, node: _Node) -> _Node:
+    while level > 0:
+        node = (node,)
+        level -= BITS
+    return node
+
+
+def _assoc(level: int, node: _Node, index: int, value: Any) -> _Node:
+    position = (index >> level) & MASK
+    child = value if level == 0 else _assoc(level - BITS, node[position], index, value)
+    return node[:position] + (child,) + node[position + 1 :]
+
+
+class _BitmapNode:
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap: int, entries: tuple):
+        self.bitmap = bitmap
+        self.entries = entries
+
+
+class _Collisions:
+    """Key-value pairs whose keys all have the same 32-bit hash."""
+
+    __slots__ = ("hash", "pairs")
+
+    def __init__(self, hash_: int, pairs: tuple[tuple[Any, Any], ...]):
+        self.hash = hash_
+        self.pairs = pairs
+
+
+_Entry = _BitmapNode | _Collisions | tuple
+_EMPTY = _BitmapNode(0, ())
+
+
+def _hash(key: Hashable) -> int:
+    return hash(key) & 0xFFFFFFFF
+
+
+def _bit(hash_: int, shift: int) -> int:
+    return 1 << ((hash_ >> shift) & MASK)
+
+
+def _pair_node(
+    shift: int, first: tuple, first_hash: int, second: tuple, second_hash: int
+) -> _Entry:
+    if first_hash == second_hash:
+        return _Collisions(first_hash, (first, second))
+    first_bit = _bit(first_hash, shift)
+    second_bit = _bit(second_hash, shift)
+    if first_bit == second_bit:
+        child = _pair_node(shift + BITS, first, first_hash, second, second_hash)
+        return _BitmapNode(first_bit, (child,))
+    entries = (first, second) if first_bit < second_bit else (second, first)
+    return _BitmapNode(first_bit | second_bit, entries)
+
+
+def _trie_get(entry: _Entry, shift: int, hash_: int, key: Any, default: Any) -> Any:
+    while True:
+        if isinstance(entry, _BitmapNode):
+            bit = _bit(hash_, shift)
+            if not entry.bitmap & bit:
+                return default
+            entry = entry.entries[(entry.bitmap & (bit - 1)).bit_count()]
+            shift += BITS
+        elif isinstance(entry, _Collisions):
+            for pair_key, value in entry.pairs:
+                if pair_key == key:
+                    return value
+            return default
+        else:
+            return entry[1] if entry[0] == key else default
+
+
+def _trie_set(
+    entry: _Entry, shift: int, hash_: int, key: Any, value: Any
+) -> tuple[_Entry, bool]:
+    """Return entry with key set to value and whether key was added."""
+    if isinstance(entry, _BitmapNode):
+        bit = _bit(hash_, shift)
+        index = (entry.bitmap & (bit - 1)).bit_count()
+        entries = entry.entries
+        if not entry.bitmap & bit:
+            return _BitmapNode(
+                entry.bitmap | bit, entries[:index] + ((key, value),) + entries[index:]
+            ), True
+        child, added = _trie_set(entries[index], shift + BITS, hash_, key, value)
+        if child is entries[index]:
+            return entry, False
+        return _BitmapNode(
+            entry.bitmap, entries[:index] + (child,) + entries[index + 1 :]
+        ), added
+    if isinstance(entry, _Collisions):
+        if hash_ != entry.hash:
+            # Nest the bucket one level down, where the two hashes may differ.
+            nested = _BitmapNode(_bit(entry.hash, shift), (entry,))
+            return _trie_set(nested, shift, hash_, key, value)
+        for i, (pair_key, pair_value) in enumerate(entry.pairs):
+            if pair_key == key:
+                if pair_value is value:
+                    return entry, False
+                pairs = entry.pairs[:i] + ((key, value),) + entry.pairs[i + 1 :]
+                return _Collisions(hash_, pairs), False
+        return _Collisions(hash_, entry.pairs + ((key, value),)), True
+    if entry[0] == key:
+        return (entry if entry[1] is value else (key, value)), False
+    node = _pair_node(shift, entry, _hash(entry[0]), (key, value), hash_)
+    return node, True
+
+
+def _trie_delete(entry: _Entry, shift: int, hash_: int, key: Any) -> _Entry | None:
+    """Return entry without key, None if nothing is left of it."""
+    if isinstance(entry, _BitmapNode):
+        bit = _bit(hash_, shift)
+        if not entry.bitmap & bit:
+            return entry
+        index = (entry.bitmap & (bit - 1)).bit_count()
+        child = _trie_delete(entry.entries[index], shift + BITS, hash_, key)
+        if child is entry.entries[index]:
+            return entry
+        if child is None:
+            if entry.bitmap == bit:
+                return None
+            entries = entry.entries[:index] + entry.entries[index + 1 :]
+            node = _BitmapNode(entry.bitmap ^ bit, entries)
+        else:
+            entries = entry.entries[:index] + (child,) + entry.entries[index + 1 :]
+            node = _BitmapNode(entry.bitmap, entries)
+        # A node left with a single pair is replaced by the pair itself, which
+        # keeps the trie as shallow as if the key had never been added.
+        if len(node.entries) == 1 and isinstance(node.entries[0], tuple):
+            return node.entries[0]
+        return node
+    if isinstance(entry, _Collisions):
+        pairs = tuple(pair for pair in entry.pairs if pair[0] != key)
+        if len(pairs) == len(entry.pairs):
+            return entry
+        return pairs[0] if len(pairs) == 1 else _Collisions(entry.hash, pairs)
+    return None if entry[0] == key else entry
+
+
+def _trie_items(entry: _Entry) -> Iterator[tuple[Any, Any]]:
+    if isinstance(entry, _BitmapNode):
+        for child in entry.entries:
+            yield from _trie_items(child)
+    elif isinstance(entry, _Collisions):
+        yield from entry.pairs
+    else:
+        yield entry
+
+
+class HashTrie(Generic[K, V]):
+    """Persistent map; iteration follows the hashes of the keys."""
+
+    __slots__ = ("_root", "_count")
+
+    def __init__(self, root: _BitmapNode = _EMPTY, count: int = 0):
+        self._root = root
+        self._count = count
+
+    @classmethod
+    def from_items(cls, items: Iterable[tuple[K, V]]) -> "HashTrie[K, V]":
+        trie: HashTrie[K, V] = cls()
+        for key, value in items:
+            trie = trie.set(key, value)
+        return trie
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: K) -> bool:
+        missing = object()
+        return _trie_get(self._root, 0, _hash(key), key, missing) is not missing
+
+    def __iter__(self) -> Iterator[K]:
+        for key, _ in _trie_items(self._root):
+            yield key
+
+    def __reduce__(self) -> tuple:
+        # Rebuilt from its items, since hashes differ between processes.
+        return (HashTrie.from_items, (list(self.items()),))
+
+    def get(self, key: K, default: Any = None) -> Any:
+        return _trie_get(self._root, 0, _hash(key), key, default)
+
+    def items(self) -> Iterator[tuple[K, V]]:
+        return _trie_items(self._root)
+
+    def values(self) -> Iterator[V]:
+        for _, value in _trie_items(self._root):
+            yield value
+
+    def set(self, key: K, value: V) -> "HashTrie[K, V]":
+        """Return a copy with key mapped to value."""
+        root, added = _trie_set(self._root, 0, _hash(key), key, value)
+        if root is self._root:
+            return self
+        assert isinstance(root, _BitmapNode)
+        return HashTrie(root, self._count + added)
+
+    def delete(self, key: K) -> "HashTrie[K, V]":
+        """Return a copy without key, or this map if key is not in it."""
+        root = _trie_delete(self._root, 0, _hash(key), key)
+        if root is self._root:
+            return self
+        # The root stays a bitmap node, even when a single pair or bucket is
+        # all that is left of it.
+        if root is None:
+            root = _EMPTY
+        elif isinstance(root, _Collisions):
+            root = _BitmapNode(_bit(root.hash, 0), (root,))
+        elif not isinstance(root, _BitmapNode):
+            root = _BitmapNode(_bit(_hash(root[0]), 0), (root,))
+        return HashTrie(root, self._count - 1)
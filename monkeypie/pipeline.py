@@ -0,0 +1,111 @@
+import queue
+import threading
+from typing import Callable, Generator, Iterator
+
+from monkeypie.ast import ExpressionStatement, StatementNode
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.object import NULL, Error, Object, ReturnValue
+from monkeypie.parser import Parser
+
+ParsedStatement = tuple[StatementNode | None, list[str]]
+ResultFn = Callable[[Object], None]
+
+
+class PipelineResult:
+    def __init__(self, value: Object, errors: list[str]):
+        self.value = value
+        self.errors = errors
+
+
+def _threaded(
+    statements: Iterator[ParsedStatement], queue_size: int
+) -> Generator[ParsedStatement, None, None]:
+    # The producer only ever blocks on a full queue, so polling the stop event
+    # between put attempts is enough to let it exit when the consumer stops
+    # early. Exceptions raised while parsing are re-raised in the consumer.
+    buffer: queue.Queue = queue.Queue(queue_size)
+    stop = threading.Event()
+    done = object()
+
+    def put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        try:
+            for item in statements:
+                if not put(item):
+                    return
+                del item
+        except BaseException as exc:
+            put(exc)
+        else:
+            put(done)
+
+    producer = threading.Thread(target=produce, name="monkeypie-parser", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+            del item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def run_pipelined(
+    source: str,
+    env: Environment | None = None,
+    on_result: ResultFn | None = None,
+    threaded: bool = False,
+    queue_size: int = 64,
+    evaluator: Evaluator | None = None,
+) -> PipelineResult:
+    """Evaluate source one top-level statement at a time as it is parsed.
+
+    Each statement is evaluated as soon as the parser yields it and is dropped
+    right after, so only the trees still reachable from the environment (e.g.
+    function bodies) are kept alive. on_result is called with the value of
+    every top-level expression statement. Execution stops at the first parse
+    error, at an error object or at a top-level return; unlike parse-then-run,
+    statements before a parse error have already been executed by then.
+
+    With threaded=True, lexing and parsing run on a background thread that
+    feeds a queue holding at most queue_size parsed statements. evaluator
+    defaults to a plain Evaluator; pass a LimitedEvaluator to run untrusted
+    source under execution limits.
+    """
+    env = Environment() if env is None else env
+    evaluator = Evaluator() if evaluator is None else evaluator
+    statements = Parser(Lexer(source)).iter_statements()
+    if threaded:
+        statements = _threaded(statements, queue_size)
+
+    result: Object = NULL
+    try:
+        for statement, errors in statements:
+            if errors:
+                return PipelineResult(NULL, errors)
+            result = evaluator.evaluate(statement, env)
+            if isinstance(result, ReturnValue):
+                return PipelineResult(result.value, [])
+            if isinstance(result, Error):
+                return PipelineResult(result, [])
+            if on_result is not None and isinstance(statement, ExpressionStatement):
+                on_result(result)
+            del statement
+    finally:
+        statements.close()
+    return PipelineResult(result, [])
@@ -0,0 +1,114 @@
+"""The prelude: helpers written in Monkey and bound before a REPL session starts.
+
+prelude.monkey is evaluated once, at build time, and the names it binds are
+pickled into prelude.snapshot next to it; ``python -m monkeypie.prelude``
+writes the snapshot and monkey.spec runs it before bundling. load() then
+costs one read and unpickling instead of lexing, parsing and evaluating the
+source on every start.
+
+The snapshot records the modification time and size of the source it was
+built from. It is passed over in favour of the source when the source is
+present and differs, when it was written in another format or cannot be
+unpickled, and when MONKEYPIE_PRELUDE_SNAPSHOT_DISABLED is set. The frozen
+executable bundles the snapshot alone.
+"""
+
+import argparse
+import os
+import pickle
+import struct
+from typing import Final
+
+from monkeypie.environment import Environment
+from monkeypie.object import Object
+
+SOURCE: Final = os.path.join(os.path.dirname(__file__), "prelude.monkey")
+SNAPSHOT: Final = os.path.join(os.path.dirname(__file__), "prelude.snapshot")
+
+# Changed whenever what is pickled changes shape.
+_MAGIC: Final = b"monkeypie prelude 1\n"
+# Modification time in nanoseconds and size of the source.
+_SOURCE_STAT: Final = struct.Struct("<qq")
+
+
+def evaluate(source: str = SOURCE) -> dict[str, Object]:
+    """Evaluate the prelude at source and return the names it binds.
+
+    Raises ModuleError if the source cannot be read or parsed or fails to
+    evaluate.
+    """
+    # Only needed without a usable snapshot.
+    from monkeypie.evaluator import Evaluator
+    from monkeypie.modules import ModuleError, ModuleLoader
+
+    exports = ModuleLoader().load(source).exports(Evaluator())
+    if not isinstance(exports, dict):
+        raise ModuleError(exports.message)
+    return exports
+
+
+def build(source: str = SOURCE, snapshot: str = SNAPSHOT) -> None:
+    """Evaluate the prelude at source and write its snapshot."""
+    stat = os.stat(source)
+    bindings = evaluate(source)
+    data = (
+        _MAGIC
+        + _SOURCE_STAT.pack(stat.st_mtime_ns, stat.st_size)
+        + pickle.dumps(bindings, pickle.HIGHEST_PROTOCOL)
+    )
+    temporary = f"{snapshot}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(data)
+    os.replace(temporary, snapshot)
+
+
+def read_snapshot(
+    snapshot: str = SNAPSHOT, source: str = SOURCE
+) -> dict[str, Object] | None:
+    """The bindings in snapshot, or None if it is missing, stale or unreadable."""
+    try:
+        with open(snapshot, "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+    if not data.startswith(_MAGIC) or len(data) < len(_MAGIC) + _SOURCE_STAT.size:
+        return None
+    try:
+        stat = os.stat(source)
+    except OSError:
+        pass
+    else:
+        built_from = _SOURCE_STAT.unpack_from(data, len(_MAGIC))
+        if built_from != (stat.st_mtime_ns, stat.st_size):
+            return None
+    try:
+        bindings = pickle.loads(memoryview(data)[len(_MAGIC) + _SOURCE_STAT.size :])
+    except Exception:
+        # A corrupted pickle can fail in many ways besides UnpicklingError.
+        return None
+    return bindings if isinstance(bindings, dict) else None
+
+
+def load(snapshot: str = SNAPSHOT, source: str = SOURCE) -> Environment:
+    """Return an environment binding the prelude, from its snapshot if usable."""
+    bindings = None
+    if not os.environ.get("MONKEYPIE_PRELUDE_SNAPSHOT_DISABLED"):
+        bindings = read_snapshot(snapshot, source)
+    if bindings is None:
+        bindings = evaluate(source)
+    return Environment(store=bindings)
+
+
+def main(argv: list[str] | None = None) -> None:
+    argparser = argparse.ArgumentParser(
+        description="Write the snapshot of the prelude loaded by the REPL."
+    )
+    argparser.add_argument("--source", default=SOURCE)
+    argparser.add_argument("--output", default=SNAPSHOT)
+    args = argparser.parse_args(argv)
+    build(args.source, args.output)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
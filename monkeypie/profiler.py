@@ -0,0 +1,246 @@
+"""Sampling profiler attributing time to Monkey functions and call sites.
+
+Run with ``python -m monkeypie.profiler FILE``. While the program runs, a
+background thread samples the evaluating thread's Python stack and maps the
+evaluator's frames back to the Monkey functions and call expressions being
+evaluated, so the report is in terms of the Monkey program rather than of the
+interpreter. Calls are counted exactly. The sampler needs the GIL to take a
+sample, so the effective interval is at least sys.getswitchinterval().
+--collapsed writes the samples in the collapsed stack format read by
+flamegraph.pl and speedscope.
+"""
+
+import argparse
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType, FrameType
+
+from monkeypie.ast import (
+    CallExpression,
+    FunctionLiteralExpression,
+    LetStatement,
+    Node,
+    ProgramNode,
+)
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.object import Object
+from monkeypie.parser import Parser
+
+APPLY_FUNCTION_CODE: CodeType = Evaluator.apply_function.__code__
+EVALUATE_CALL_CODE: CodeType = Evaluator.evaluate_call.__code__
+TOP_LEVEL = "<program>"
+
+
+class CountingEvaluator(Evaluator):
+    """Evaluator that counts calls per function body and per call site.
+
+    Counting is the only per-call work the profiler adds; times come from
+    sampling.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.function_calls: Counter[int] = Counter()
+        self.call_site_calls: Counter[int] = Counter()
+
+    def evaluate_call(self, expression: CallExpression, env: Environment) -> Object:
+        self.call_site_calls[id(expression)] += 1
+        return super().evaluate_call(expression, env)
+
+    def worker_factory(self) -> None:
+        # Calls made in other processes would be missing from the profile.
+        return None
+
+    def apply_function(
+        self,
+        function: Object,
+        arguments: list[Object],
+        call: CallExpression | None = None,
+    ) -> Object:
+        body = getattr(function, "body", None)
+        if body is not None:
+            self.function_calls[id(body)] += 1
+        return super().apply_function(function, arguments, call)
+
+
+class Profiler:
+    def __init__(self, source: str, interval: float = 0.001):
+        self.interval = interval
+        self._lexer = Lexer(source)
+        parser = Parser(self._lexer)
+        self.program = parser.parse_program()
+        self.errors = parser.errors()
+        self._evaluator = CountingEvaluator()
+
+        # Functions are identified by the id of their body, which outlives
+        # every Function object created from the literal.
+        self._function_labels: dict[int, str] = {}
+        self._call_site_labels: dict[int, str] = {}
+        if self.program is not None:
+            self._label(self.program)
+
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self.call_site_samples: Counter[str] = Counter()
+        self.samples = 0
+        self.elapsed = 0.0
+
+    def _position(self, node: Node) -> str:
+        line, column = self._lexer.line_column(node.start)
+        return f"{line}:{column}"
+
+    def _label(self, program: ProgramNode) -> None:
+        names: dict[int, str] = {}
+        stack: list[object] = [program]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list):
+                stack.extend(item)
+            elif isinstance(item, Node):
+                if isinstance(item, LetStatement) and isinstance(
+                    item.value, FunctionLiteralExpression
+                ):
+                    names[id(item.value)] = item.name.value
+                elif isinstance(item, FunctionLiteralExpression):
+                    name = names.get(id(item), "<fn>")
+                    self._function_labels[id(item.body)] = (
+                        f"{name}@{self._position(item)}"
+                    )
+                elif isinstance(item, CallExpression):
+                    self._call_site_labels[id(item)] = (
+                        f"{item.function}@{self._position(item)}"
+                    )
+                stack.extend(vars(item).values())
+
+    def _sample(self, frame: FrameType | None) -> None:
+        functions: list[str] = []
+        call_sites: set[str] = set()
+        while frame is not None:
+            code = frame.f_code
+            if code is APPLY_FUNCTION_CODE:
+                body = getattr(frame.f_locals.get("function"), "body", None)
+                functions.append(self._function_labels.get(id(body), "<fn>"))
+            elif code is EVALUATE_CALL_CODE:
+                expression = frame.f_locals.get("expression")
+                call_sites.add(self._call_site_labels.get(id(expression), "<call>"))
+            frame = frame.f_back
+        functions.append(TOP_LEVEL)
+        self.stacks[tuple(reversed(functions))] += 1
+        self.call_site_samples.update(call_sites)
+        self.samples += 1
+
+    def _sampler(self, thread_id: int, done: threading.Event) -> None:
+        while not done.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                self._sample(frame)
+            del frame
+
+    def run(self, env: Environment | None = None) -> Object:
+        """Evaluate the program while sampling it."""
+        if self.errors:
+            raise ValueError("\n".join(self.errors))
+        done = threading.Event()
+        sampler = threading.Thread(
+            target=self._sampler,
+            args=(threading.get_ident(), done),
+            name="monkeypie-profiler",
+            daemon=True,
+        )
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            return self._evaluator.evaluate(
+                self.program, Environment() if env is None else env
+            )
+        finally:
+            done.set()
+            sampler.join()
+            self.elapsed += time.perf_counter() - started
+
+    def function_stats(self) -> dict[str, tuple[int, int, int]]:
+        """Calls, inclusive samples and self samples per function label."""
+        inclusive: Counter[str] = Counter()
+        exclusive: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            for label in set(stack):
+                inclusive[label] += count
+            exclusive[stack[-1]] += count
+        calls: Counter[str] = Counter()
+        for body, count in self._evaluator.function_calls.items():
+            calls[self._function_labels.get(body, "<fn>")] += count
+        return {
+            label: (calls[label], inclusive[label], exclusive[label])
+            for label in sorted(
+                inclusive.keys() | calls.keys(), key=lambda label: -inclusive[label]
+            )
+        }
+
+    def call_site_stats(self) -> dict[str, tuple[int, int]]:
+        """Calls and inclusive samples per call site label."""
+        calls: Counter[str] = Counter()
+        for site, count in self._evaluator.call_site_calls.items():
+            # Sites outside the program, such as in functions bound in the
+            # environment passed to run(), share one label.
+            calls[self._call_site_labels.get(site, "<call>")] += count
+        return {
+            label: (calls[label], self.call_site_samples[label])
+            for label in sorted(
+                calls.keys() | self.call_site_samples.keys(),
+                key=lambda label: -self.call_site_samples[label],
+            )
+        }
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.items()
+        )
+
+    def report(self) -> str:
+        per_sample = self.elapsed / self.samples if self.samples else 0.0
+        lines = [
+            f"{self.samples} samples in {self.elapsed:.3f} s",
+            f"{'function':32} {'calls':>10} {'total ms':>10} {'self ms':>10}",
+        ]
+        for label, (calls, inclusive, exclusive) in self.function_stats().items():
+            lines.append(
+                f"{label:32} {calls:10} {inclusive * per_sample * 1e3:10.1f}"
+                f" {exclusive * per_sample * 1e3:10.1f}"
+            )
+        lines.append(f"\n{'call site':32} {'calls':>10} {'total ms':>10}")
+        for label, (calls, inclusive) in self.call_site_stats().items():
+            lines.append(f"{label:32} {calls:10} {inclusive * per_sample * 1e3:10.1f}")
+        return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    argparser = argparse.ArgumentParser(
+        prog="python -m monkeypie.profiler", description=__doc__
+    )
+    argparser.add_argument("file")
+    argparser.add_argument(
+        "--interval", type=float, default=0.001, help="seconds between samples"
+    )
+    argparser.add_argument(
+        "--collapsed", metavar="PATH", help="write collapsed stacks for flamegraphs"
+    )
+    args = argparser.parse_args(argv)
+
+    with open(args.file, encoding="utf-8") as file:
+        profiler = Profiler(file.read(), args.interval)
+    if profiler.errors:
+        for error in profiler.errors:
+            print(error, file=sys.stderr)
+        sys.exit(1)
+    print(profiler.run().inspect())
+    print(profiler.report())
+    if args.collapsed:
+        with open(args.collapsed, "w") as file:
+            file.write(profiler.collapsed())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Line-delimited JSON evaluation server.
+
+Each request is a JSON object on its own line, ``{"id": ..., "source": "..."}``,
+and is answered by a single line carrying the same id and either
+``"result"``/``"type"`` with the inspected value, ``"errors"`` with the parser
+errors, or ``"error"`` and the partial call ``"stack"`` when a request exceeds
+the execution limits given by --fuel, --max-depth and --timeout. Run with ``python -m monkeypie.server``.
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from monkeypie.ast import ProgramNode
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.limits import LimitedEvaluator, LimitExceeded, Limits
+from monkeypie.parser import Parser
+
+MAX_LINE_LENGTH = 2**20
+
+
+class ProgramCache:
+    """LRU cache of parsed programs keyed by their source.
+
+    Evaluation only changes a program's call site inline caches, which are
+    safe to update from several threads, so a cached program can be evaluated
+    by any number of connections at once, each in its own environment. Every
+    program interns its identifiers in a SymbolTable of its own, so the
+    names of an evicted program are freed along with it.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self._max_size = max_size
+        self._programs: OrderedDict[str, tuple[ProgramNode | None, list[str]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._programs)
+
+    def get(self, source: str) -> tuple[ProgramNode | None, list[str]]:
+        with self._lock:
+            entry = self._programs.get(source)
+            if entry is not None:
+                self._programs.move_to_end(source)
+                self.hits += 1
+                return entry
+        # Parse outside the lock; two connections preparing the same source at
+        # once both parse it and the second result simply replaces the first.
+        parser = Parser(Lexer(source))
+        program = parser.parse_program()
+        entry = (program, parser.errors())
+        with self._lock:
+            self._programs[source] = entry
+            if len(self._programs) > self._max_size:
+                self._programs.popitem(last=False)
+        return entry
+
+
+class EvaluationServer:
+    """Serves evaluation requests, one environment per connection.
+
+    Parsing and evaluation run on a pool of worker threads so that the event
+    loop keeps accepting connections and reading requests while long
+    evaluations are in progress. Requests of a single connection are answered
+    in order. Given limits, every request is evaluated under its own fresh
+    budget and a request exceeding it is answered with an error.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        cache: ProgramCache | None = None,
+        limits: Limits | None = None,
+    ):
+        self.cache = ProgramCache() if cache is None else cache
+        self.limits = limits
+        self._executor = ThreadPoolExecutor(workers, "monkeypie-eval")
+        self._evaluator = Evaluator()
+
+    def close(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+
+    def evaluate(self, source: str, env: Environment) -> dict[str, Any]:
+        try:
+            program, errors = self.cache.get(source)
+            if errors:
+                return {"errors": errors}
+            if self.limits is None:
+                result = self._evaluator.evaluate(program, env)
+            else:
+                result = LimitedEvaluator(self.limits).evaluate(program, env)
+        except LimitExceeded as exc:
+            return {"error": str(exc), "stack": exc.format_stack()}
+        except RecursionError:
+            # Source nested too deeply to parse, or unbounded recursion when
+            # there is no depth limit.
+            return {"error": "maximum recursion depth exceeded"}
+        return {"result": result.inspect(), "type": result.type().value}
+
+    def handle_request(self, line: bytes, env: Environment) -> dict[str, Any] | str:
+        try:
+            request = json.loads(line)
+            source = request["source"]
+            if not isinstance(source, str):
+                raise TypeError("source must be a string")
+        except (ValueError, KeyError, TypeError) as exc:
+            return f"invalid request: {exc}"
+        return {"id": request.get("id"), **self.evaluate(source, env)}
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        env = Environment()
+        loop = asyncio.get_running_loop()
+        try:
+            while line := await reader.readline():
+                response = await loop.run_in_executor(
+                    self._executor, self.handle_request, line, env
+                )
+                if isinstance(response, str):
+                    response = {"id": None, "error": response}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # ValueError is raised by readline() for lines over the limit.
+            pass
+        finally:
+            writer.close()
+
+    async def start(
+        self, host: str | None = None, port: int = 0, path: str | None = None
+    ) -> asyncio.Server:
+        if path is not None:
+            return await asyncio.start_unix_server(
+                self.handle_connection, path, limit=MAX_LINE_LENGTH
+            )
+        return await asyncio.start_server(
+            self.handle_connection, host, port, limit=MAX_LINE_LENGTH
+        )
+
+
+async def serve(
+    host: str, port: int, path: str | None, workers: int, limits: Limits
+) -> None:
+    server = EvaluationServer(workers, limits=limits)
+    try:
+        listener = await server.start(host, port, path)
+        for socket in listener.sockets:
+            print(f"listening on {socket.getsockname()}")
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--host", default="127.0.0.1")
+    argparser.add_argument("--port", type=int, default=7878)
+    argparser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket")
+    argparser.add_argument("--workers", type=int, default=4)
+    argparser.add_argument("--fuel", type=int, help="maximum calls per request")
+    argparser.add_argument("--max-depth", type=int, help="maximum call depth")
+    argparser.add_argument("--timeout", type=float, help="seconds per request")
+    args = argparser.parse_args()
+    limits = Limits(args.fuel, args.max_depth, args.timeout)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers, limits))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
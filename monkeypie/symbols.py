@@ -0,0 +1,37 @@
+import threading
+
+
+class SymbolTable:
+    """Interns identifier names for one compilation.
+
+    Every distinct name is stored once and given a dense integer id, so later
+    passes can key environments by int and the parsed program keeps a single
+    string per name instead of one per occurrence.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._symbols: dict[str, tuple[str, int]] = {}
+        self._names: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def intern(self, name: str) -> tuple[str, int]:
+        """Return the shared copy of name and its symbol id.
+
+        Lookups of known names take no lock; a new name is added under the
+        lock so that lexers sharing the table never give it two ids.
+        """
+        symbol = self._symbols.get(name)
+        if symbol is None:
+            with self._lock:
+                symbol = self._symbols.get(name)
+                if symbol is None:
+                    symbol = (name, len(self._names))
+                    self._names.append(name)
+                    self._symbols[name] = symbol
+        return symbol
+
+    def name(self, symbol: int) -> str:
+        return self._names[symbol]
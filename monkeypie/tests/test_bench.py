@@ -0,0 +1,34 @@
+import contextlib
+import io
+import unittest
+
+from parameterized import parameterized
+
+from monkeypie.bench import BACKENDS, WORKLOADS, main
+
+EXPECTED = {
+    "fib": "2584",
+    "closures": str(sum(2 * n + 3 for n in range(1, 3001))),
+    "map_reduce": str(sum(x * x for x in range(1, 3001))),
+    "helpers": str(sum(n * n + max(n, 3) + 1 for n in range(1, 3001))),
+}
+
+
+class TestBench(unittest.TestCase):
+    @parameterized.expand(
+        [(workload, engine) for workload in WORKLOADS for engine in BACKENDS]
+    )
+    def test_workload(self, workload: str, engine: str):
+        result = BACKENDS[engine](WORKLOADS[workload])().inspect()
+        self.assertNotIn("ERROR", result)
+        if workload in EXPECTED:
+            self.assertEqual(EXPECTED[workload], result)
+
+    def test_main(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main(["--engine", "evaluator", "--workload", "fib", "--repeat", "1"])
+        lines = output.getvalue().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertTrue(lines[1].startswith("fib          evaluator"))
+        self.assertTrue(lines[2].endswith("us per call"))
@@ -0,0 +1,110 @@
+import unittest
+
+from parameterized import parameterized
+
+from monkeypie.builtins import BUILTINS
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.object import Array, Error, Integer, Object
+from monkeypie.parser import Parser
+from monkeypie.persistent import PersistentVector
+from monkeypie.tiered import TieredEvaluator
+
+SUM = """
+let sum = fn(a) { if (len(a) == 0) { 0 } else { first(a) + sum(rest(a)) } };
+"""
+
+MAP = """
+let map = fn(a, f, out) {
+    if (len(a) == 0) { out } else { map(rest(a), f, push(out, f(first(a)))) }
+};
+"""
+
+
+def evaluate(input: str, evaluator: Evaluator | None = None) -> Object:
+    parser = Parser(Lexer(input))
+    program = parser.parse_program()
+    assert not parser.errors(), parser.errors()
+    return (evaluator or Evaluator()).evaluate(program, Environment())
+
+
+def array(*values: int) -> Array:
+    return Array(PersistentVector.from_iterable(Integer(value) for value in values))
+
+
+class TestBuiltins(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("len([])", "0"),
+            ("len([1, 2, 3])", "3"),
+            ("len({1: 2, true: 3})", "2"),
+            ("len(rest([1, 2, 3]))", "2"),
+            ("first([1, 2, 3])", "1"),
+            ("first([])", "null"),
+            ("first(rest([1, 2, 3]))", "2"),
+            ("last([1, 2, 3])", "3"),
+            ("last([])", "null"),
+            ("last(rest([1]))", "null"),
+            ("rest([1, 2, 3])", "[2, 3]"),
+            ("rest(rest(rest([1, 2, 3])))", "[]"),
+            ("rest([])", "null"),
+            ("push([], 1)", "[1]"),
+            ("push(rest([1, 2]), 3)", "[2, 3]"),
+            ("let a = [1]; let b = push(a, 2); a", "[1]"),
+            ("rest([1, 2, 3])[0]", "2"),
+            ("rest([1, 2, 3])[2]", "null"),
+            ("let f = first; f([4])", "4"),
+            ("len", "builtin function len"),
+            ("let len = fn(a) { 42 }; len([])", "42"),
+            (SUM + "sum([1, 2, 3, 4])", "10"),
+            (MAP + "map([1, 2, 3], fn(x) { x * 2 }, [])", "[2, 4, 6]"),
+        ]
+    )
+    def test_builtins(self, input: str, expected: str):
+        self.assertEqual(expected, evaluate(input).inspect())
+
+    @parameterized.expand(
+        [
+            ("len(1)", "argument to `len` not supported, got INTEGER"),
+            ("first(true)", "argument to `first` must be ARRAY, got BOOLEAN"),
+            ("last(1)", "argument to `last` must be ARRAY, got INTEGER"),
+            ("rest({})", "argument to `rest` must be ARRAY, got HASH"),
+            ("push(1, 1)", "argument to `push` must be ARRAY, got INTEGER"),
+            ("len([1], [2])", "wrong number of arguments: want=1, got=2"),
+            ("push([1])", "wrong number of arguments: want=2, got=1"),
+            ("len(foo)", "identifier not found: foo"),
+        ]
+    )
+    def test_errors(self, input: str, expected: str):
+        evaluated = evaluate(input)
+        self.assertIsInstance(evaluated, Error)
+        assert isinstance(evaluated, Error)
+        self.assertEqual(expected, evaluated.message)
+
+    def test_rest_shares_elements(self):
+        original = array(1, 2, 3)
+        view = BUILTINS["rest"].function(original)
+        self.assertIsInstance(view, Array)
+        assert isinstance(view, Array)
+        self.assertIs(original.elements, view.elements)
+        self.assertEqual(1, view.offset)
+
+    def test_push_materializes_mostly_dropped_views(self):
+        view = array(*range(10))
+        for _ in range(5):
+            view = view.rest()
+        pushed = view.push(Integer(10))
+        self.assertEqual(5, pushed.offset)
+
+        view = view.rest()
+        pushed = view.push(Integer(10))
+        self.assertEqual(0, pushed.offset)
+        self.assertEqual("[6, 7, 8, 9, 10]", pushed.inspect())
+
+    def test_tiered_agrees(self):
+        source = SUM + MAP + "sum(map([1, 2, 3, 4, 5, 6, 7, 8], fn(x) { x * x }, []))"
+        self.assertEqual("204", evaluate(source).inspect())
+        self.assertEqual(
+            "204", evaluate(source, TieredEvaluator(threshold=2)).inspect()
+        )
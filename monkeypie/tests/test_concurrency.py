@@ -0,0 +1,73 @@
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+from monkeypie.symbols import SymbolTable
+
+STATEMENTS = r"""let five = 5;
+let add = fn(x, y) { x + y; };
+let result = add(five, 10);
+if (5 < 10) { return !-result; } else { return false; }
+let = 1;
+"""
+SOURCE = STATEMENTS * 20
+
+THREADS = 8
+
+
+def parse(source: str, symbols: SymbolTable | None = None) -> tuple[str, list[str]]:
+    parser = Parser(Lexer(source, symbols=symbols))
+    program = parser.parse_program()
+    return str(program), parser.errors()
+
+
+def free_threaded() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+class TestConcurrentParsing(unittest.TestCase):
+    def test_parsers_in_threads_match_sequential(self):
+        expected = parse(SOURCE)
+        barrier = threading.Barrier(THREADS)
+
+        def worker(_: int) -> list[tuple[str, list[str]]]:
+            barrier.wait()
+            return [parse(SOURCE) for _ in range(10)]
+
+        with ThreadPoolExecutor(THREADS) as executor:
+            for results in executor.map(worker, range(THREADS)):
+                self.assertEqual([expected] * 10, results)
+
+    def test_shared_symbol_table(self):
+        symbols = SymbolTable()
+        names = [f"name{'x' * i}" for i in range(200)]
+        source = " ".join(names)
+        barrier = threading.Barrier(THREADS)
+
+        def worker(_: int) -> list[int]:
+            barrier.wait()
+            lexer = Lexer(source, symbols=symbols)
+            return [lexer.next_token().symbol for _ in names]
+
+        with ThreadPoolExecutor(THREADS) as executor:
+            results = list(executor.map(worker, range(THREADS)))
+        self.assertEqual(len(names), len(symbols))
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(names, [symbols.name(symbol) for symbol in results[0]])
+
+    @unittest.skipUnless(free_threaded(), "throughput only scales without the GIL")
+    def test_throughput_scales(self):
+        def run(threads: int) -> float:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(threads) as executor:
+                list(executor.map(parse, [SOURCE] * 64))
+            return time.perf_counter() - started
+
+        run(THREADS)
+        sequential, threaded = run(1), run(THREADS)
+        self.assertLess(threaded, sequential / 2)
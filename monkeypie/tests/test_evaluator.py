@@ -0,0 +1,213 @@
+import unittest
+
+from parameterized import parameterized
+
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.object import (
+    NULL,
+    Array,
+    Boolean,
+    Error,
+    Function,
+    Hash,
+    Integer,
+    Object,
+)
+from monkeypie.parser import Parser
+
+
+class TestEvaluator(unittest.TestCase):
+    def _test_eval(self, input: str) -> Object:
+        parser = Parser(Lexer(input))
+        program = parser.parse_program()
+        self.assertEqual([], parser.errors())
+        return Evaluator().evaluate(program, Environment())
+
+    def _test_integer_object(self, obj: Object, expected: int) -> None:
+        self.assertIsInstance(obj, Integer)
+        assert isinstance(obj, Integer)
+        self.assertEqual(expected, obj.value)
+
+    def _test_boolean_object(self, obj: Object, expected: bool) -> None:
+        self.assertIsInstance(obj, Boolean)
+        assert isinstance(obj, Boolean)
+        self.assertEqual(expected, obj.value)
+
+    @parameterized.expand(
+        [
+            ("5", 5),
+            ("10", 10),
+            ("-5", -5),
+            ("-10", -10),
+            ("5 + 5 + 5 + 5 - 10", 10),
+            ("2 * 2 * 2 * 2 * 2", 32),
+            ("-50 + 100 + -50", 0),
+            ("5 * 2 + 10", 20),
+            ("5 + 2 * 10", 25),
+            ("20 + 2 * -10", 0),
+            ("50 / 2 * 2 + 10", 60),
+            ("2 * (5 + 10)", 30),
+            ("3 * 3 * 3 + 10", 37),
+            ("3 * (3 * 3) + 10", 37),
+            ("(5 + 10 * 2 + 15 / 3) * 2 + -10", 50),
+            ("-7 / 2", -3),
+        ]
+    )
+    def test_eval_integer_expression(self, input: str, expected: int):
+        self._test_integer_object(self._test_eval(input), expected)
+
+    @parameterized.expand(
+        [
+            ("true", True),
+            ("false", False),
+            ("1 < 2", True),
+            ("1 > 2", False),
+            ("1 == 1", True),
+            ("1 != 1", False),
+            ("true == true", True),
+            ("true != false", True),
+            ("(1 < 2) == true", True),
+            ("(1 > 2) == true", False),
+            ("!true", False),
+            ("!5", False),
+            ("!!true", True),
+            ("!!5", True),
+        ]
+    )
+    def test_eval_boolean_expression(self, input: str, expected: bool):
+        self._test_boolean_object(self._test_eval(input), expected)
+
+    @parameterized.expand(
+        [
+            ("if (true) { 10 }", 10),
+            ("if (false) { 10 }", None),
+            ("if (1) { 10 }", 10),
+            ("if (1 > 2) { 10 }", None),
+            ("if (1 > 2) { 10 } else { 20 }", 20),
+            ("if (1 < 2) { 10 } else { 20 }", 10),
+        ]
+    )
+    def test_if_else_expressions(self, input: str, expected: int | None):
+        evaluated = self._test_eval(input)
+        if expected is None:
+            self.assertIs(NULL, evaluated)
+        else:
+            self._test_integer_object(evaluated, expected)
+
+    @parameterized.expand(
+        [
+            ("return 10;", 10),
+            ("return 10; 9;", 10),
+            ("return 2 * 5; 9;", 10),
+            ("9; return 2 * 5; 9;", 10),
+            ("if (10 > 1) { if (10 > 1) { return 10; } return 1; }", 10),
+        ]
+    )
+    def test_return_statements(self, input: str, expected: int):
+        self._test_integer_object(self._test_eval(input), expected)
+
+    @parameterized.expand(
+        [
+            ("5 + true;", "type mismatch: INTEGER + BOOLEAN"),
+            ("5 + true; 5;", "type mismatch: INTEGER + BOOLEAN"),
+            ("-true", "unknown operator: -BOOLEAN"),
+            ("true + false;", "unknown operator: BOOLEAN + BOOLEAN"),
+            ("5; true + false; 5", "unknown operator: BOOLEAN + BOOLEAN"),
+            ("if (10 > 1) { true + false; }", "unknown operator: BOOLEAN + BOOLEAN"),
+            ("foobar", "identifier not found: foobar"),
+            ("1 / 0", "division by zero"),
+            ("5(1)", "not a function: INTEGER"),
+            ("[1, 2 + true]", "type mismatch: INTEGER + BOOLEAN"),
+            ("{fn(x) { x }: 1}", "unusable as hash key: FUNCTION"),
+            ("{1: 2}[[1]]", "unusable as hash key: ARRAY"),
+            ("1[0]", "index operator not supported: INTEGER"),
+            ("[1][true]", "index operator not supported: ARRAY"),
+        ]
+    )
+    def test_error_handling(self, input: str, expected: str):
+        evaluated = self._test_eval(input)
+        self.assertIsInstance(evaluated, Error)
+        assert isinstance(evaluated, Error)
+        self.assertEqual(expected, evaluated.message)
+
+    @parameterized.expand(
+        [
+            ("let a = 5; a;", 5),
+            ("let a = 5 * 5; a;", 25),
+            ("let a = 5; let b = a; b;", 5),
+            ("let a = 5; let b = a; let c = a + b + 5; c;", 15),
+        ]
+    )
+    def test_let_statements(self, input: str, expected: int):
+        self._test_integer_object(self._test_eval(input), expected)
+
+    def test_function_object(self):
+        evaluated = self._test_eval("fn(x) { x + 2; };")
+        self.assertIsInstance(evaluated, Function)
+        assert isinstance(evaluated, Function)
+        self.assertEqual(["x"], [str(p) for p in evaluated.parameters])
+        self.assertEqual("(x + 2)", str(evaluated.body))
+
+    @parameterized.expand(
+        [
+            ("let identity = fn(x) { x; }; identity(5);", 5),
+            ("let identity = fn(x) { return x; }; identity(5);", 5),
+            ("let double = fn(x) { x * 2; }; double(5);", 10),
+            ("let add = fn(x, y) { x + y; }; add(5, 5);", 10),
+            ("let add = fn(x, y) { x + y; }; add(5 + 5, add(5, 5));", 20),
+            ("fn(x) { x; }(5)", 5),
+            ("let f = fn(x) { fn(y) { x + y } }; let g = f(2); g(3);", 5),
+            (
+                "let fib = fn(n) { if (n < 2) { return n; } fib(n - 1) + fib(n - 2) };"
+                " fib(15);",
+                610,
+            ),
+        ]
+    )
+    def test_function_application(self, input: str, expected: int):
+        self._test_integer_object(self._test_eval(input), expected)
+
+    def test_array_literal(self):
+        evaluated = self._test_eval("[1, 2 * 2, 3 + 3]")
+        self.assertIsInstance(evaluated, Array)
+        assert isinstance(evaluated, Array)
+        self.assertEqual("[1, 4, 6]", evaluated.inspect())
+
+    @parameterized.expand(
+        [
+            ("[1, 2, 3][0]", 1),
+            ("[1, 2, 3][2]", 3),
+            ("let i = 0; [1][i];", 1),
+            ("[1, 2, 3][1 + 1];", 3),
+            ("let a = [1, 2, 3]; a[0] + a[1] + a[2];", 6),
+            ("let a = [1, 2, 3]; let i = a[0]; a[i]", 2),
+            ("[1, 2, 3][3]", None),
+            ("[1, 2, 3][-1]", None),
+            ("{1: 5}[1]", 5),
+            ("{1: 5}[2]", None),
+            ("let key = 3; {key: 5}[3]", 5),
+            ("{}[5]", None),
+            ("{true: 5}[1 < 2]", 5),
+            ("{1: 5, true: 6}[true]", 6),
+            ("{1: 5, 1: 6}[1]", 6),
+        ]
+    )
+    def test_index_expressions(self, input: str, expected: int | None):
+        evaluated = self._test_eval(input)
+        if expected is None:
+            self.assertIs(NULL, evaluated)
+        else:
+            self._test_integer_object(evaluated, expected)
+
+    def test_hash_literal(self):
+        evaluated = self._test_eval(
+            "let two = 2; {1: 10, two: 20, 1 + 2: 30, true: 40, false: 50}"
+        )
+        self.assertIsInstance(evaluated, Hash)
+        assert isinstance(evaluated, Hash)
+        self.assertEqual(
+            {"1": "10", "2": "20", "3": "30", "true": "40", "false": "50"},
+            {key.inspect(): value.inspect() for key, value in evaluated.pairs.values()},
+        )
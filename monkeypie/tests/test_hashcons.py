@@ -0,0 +1,125 @@
+import gc
+import pickle
+import unittest
+from typing import cast
+from unittest import mock
+
+from parameterized import parameterized
+
+from monkeypie.analysis import free_identifiers
+from monkeypie.ast import (
+    ExpressionStatement,
+    InfixExpression,
+    LetStatement,
+    ProgramNode,
+)
+from monkeypie.hashcons import InternTable, SubtreeCache
+from monkeypie.incremental import reparse
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+
+
+def parse(input: str, intern_table: InternTable | None = None) -> ProgramNode:
+    program = Parser(Lexer(input), intern_table).parse_program()
+    assert program is not None
+    return program
+
+
+def value(program: ProgramNode, index: int) -> InfixExpression:
+    return cast(InfixExpression, cast(LetStatement, program.statements[index]).value)
+
+
+class TestStructuralEquality(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("let x = a + 1;", "let  x =\n a+1", True),
+            ("fn(x) { x * 2 }(3)", "fn(x){x*2}(3);", True),
+            ("if (a) { b } else { c }", "if (a) { b } else { d }", False),
+            ("a + 1", "1 + a", False),
+            ("-5", "!5", False),
+            ("let x = 1;", "x = 1;", False),
+        ]
+    )
+    def test_equality(self, first: str, second: str, equal: bool):
+        self.assertEqual(equal, parse(first) == parse(second))
+        if equal:
+            self.assertEqual(hash(parse(first)), hash(parse(second)))
+
+    def test_hash_is_cached(self):
+        chain = value(parse(f"let x = {' + '.join(['a'] * 200)};"), 0)
+        hash(chain)
+        with mock.patch.object(InfixExpression, "structure") as structure:
+            hash(chain)
+            hash(chain.left)
+        structure.assert_not_called()
+        self.assertNotIn("_hash", pickle.loads(pickle.dumps(chain)).__dict__)
+
+
+class TestHashConsing(unittest.TestCase):
+    def test_shares_pure_expressions(self):
+        table = InternTable()
+        program = parse("let a = x + 1; let b = x + 1; let c = (x + 1) * 2;", table)
+        self.assertIs(value(program, 0), value(program, 1))
+        self.assertIs(value(program, 0), value(program, 2).left)
+        self.assertIs(value(program, 0).left, value(program, 1).left)
+        self.assertGreater(table.hits, 0)
+
+    def test_does_not_share_calls(self):
+        program = parse("let a = f(1); let b = f(1);", InternTable())
+        self.assertIsNot(value(program, 0), value(program, 1))
+        self.assertEqual(value(program, 0), value(program, 1))
+
+    def test_same_program_as_without_table(self):
+        input = "let f = fn(x, y) { if (x < y) { x + 1 } else { -y * (x + 1) } }; f(1 + 2, 1 + 2);"
+        self.assertEqual(str(parse(input)), str(parse(input, InternTable())))
+        self.assertEqual(parse(input), parse(input, InternTable()))
+
+    def test_cannot_reparse(self):
+        input = "let a = x + 1; let b = x + 1;"
+        program = parse(input, InternTable())
+        with self.assertRaises(ValueError):
+            reparse(program, input, (8, 9), "y")
+
+    def test_entries_are_weak(self):
+        table = InternTable()
+        program = parse("a + 1; a + 1; b * 2;", table)
+        self.assertEqual(6, len(table))
+        del program
+        gc.collect()
+        self.assertEqual(0, len(table))
+
+    def test_shared_table(self):
+        table = InternTable()
+        first = parse("a + 1;", table)
+        second = parse("a + 1;", table)
+        self.assertIs(
+            cast(ExpressionStatement, first.statements[0]).expression,
+            cast(ExpressionStatement, second.statements[0]).expression,
+        )
+
+
+class TestFreeIdentifiers(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("a + b * 2", {"a", "b"}),
+            ("let x = 1; x + y", {"y"}),
+            ("fn(x, y) { x + y + z }", {"z"}),
+            ("let f = fn(n) { f(n - 1) };", {"f"}),
+            ("if (a) { let b = 1; b } else { c }", {"a", "c"}),
+            ("add(1, 2)", {"add"}),
+            ("return !x;", {"x"}),
+            ("[a, b[c]]", {"a", "b", "c"}),
+            ("{k: v, 1: fn(v) { v }}", {"k", "v"}),
+        ]
+    )
+    def test_free_identifiers(self, input: str, expected: set[str]):
+        self.assertEqual(expected, free_identifiers(parse(input)))
+
+    def test_cache_hits_shared_subtrees(self):
+        input = "let a = x + 1 * y; let b = x + 1 * y; let c = x + 1 * y;"
+        cache: SubtreeCache[frozenset[str]] = SubtreeCache()
+        free_identifiers(parse(input, InternTable()), cache)
+        self.assertEqual(2, cache.hits)
+        self.assertEqual(
+            free_identifiers(parse(input)), free_identifiers(parse(input), cache)
+        )
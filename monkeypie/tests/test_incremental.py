@@ -0,0 +1,114 @@
+import random
+import unittest
+
+from parameterized import parameterized
+
+from monkeypie.ast import Node, ProgramNode
+from monkeypie.incremental import reparse
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+from monkeypie.token import Token, TokenType
+
+SOURCE = r"""let five = 5;
+let ten = 10;
+
+let add = fn(x, y) {
+  x + y;
+};
+
+let result = add(five, ten);
+!-/*5;
+5 < 10 > 5;
+
+if (5 < 10) {
+    return true;
+} else {
+    return false;
+}
+
+10 == 10;
+10 != 9;
+"""
+
+
+def parse(source: str) -> ProgramNode:
+    program = Parser(Lexer(source)).parse_program()
+    assert program is not None
+    return program
+
+
+def spans(program: ProgramNode) -> list[tuple[str, int, int]]:
+    out: list[tuple[str, int, int]] = []
+    stack: list[object] = list(reversed(program.statements))
+    while stack:
+        item = stack.pop()
+        if isinstance(item, Token):
+            out.append((item.literal, item.start, item.end))
+        elif isinstance(item, Node):
+            out.append(
+                (
+                    type(item).__name__,
+                    getattr(item, "start", -1),
+                    getattr(item, "end", -1),
+                )
+            )
+            for value in reversed(list(vars(item).values())):
+                if isinstance(value, list):
+                    stack.extend(reversed(value))
+                else:
+                    stack.append(value)
+    return out
+
+
+def tokens(program: ProgramNode) -> list[tuple[str, int, int]]:
+    return [
+        (t.literal, t.start, t.end) for t in program.tokens if t.type != TokenType.EOF
+    ]
+
+
+class TestReparse(unittest.TestCase):
+    def _test_reparse(self, source: str, edit_range: tuple[int, int], text: str):
+        start, end = edit_range
+        new_source = source[:start] + text + source[end:]
+        expected = parse(new_source)
+        actual = reparse(parse(source), source, edit_range, text)
+        self.assertEqual(str(expected), str(actual))
+        self.assertEqual(
+            [(s.start, s.end) for s in expected.statements],
+            [(s.start, s.end) for s in actual.statements],
+        )
+        self.assertEqual(spans(expected), spans(actual))
+        self.assertEqual(tokens(expected), tokens(actual))
+
+    @parameterized.expand(
+        [
+            ("insert digit", (21, 21), "0"),
+            ("delete semicolon", (12, 13), ""),
+            ("open block", (59, 60), ""),
+            ("join statements", (104, 106), "+"),
+            ("rename parameter", (37, 38), "xx"),
+            ("append", (len(SOURCE), len(SOURCE)), "add(1, 2);"),
+            ("prepend", (0, 0), "1 "),
+            ("replace all", (0, len(SOURCE)), "let a = 1;"),
+            ("unterminated", (len(SOURCE), len(SOURCE)), "fn(x) { x;"),
+        ]
+    )
+    def test_edit(self, _name: str, edit_range: tuple[int, int], text: str):
+        self._test_reparse(SOURCE, edit_range, text)
+
+    def test_reuses_statements_outside_edit(self):
+        old_program = parse(SOURCE)
+        first, last = old_program.statements[0], old_program.statements[-1]
+        program = reparse(old_program, SOURCE, (45, 46), "z")
+        self.assertIs(first, program.statements[0])
+        self.assertIs(last, program.statements[-1])
+
+    def test_random_edits(self):
+        rng = random.Random(1234)
+        alphabet = "ab19 ;(){},+-*/!<>=\n"
+        for _ in range(300):
+            start = rng.randrange(len(SOURCE) + 1)
+            end = min(len(SOURCE), start + rng.randrange(3))
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randrange(3)))
+            with self.subTest(edit_range=(start, end), text=text):
+                self._test_reparse(SOURCE, (start, end), text)
@@ -0,0 +1,206 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+
+from monkeypie import index
+from monkeypie.index import CALL, DEFINITION, REFERENCE, SymbolIndex, occurrences
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+
+
+def names(source: str) -> list[tuple[str, str]]:
+    program = Parser(Lexer(source)).parse_program()
+    return [(name, kind) for name, kind, _, _ in occurrences(program)]
+
+
+class TestOccurrences(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("let x = 1;", [("x", DEFINITION)]),
+            ("let y = x + 1;", [("y", DEFINITION), ("x", REFERENCE)]),
+            ("f(x)", [("f", CALL), ("x", REFERENCE)]),
+            ("f(1)(g)", [("f", CALL), ("g", REFERENCE)]),
+            ("xs[i]", [("xs", REFERENCE), ("i", REFERENCE)]),
+            ("[a, -b, !c]", [("a", REFERENCE), ("b", REFERENCE), ("c", REFERENCE)]),
+            ("{k: v}", [("k", REFERENCE), ("v", REFERENCE)]),
+            (
+                "if (c) { return a; } else { b }",
+                [("c", REFERENCE), ("a", REFERENCE), ("b", REFERENCE)],
+            ),
+            ('import "lib.monkey"; lib', [("lib", REFERENCE)]),
+            # Parameters shadow let-bound names.
+            ("fn(x, f) { f(x) + y }", [("y", REFERENCE)]),
+            ("fn(x) { fn(y) { x + y + z } }", [("z", REFERENCE)]),
+            (
+                "fn(x) { x; let x = 1; x }",
+                [("x", DEFINITION), ("x", REFERENCE)],
+            ),
+            (
+                "let f = fn(n) { f(n - 1) };",
+                [("f", DEFINITION), ("f", CALL)],
+            ),
+        ]
+    )
+    def test_occurrences(self, source: str, expected: list[tuple[str, str]]):
+        self.assertEqual(expected, names(source))
+
+    def test_spans(self):
+        source = "let total = add(total, 1);"
+        program = Parser(Lexer(source)).parse_program()
+        self.assertEqual(
+            ["total", "add", "total"],
+            [source[start:end] for _, _, start, end in occurrences(program)],
+        )
+
+
+class TestSymbolIndex(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.database = os.path.join(self.directory, "index.sqlite3")
+        self.index = self.open()
+
+    def open(self) -> SymbolIndex:
+        opened = SymbolIndex(self.database)
+        self.addCleanup(opened.close)
+        return opened
+
+    def write(self, name: str, source: str, mtime_ns: int | None = None) -> str:
+        path = os.path.join(self.directory, "src", name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(source)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    def update(self) -> index.Updated:
+        return self.index.update(os.path.join(self.directory, "src"))
+
+    def test_definitions_and_references_across_files(self):
+        lib = self.write("lib/math.monkey", "let square = fn(x) { x * x };")
+        main = self.write(
+            "main.monkey", "let y = square(2);\nlet z = square(y) + y;\nlet f = square;"
+        )
+        self.assertEqual([lib, main], sorted(self.update().indexed))
+
+        (definition,) = self.index.definitions("square")
+        self.assertEqual((lib, 4, 10, 1, 5), definition[2:])
+        self.assertEqual(
+            [(main, 1, 9, CALL), (main, 2, 9, CALL), (main, 3, 9, REFERENCE)],
+            [
+                (reference.path, reference.line, reference.column, reference.kind)
+                for reference in self.index.references("square")
+            ],
+        )
+        self.assertEqual(
+            [1, 2], [call.line for call in self.index.references("square", True)]
+        )
+        self.assertEqual([], self.index.definitions("x"))
+        self.assertEqual([], self.index.references("missing"))
+        self.assertEqual(
+            [("square", DEFINITION)],
+            [
+                (occurrence.name, occurrence.kind)
+                for occurrence in self.index.symbols(lib)
+            ],
+        )
+
+    def test_index_persists(self):
+        path = self.write("a.monkey", "let a = 1;")
+        self.update()
+        self.index.close()
+        reopened = self.open()
+        self.assertEqual([path], reopened.files())
+        self.assertEqual(1, len(reopened.definitions("a")))
+
+    def test_queries_do_not_parse(self):
+        self.write("a.monkey", "let a = 1; a")
+        self.update()
+        with (
+            mock.patch.object(index, "Parser") as parser,
+            mock.patch.object(index, "Lexer") as lexer,
+        ):
+            self.assertEqual(1, len(self.index.definitions("a")))
+            self.assertEqual(1, len(self.index.references("a")))
+        parser.assert_not_called()
+        lexer.assert_not_called()
+
+    def test_only_changed_files_are_parsed(self):
+        a = self.write("a.monkey", "let a = 1;", mtime_ns=10**18)
+        b = self.write("b.monkey", "let b = a;", mtime_ns=10**18)
+        self.assertEqual([a, b], self.update().indexed)
+        self.assertEqual([], self.update().indexed)
+
+        # Touched but unchanged: recognised by its digest.
+        os.utime(a, ns=(2 * 10**18, 2 * 10**18))
+        with mock.patch.object(index, "Parser", wraps=Parser) as parser:
+            self.assertEqual([], self.update().indexed)
+        parser.assert_not_called()
+
+        self.write("b.monkey", "let b = a + a;", mtime_ns=3 * 10**18)
+        self.assertEqual([b], self.update().indexed)
+        self.assertEqual(2, len(self.index.references("a")))
+        self.assertEqual(1, len(self.index.definitions("b")))
+
+    def test_removed_files_are_dropped(self):
+        a = self.write("a.monkey", "let a = 1;")
+        b = self.write("nested/b.monkey", "let b = 1;")
+        self.update()
+        os.remove(b)
+        self.assertEqual(index.Updated([], [b]), self.update())
+        self.assertEqual([a], self.index.files())
+        self.assertEqual([], self.index.definitions("b"))
+
+    def test_update_only_drops_files_under_its_paths(self):
+        a = self.write("a.monkey", "let a = 1;")
+        other = os.path.join(self.directory, "src_other")
+        os.makedirs(other)
+        with open(os.path.join(other, "c.monkey"), "w") as file:
+            file.write("let c = 1;")
+        self.index.update(other)
+        self.index.update(a)
+        self.assertEqual(2, len(self.index.files()))
+        self.update()
+        self.assertEqual(2, len(self.index.files()))
+
+    def test_other_files_are_ignored(self):
+        self.write("notes.txt", "let a = 1;")
+        self.assertEqual([], self.update().indexed)
+
+    def test_files_that_fail_to_parse(self):
+        self.write("a.monkey", "let a = 1;\nlet = 2;\nlet c = a;")
+        self.update()
+        self.assertEqual(1, len(self.index.definitions("a")))
+        self.assertEqual(1, len(self.index.definitions("c")))
+
+    def test_schema_mismatch_rebuilds(self):
+        self.write("a.monkey", "let a = 1;")
+        self.update()
+        self.index.close()
+        connection = sqlite3.connect(self.database)
+        connection.execute("PRAGMA user_version = 0")
+        connection.close()
+        reopened = self.open()
+        self.assertEqual([], reopened.files())
+        self.assertEqual(1, len(reopened.update(self.directory).indexed))
+
+    def test_main(self):
+        path = self.write("a.monkey", "let a = 1;\na + a")
+        argv = ["--index", self.database]
+        with mock.patch("builtins.print") as print_:
+            index.main([*argv, "update", self.directory])
+            index.main([*argv, "references", "a"])
+        self.assertEqual(
+            [
+                "indexed 1 files, removed 0",
+                f"{path}:2:1: reference a",
+                f"{path}:2:5: reference a",
+            ],
+            [str(call.args[0]) for call in print_.call_args_list],
+        )
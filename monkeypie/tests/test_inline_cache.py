@@ -0,0 +1,116 @@
+import unittest
+
+from parameterized import parameterized
+
+from monkeypie.ast import CallExpression, ProgramNode
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator, inline_cache_stats
+from monkeypie.lexer import Lexer
+from monkeypie.limits import LimitedEvaluator, Limits
+from monkeypie.parser import Parser
+
+FIB = "let fib = fn(n) { if (n < 2) { return n; } fib(n - 1) + fib(n - 2) };\nfib(15)"
+FIB_CALLS = 1973
+
+
+def parse(source: str) -> ProgramNode:
+    parser = Parser(Lexer(source))
+    program = parser.parse_program()
+    assert program is not None and not parser.errors()
+    return program
+
+
+def call_sites(program: ProgramNode) -> list[CallExpression]:
+    sites = []
+    stack: list[object] = [program]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, CallExpression):
+            sites.append(item)
+            stack.extend(vars(item).values())
+        elif hasattr(item, "__dict__"):
+            stack.extend(vars(item).values())
+    return sites
+
+
+class TestInlineCache(unittest.TestCase):
+    def test_monomorphic_call_sites(self):
+        program = parse(FIB)
+        result = Evaluator().evaluate(program, Environment())
+        self.assertEqual("610", result.inspect())
+        # One miss per call site, the first time it runs.
+        self.assertEqual((FIB_CALLS - 3, 3), inline_cache_stats(program))
+
+    def test_closures_of_one_literal_share_an_entry(self):
+        program = parse(
+            "let adder = fn(x) { fn(y) { x + y } };"
+            "let apply = fn(f) { f(1) };"
+            "apply(adder(1)) + apply(adder(2)) + apply(adder(3))"
+        )
+        result = Evaluator().evaluate(program, Environment())
+        self.assertEqual("9", result.inspect())
+        (f_call,) = [site for site in call_sites(program) if str(site) == "f(1)"]
+        assert f_call.inline_cache is not None
+        self.assertEqual((2, 1), (f_call.inline_cache.hits, f_call.inline_cache.misses))
+
+    def test_polymorphic_call_site(self):
+        program = parse(
+            "let inc = fn(x) { x + 1 };"
+            "let dec = fn(x) { x - 1 };"
+            "let apply = fn(f, x) { f(x) };"
+            "apply(inc, apply(dec, apply(inc, apply(inc, 0))))"
+        )
+        result = Evaluator().evaluate(program, Environment())
+        self.assertEqual("2", result.inspect())
+        (f_call,) = [site for site in call_sites(program) if str(site) == "f(x)"]
+        assert f_call.inline_cache is not None
+        self.assertEqual((1, 3), (f_call.inline_cache.hits, f_call.inline_cache.misses))
+
+    def test_rebinding_the_callee(self):
+        result = Evaluator().evaluate(
+            parse(
+                "let f = fn(x) { x * 2 };"
+                "let call = fn() { f(5) };"
+                "let a = call();"
+                "let f = fn(y) { y * 3 };"
+                "a + call()"
+            ),
+            Environment(),
+        )
+        self.assertEqual("25", result.inspect())
+
+    @parameterized.expand(
+        [
+            ("too few", "let add = fn(a, b) { a + b }; add(1)", "want=2, got=1"),
+            ("too many", "let id = fn(x) { x }; id(1, 2)", "want=1, got=2"),
+            # A call site always passes the same number of arguments, so a hit
+            # never needs the check; a miss at another site still does.
+            (
+                "other site",
+                "let id = fn(x) { x }; let g = fn() { id() }; id(1); g()",
+                "want=1, got=0",
+            ),
+        ]
+    )
+    def test_wrong_number_of_arguments(self, name: str, source: str, expected: str):
+        for inline_caches in (True, False):
+            result = Evaluator(inline_caches).evaluate(parse(source), Environment())
+            self.assertEqual(
+                f"ERROR: wrong number of arguments: {expected}", result.inspect()
+            )
+
+    def test_disabled(self):
+        program = parse(FIB)
+        result = Evaluator(inline_caches=False).evaluate(program, Environment())
+        self.assertEqual("610", result.inspect())
+        self.assertEqual((0, 0), inline_cache_stats(program))
+        self.assertTrue(all(site.inline_cache is None for site in call_sites(program)))
+
+    def test_limits_charge_cached_calls(self):
+        program = parse(FIB)
+        evaluator = LimitedEvaluator(Limits(fuel=FIB_CALLS))
+        self.assertEqual("610", evaluator.evaluate(program, Environment()).inspect())
+        self.assertEqual(FIB_CALLS, evaluator.steps)
+        self.assertEqual((FIB_CALLS - 3, 3), inline_cache_stats(program))
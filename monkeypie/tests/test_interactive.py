@@ -0,0 +1,165 @@
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+
+from monkeypie import interactive
+from monkeypie.ast import ProgramNode
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.interactive import InteractiveParser, Parsed
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+
+
+def feed(parser: InteractiveParser, lines: list[str]) -> list[Parsed]:
+    return [parser.feed(line + "\n") for line in lines]
+
+
+def evaluate(parsed: Parsed, env: Environment) -> str:
+    program = ProgramNode()
+    program.statements = parsed.statements
+    return Evaluator().evaluate(program, env).inspect()
+
+
+class TestInteractiveParser(unittest.TestCase):
+    @parameterized.expand(
+        [
+            (["let f = fn(x) {", "  x * 2", "};"],),
+            (["let xs = [", "1,", "2", "];"],),
+            (["add(", "1,", "2)"],),
+            (["let h = {", "1: 2", "};"],),
+            (["if (1 < 2) {", "  let y = 1;", "", "  y", "} else { 0 }"],),
+            (["let x =", "5;"],),
+            (["let f = fn(x)", "{ x };"],),
+            (["1 +", "2 *", "3"],),
+            (["import", '"lib.monkey";'],),
+            (['import "a', 'b.monkey";'],),
+        ]
+    )
+    def test_entry_spans_lines(self, lines: list[str]):
+        parser = InteractiveParser()
+        *incomplete, last = feed(parser, lines)
+        for parsed in incomplete:
+            self.assertEqual(Parsed([], [], False), parsed)
+        self.assertTrue(last.complete)
+        self.assertEqual([], last.errors)
+        self.assertFalse(parser.pending())
+
+        source = "\n".join(lines) + "\n"
+        expected = Parser(Lexer(source)).parse_program()
+        assert expected is not None
+        self.assertEqual(expected.structure(), tuple(last.statements))
+
+    def test_statements_before_an_unfinished_one_are_kept(self):
+        parser = InteractiveParser()
+        first, second = feed(parser, ["let a = 1; let b =", "a + 1; b"])
+        self.assertFalse(first.complete)
+        self.assertEqual(
+            ["let a = 1;", "let b = (a + 1);", "b"],
+            [str(statement) for statement in second.statements],
+        )
+        self.assertEqual("2", evaluate(second, Environment()))
+
+    def test_resumes_from_the_unfinished_statement(self):
+        parser = InteractiveParser()
+        with mock.patch.object(
+            interactive, "_ResumableParser", wraps=interactive._ResumableParser
+        ) as resumable:
+            feed(parser, ["let a = 1; let b = 2; let c =", "a +", "b;"])
+        tokens = [call.args[0]._tokens for call in resumable.call_args_list]
+        self.assertEqual(
+            [
+                ["let", "a", "=", "1", ";", "let", "b", "=", "2", ";", "let", "c", "="],
+                ["let", "c", "=", "a", "+"],
+                ["let", "c", "=", "a", "+", "b", ";"],
+            ],
+            [[token.literal for token in entry] for entry in tokens],
+        )
+
+    def test_lines_are_lexed_once(self):
+        parser = InteractiveParser()
+        with mock.patch.object(interactive, "Lexer", wraps=Lexer) as lexer:
+            feed(parser, ["let f = fn(x) {", "  x", "};", 'let s = "a', 'b";'])
+        self.assertEqual(
+            ["let f = fn(x) {\n", "  x\n", "};\n", 'let s = "a\n', '"a\nb";\n'],
+            [call.args[0] for call in lexer.call_args_list],
+        )
+
+    @parameterized.expand(
+        [
+            (["let = 1;"], "1:5: expected next token to be TokenType.IDENT"),
+            # A mismatched bracket ends the entry at once.
+            (["let f = fn(x) {", "  x +", "  )"], "3:3: no prefix parse"),
+            (["1 + 2 )"], "1:7: no prefix parse"),
+            (["let x =", ""], "3:1: no prefix parse function found for EOF"),
+            (["let x = 1; let", ""], "3:1: expected next token to be TokenType.IDENT"),
+            (["let = 1; let y ="], "1:5: expected next token to be TokenType.IDENT"),
+        ]
+    )
+    def test_errors_end_the_entry(self, lines: list[str], expected: str):
+        parser = InteractiveParser()
+        *incomplete, last = feed(parser, lines)
+        for parsed in incomplete:
+            self.assertFalse(parsed.complete)
+        self.assertTrue(last.complete)
+        self.assertEqual([], last.statements)
+        self.assertTrue(last.errors[0].startswith(expected), last.errors)
+        self.assertFalse(parser.pending())
+
+    def test_errors_reset_the_entry(self):
+        parser = InteractiveParser()
+        first, second = feed(parser, ["let f = fn(x) {", "  ) };"])
+        self.assertTrue(second.complete)
+        self.assertNotEqual([], second.errors)
+        self.assertFalse(parser.pending())
+        (third,) = feed(parser, ["f"])
+        self.assertEqual(["f"], [str(statement) for statement in third.statements])
+
+    def test_blank_lines_inside_brackets_and_strings(self):
+        parser = InteractiveParser()
+        results = feed(parser, ['import "a', "", 'b";'])
+        self.assertEqual([False, False, True], [parsed.complete for parsed in results])
+        self.assertEqual("a\n\nb", str(results[-1].statements[0]).split('"')[1])
+
+    def test_blank_line_without_input(self):
+        parser = InteractiveParser()
+        self.assertEqual(Parsed([], [], True), parser.feed("\n"))
+        self.assertFalse(parser.pending())
+
+    def test_reset(self):
+        parser = InteractiveParser()
+        feed(parser, ["let f = fn(x) {"])
+        self.assertTrue(parser.pending())
+        parser.reset()
+        self.assertFalse(parser.pending())
+        (parsed,) = feed(parser, ["x + 1"])
+        self.assertEqual(
+            ["(x + 1)"], [str(statement) for statement in parsed.statements]
+        )
+
+    def test_offsets_count_from_the_entry(self):
+        parser = InteractiveParser()
+        feed(parser, ["let a = 1;"])
+        first, second = feed(parser, ["let b = fn(x) {", "  x }"])
+        body = second.statements[0]
+        self.assertEqual((0, 21), (body.start, body.end))
+
+    def test_symbols_are_shared_by_entries(self):
+        parser = InteractiveParser()
+        (first,) = feed(parser, ["let abc = 1;"])
+        (second,) = feed(parser, ["abc"])
+        defined = first.statements[0].name.token
+        used = second.statements[0].token
+        self.assertEqual(defined.symbol, used.symbol)
+        self.assertIs(defined.literal, used.literal)
+
+    def test_environment_persists_across_entries(self):
+        parser = InteractiveParser()
+        env = Environment()
+        (first,) = feed(parser, ["let twice = fn(x) {"])
+        self.assertFalse(first.complete)
+        (defined,) = feed(parser, ["x * 2 };"])
+        evaluate(defined, env)
+        (used,) = feed(parser, ["twice(21)"])
+        self.assertEqual("42", evaluate(used, env))
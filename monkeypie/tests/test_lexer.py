@@ -1,9 +1,10 @@
+import random
 import unittest
 
 from parameterized import parameterized
 
 from ..lexer import Lexer
-from ..token import TokenType
+from ..token import TOKEN_TYPES, Token, TokenKind, TokenType
 
 
 class TestLexerNextToken(unittest.TestCase):
@@ -30,6 +31,9 @@ if (5 < 10) {
 
 10 == 10;
 10 != 9;
+[1, 2];
+{1: 2};
+import "lib/a.monkey";
 """)
 
     @parameterized.expand(
@@ -107,6 +111,21 @@ if (5 < 10) {
             (TokenType.NOT_EQ, "!="),
             (TokenType.INT, "9"),
             (TokenType.SEMICOLON, ";"),
+            (TokenType.LBRACKET, "["),
+            (TokenType.INT, "1"),
+            (TokenType.COMMA, ","),
+            (TokenType.INT, "2"),
+            (TokenType.RBRACKET, "]"),
+            (TokenType.SEMICOLON, ";"),
+            (TokenType.LBRACE, "{"),
+            (TokenType.INT, "1"),
+            (TokenType.COLON, ":"),
+            (TokenType.INT, "2"),
+            (TokenType.RBRACE, "}"),
+            (TokenType.SEMICOLON, ";"),
+            (TokenType.IMPORT, "import"),
+            (TokenType.STRING, "lib/a.monkey"),
+            (TokenType.SEMICOLON, ";"),
             (TokenType.EOF, "\0"),
         ]
     )
@@ -115,3 +134,115 @@ if (5 < 10) {
 
         self.assertEqual(expected_type, token.type)
         self.assertEqual(expected_literal, token.literal)
+
+
+class TestLexerPositions(unittest.TestCase):
+    def test_token_offsets(self):
+        input = "let x =\n  10 == y;"
+        lexer = Lexer(input)
+        spans = []
+        while (token := lexer.next_token()).type != TokenType.EOF:
+            spans.append((input[token.start : token.end], token.start, token.end))
+        self.assertEqual(
+            [
+                ("let", 0, 3),
+                ("x", 4, 5),
+                ("=", 6, 7),
+                ("10", 10, 12),
+                ("==", 13, 15),
+                ("y", 16, 17),
+                (";", 17, 18),
+            ],
+            spans,
+        )
+        self.assertEqual((len(input), len(input)), (token.start, token.end))
+
+    @parameterized.expand(
+        [
+            ('import "a.monkey";', [(TokenType.STRING, "a.monkey", 7, 17)]),
+            ('""', [(TokenType.STRING, "", 0, 2)]),
+            ('"ab', [(TokenType.ILLEGAL, '"ab', 0, 3)]),
+            ('"', [(TokenType.ILLEGAL, '"', 0, 1)]),
+        ]
+    )
+    def test_string_offsets(self, input: str, expected: list):
+        lexer = Lexer(input)
+        strings = []
+        while (token := lexer.next_token()).type != TokenType.EOF:
+            if token.type in (TokenType.STRING, TokenType.ILLEGAL):
+                strings.append((token.type, token.literal, token.start, token.end))
+        self.assertEqual(expected, strings)
+        self.assertEqual((len(input), len(input)), (token.start, token.end))
+
+    @parameterized.expand(
+        [
+            (0, (1, 1)),
+            (3, (1, 4)),
+            (7, (1, 8)),
+            (8, (2, 1)),
+            (10, (2, 3)),
+            (17, (2, 10)),
+        ]
+    )
+    def test_line_column(self, offset: int, expected: tuple[int, int]):
+        self.assertEqual(expected, Lexer("let x =\n  10 == y;").line_column(offset))
+
+
+class TestTokenKinds(unittest.TestCase):
+    @parameterized.expand([(token_type,) for token_type in TokenType])
+    def test_round_trip(self, token_type: TokenType):
+        token = Token(token_type, "")
+        self.assertEqual(getattr(TokenKind, token_type.name), token.kind)
+        self.assertIs(token_type, token.type)
+        self.assertIs(token_type, TOKEN_TYPES[token.kind])
+
+
+class TestAsciiFastPath(unittest.TestCase):
+    @staticmethod
+    def tokens(lexer: Lexer) -> list[tuple[int, str, int, int]]:
+        tokens = []
+        eofs = 0
+        while eofs < 3:
+            token = lexer.next_token()
+            tokens.append((token.kind, token.literal, token.start, token.end))
+            eofs += token.kind == TokenKind.EOF
+        return tokens
+
+    def _test_same_tokens(self, input: str, position: int = 0):
+        expected = self.tokens(Lexer(input, position, ascii_fast_path=False))
+        self.assertEqual(expected, self.tokens(Lexer(input, position)))
+        self.assertEqual(expected, self.tokens(Lexer(input.encode(), position)))
+        self.assertEqual(
+            expected, self.tokens(Lexer(memoryview(input.encode()), position))
+        )
+
+    @parameterized.expand(
+        [
+            ("let add = fn(x, y) { x + y; };\nadd(1, 2) == 3 != !true",),
+            ("café = 1;",),
+            ("x = 1; y = café + 2",),
+            ("let x = 5;",),
+            ("12٣ + 4",),
+            ("a\0b @ c#",),
+            ("\x1c\x1fx\x0b\x0c;",),
+            ("x ==",),
+            ("[a, b[1]]; {a: [1], 2: b}",),
+            ('import "lib/é.monkey"; import "a b";x',),
+            ('x "unterminated',),
+            ("",),
+        ]
+    )
+    def test_same_tokens(self, input: str):
+        self._test_same_tokens(input)
+
+    def test_position(self):
+        self._test_same_tokens("let x = 1;\nlet y = 2;", 11)
+        self._test_same_tokens("let é = 1;\nlet y = 2;", 11)
+
+    def test_random_input(self):
+        rng = random.Random(29)
+        alphabet = 'ab_Z09 \t\n;=!(){},+-*/<>\0@é² "'
+        for _ in range(200):
+            input = "".join(rng.choice(alphabet) for _ in range(rng.randrange(30)))
+            with self.subTest(input=input):
+                self._test_same_tokens(input)
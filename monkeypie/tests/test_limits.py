@@ -0,0 +1,78 @@
+import unittest
+
+from parameterized import parameterized
+
+from monkeypie.environment import Environment
+from monkeypie.lexer import Lexer
+from monkeypie.limits import FUEL_BLOCK, LimitedEvaluator, LimitExceeded, Limits
+from monkeypie.parser import Parser
+from monkeypie.pipeline import run_pipelined
+
+FIB = "let fib = fn(n) { if (n < 2) { return n; } fib(n - 1) + fib(n - 2) };\nfib(15)"
+FIB_CALLS = 1973
+LOOP = "let loop = fn(n) { loop(n + 1) };\nloop(0)"
+
+
+def evaluate(source: str, limits: Limits) -> tuple[str, LimitedEvaluator]:
+    program = Parser(Lexer(source)).parse_program()
+    evaluator = LimitedEvaluator(limits)
+    return evaluator.evaluate(program, Environment()).inspect(), evaluator
+
+
+class TestLimits(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("unlimited", Limits()),
+            ("exact fuel", Limits(fuel=FIB_CALLS)),
+            ("exact depth", Limits(max_depth=15)),
+            ("timeout", Limits(timeout=60)),
+        ]
+    )
+    def test_within_limits(self, _name: str, limits: Limits):
+        result, evaluator = evaluate(FIB, limits)
+        self.assertEqual("610", result)
+        self.assertEqual(FIB_CALLS, evaluator.steps)
+
+    @parameterized.expand(
+        [
+            ("fuel", Limits(fuel=FIB_CALLS - 1), "fuel exhausted after 1972 steps"),
+            ("small fuel", Limits(fuel=3), "fuel exhausted after 3 steps"),
+            ("depth", Limits(max_depth=14), "maximum call depth of 14 exceeded"),
+        ]
+    )
+    def test_exceeded(self, _name: str, limits: Limits, message: str):
+        with self.assertRaises(LimitExceeded) as context:
+            evaluate(FIB, limits)
+        self.assertEqual(message, str(context.exception))
+        stack = context.exception.format_stack()
+        self.assertEqual("fib at offset 70", stack[0])
+        self.assertTrue(all(frame.startswith("fib at offset ") for frame in stack))
+
+    def test_depth_stack(self):
+        with self.assertRaises(LimitExceeded) as context:
+            evaluate(LOOP, Limits(max_depth=5))
+        self.assertEqual(
+            ["loop at offset 34"] + ["loop at offset 19"] * 5,
+            context.exception.format_stack(),
+        )
+
+    def test_deadline(self):
+        with self.assertRaises(LimitExceeded) as context:
+            evaluate(FIB.replace("fib(15)", "fib(40)"), Limits(timeout=0.05))
+        self.assertTrue(str(context.exception).startswith("deadline of 0.05 s"))
+
+    def test_fuel_is_charged_in_blocks(self):
+        source = "let f = fn() { 1 };\n" + "f();\n" * (FUEL_BLOCK + 1)
+        _, evaluator = evaluate(source, Limits(fuel=FUEL_BLOCK + 1))
+        self.assertEqual(FUEL_BLOCK + 1, evaluator.steps)
+        with self.assertRaises(LimitExceeded):
+            evaluate(source, Limits(fuel=FUEL_BLOCK))
+
+    def test_no_calls_needs_no_fuel(self):
+        self.assertEqual("3", evaluate("1 + 2", Limits(fuel=0))[0])
+
+    def test_budget_spans_pipelined_statements(self):
+        evaluator = LimitedEvaluator(Limits(fuel=FIB_CALLS + 1))
+        with self.assertRaises(LimitExceeded):
+            run_pipelined(FIB + ";\nfib(1); fib(1);", evaluator=evaluator)
+        self.assertEqual(FIB_CALLS + 1, evaluator.steps)
@@ -0,0 +1,44 @@
+import contextlib
+import io
+import unittest
+
+from monkeypie.lexer import Lexer
+from monkeypie.memprofile import object_sizes, print_diff, profile
+from monkeypie.parser import Parser
+
+
+class TestMemoryProfile(unittest.TestCase):
+    def test_object_sizes(self):
+        program = Parser(Lexer("let x = 1 + x; x;")).parse_program()
+        assert program is not None
+        counts = {kind: count for kind, (count, _) in object_sizes(program).items()}
+        self.assertEqual(1, counts["LetStatement"])
+        self.assertEqual(1, counts["ExpressionStatement"])
+        self.assertEqual(3, counts["IdentifierExpression"])
+        self.assertEqual(1, counts["InfixExpression"])
+        self.assertEqual(1, counts["IntegerLiteralExpression"])
+        # let x = 1 + x ; x ; and the two EOF tokens read by the parser, each
+        # counted once however many nodes refer to it.
+        self.assertEqual(11, counts["Token"])
+        # let x = 1 + ; and the EOF literal: repeated literals are shared.
+        self.assertEqual(7, counts["str"])
+
+    def test_profile(self):
+        report = profile("let add = fn(a, b) { a + b }; add(1, 2);" * 50, top=5)
+        self.assertEqual(2000, report["source_bytes"])
+        self.assertEqual(50, report["objects"]["LetStatement"]["count"])
+        self.assertLessEqual(len(report["sites"]), 5)
+        self.assertTrue(
+            all(
+                site.split(":")[0] in ("lexer.py", "parser.py")
+                for site in report["sites"]
+            )
+        )
+
+    def test_diff(self):
+        baseline = profile("1 + 2;")
+        report = profile("1 + 2; 3;")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            print_diff(baseline, report)
+        self.assertIn("ExpressionStatement", output.getvalue())
@@ -0,0 +1,184 @@
+import os
+import tempfile
+import unittest
+
+from parameterized import parameterized
+
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.modules import ImportCycleError, Module, ModuleError, ModuleLoader
+from monkeypie.object import Error, Object
+from monkeypie.parser import Parser
+from monkeypie.tiered import TieredEvaluator
+
+
+class TestModules(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.loader = ModuleLoader(workers=4)
+
+    def write(self, name: str, source: str, mtime_ns: int | None = None) -> str:
+        path = os.path.join(self.directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(source)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    def run_module(self, module: Module, evaluator: Evaluator | None = None) -> Object:
+        return (evaluator or Evaluator()).evaluate(module.program, Environment())
+
+    def test_import_binds_module_names(self):
+        self.write("lib/math.monkey", "let square = fn(x) { x * x }; let two = 2;")
+        main = self.write("main.monkey", 'import "lib/math.monkey"; square(two) + 1')
+        module = self.loader.load(main)
+        self.assertEqual("5", self.run_module(module).inspect())
+        self.assertEqual("5", self.run_module(module, TieredEvaluator(2)).inspect())
+
+    def test_paths_are_relative_to_the_importer(self):
+        self.write("lib/a.monkey", 'import "b.monkey"; let a = b + 1;')
+        self.write("lib/b.monkey", 'import "../c.monkey"; let b = c + 1;')
+        self.write("c.monkey", "let c = 1;")
+        main = self.write("main.monkey", 'import "lib/a.monkey"; a')
+        self.assertEqual("3", self.run_module(self.loader.load(main)).inspect())
+
+    def test_modules_are_shared_by_importers(self):
+        self.write("shared.monkey", "let f = fn(x) { x };")
+        self.write("a.monkey", 'import "shared.monkey"; let fa = f;')
+        self.write("b.monkey", 'import "shared.monkey"; let fb = f;')
+        main = self.write(
+            "main.monkey", 'import "a.monkey"; import "b.monkey"; fa == fb'
+        )
+        module = self.loader.load(main)
+        self.assertEqual("true", self.run_module(module).inspect())
+
+        assert module.dependencies is not None
+        a = module.dependencies[os.path.join(self.directory, "a.monkey")]
+        b = module.dependencies[os.path.join(self.directory, "b.monkey")]
+        assert a.dependencies is not None and b.dependencies is not None
+        self.assertIs(
+            a.dependencies[os.path.join(self.directory, "shared.monkey")],
+            b.dependencies[os.path.join(self.directory, "shared.monkey")],
+        )
+
+    def test_module_is_evaluated_once(self):
+        self.write("lib.monkey", "let x = 1;")
+        main = self.write("main.monkey", 'import "lib.monkey"; x')
+        module = self.loader.load(main)
+        evaluator = Evaluator()
+        self.run_module(module, evaluator)
+        lib = self.loader.cached(os.path.join(self.directory, "lib.monkey"))
+        assert lib is not None
+        exports = lib.exports(evaluator)
+        self.run_module(module)
+        self.assertIs(exports, lib.exports(Evaluator()))
+
+    def test_import_in_function_body(self):
+        self.write("lib.monkey", "let k = 10;")
+        main = self.write(
+            "main.monkey", 'let f = fn(x) { import "lib.monkey"; x + k }; f(1) + f(2)'
+        )
+        self.assertEqual("23", self.run_module(self.loader.load(main)).inspect())
+
+    def test_link_program(self):
+        self.write("lib.monkey", "let k = 10;")
+        program = Parser(Lexer('import "lib.monkey"; k * 2')).parse_program()
+        assert program is not None
+        self.loader.link(program, self.directory)
+        result = Evaluator().evaluate(program, Environment())
+        self.assertEqual("20", result.inspect())
+
+    def test_cache_hit(self):
+        self.write("lib.monkey", "let x = 1;")
+        main = self.write("main.monkey", 'import "lib.monkey"; x')
+        self.assertIs(self.loader.load(main), self.loader.load(main))
+
+    def test_cache_invalidated_by_change(self):
+        lib = self.write("lib.monkey", "let x = 1;", mtime_ns=10**18)
+        main = self.write("main.monkey", 'import "lib.monkey"; x')
+        first = self.loader.load(main)
+        self.assertEqual("1", self.run_module(first).inspect())
+
+        self.write("lib.monkey", "let x = 2;", mtime_ns=2 * 10**18)
+        second = self.loader.load(main)
+        self.assertIsNot(first, second)
+        self.assertEqual("2", self.run_module(second).inspect())
+        # Modules loaded before keep the imports they were linked to.
+        self.assertEqual("1", self.run_module(first).inspect())
+        assert second.dependencies is not None
+        self.assertIs(self.loader.cached(lib), second.dependencies[lib])
+
+    def test_cache_kept_when_only_mtime_changes(self):
+        lib = self.write("lib.monkey", "let x = 1;", mtime_ns=10**18)
+        main = self.write("main.monkey", 'import "lib.monkey"; x')
+        first = self.loader.load(main)
+        cached = self.loader.cached(lib)
+        os.utime(lib, ns=(2 * 10**18, 2 * 10**18))
+        self.assertIs(first, self.loader.load(main))
+        self.assertIs(cached, self.loader.cached(lib))
+
+    @parameterized.expand(
+        [
+            ({"a.monkey": 'import "a.monkey";'}, ["a.monkey", "a.monkey"]),
+            (
+                {"a.monkey": 'import "b.monkey";', "b.monkey": 'import "a.monkey";'},
+                ["a.monkey", "b.monkey", "a.monkey"],
+            ),
+            (
+                {
+                    "a.monkey": 'import "b.monkey";',
+                    "b.monkey": 'import "c.monkey";',
+                    "c.monkey": 'let f = fn() { import "b.monkey"; };',
+                },
+                ["b.monkey", "c.monkey", "b.monkey"],
+            ),
+        ]
+    )
+    def test_cycles(self, files: dict[str, str], expected: list[str]):
+        for name, source in files.items():
+            self.write(name, source)
+        with self.assertRaises(ImportCycleError) as raised:
+            self.loader.load(os.path.join(self.directory, "a.monkey"))
+        self.assertEqual(
+            [os.path.join(self.directory, name) for name in expected],
+            raised.exception.cycle,
+        )
+
+    def test_missing_module(self):
+        main = self.write("main.monkey", 'import "missing.monkey";')
+        with self.assertRaises(ModuleError) as raised:
+            self.loader.load(main)
+        self.assertIn(
+            os.path.join(self.directory, "missing.monkey"), str(raised.exception)
+        )
+
+    def test_parse_errors(self):
+        self.write("lib.monkey", "let x = 1;\nlet = 1;")
+        main = self.write("main.monkey", 'import "lib.monkey";')
+        with self.assertRaises(ModuleError) as raised:
+            self.loader.load(main)
+        lib = os.path.join(self.directory, "lib.monkey")
+        self.assertEqual(
+            f"{lib}:2:5: expected next token to be TokenType.IDENT,"
+            " got TokenType.ASSIGN instead",
+            str(raised.exception).split("\n")[0],
+        )
+
+    def test_module_errors_name_the_module(self):
+        lib = self.write("lib.monkey", "let x = 1 + true;")
+        main = self.write("main.monkey", 'import "lib.monkey"; 1')
+        result = self.run_module(self.loader.load(main))
+        self.assertIsInstance(result, Error)
+        assert isinstance(result, Error)
+        self.assertEqual(f"{lib}: type mismatch: INTEGER + BOOLEAN", result.message)
+
+    def test_unlinked_import(self):
+        program = Parser(Lexer('import "lib.monkey"; 1')).parse_program()
+        result = Evaluator().evaluate(program, Environment())
+        self.assertIsInstance(result, Error)
+        assert isinstance(result, Error)
+        self.assertEqual("module not loaded: lib.monkey", result.message)
@@ -0,0 +1,150 @@
+import unittest
+
+from parameterized import parameterized
+
+from monkeypie.ast import ProgramNode
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.optimizer import Optimizer, size
+from monkeypie.parser import Parser
+
+HELPERS = "let add = fn(a, b) { a + b }; let square = fn(x) { x * x };"
+
+
+def parse(source: str) -> ProgramNode:
+    parser = Parser(Lexer(source))
+    program = parser.parse_program()
+    assert program is not None and not parser.errors()
+    return program
+
+
+def run(program: ProgramNode) -> str:
+    return Evaluator().evaluate(program, Environment()).inspect()
+
+
+class TestOptimizer(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("add(1, 2)", "(1 + 2)"),
+            ("add(square(3), 4)", "((3 * 3) + 4)"),
+            ("let f = fn(y) { add(y, y * 2) }", "let f = fn(y) (y + (y * 2));"),
+            ("let f = fn(y) { add(y * 2, 1) }", "let f = fn(y) ((y * 2) + 1);"),
+            ("let f = fn(y) { square(y) }", "let f = fn(y) (y * y);"),
+            ("let f = fn(y) { square(y + 1) }", "let f = fn(y) square((y + 1));"),
+            ("let y = 2; square(y)", "let y = 2;(y * y)"),
+            ("square(y)", "square(y)"),
+            ("add(1, 2, 3)", "add(1, 2, 3)"),
+            ("let f = fn(add) { add(1, 2) }", "let f = fn(add) add(1, 2);"),
+            ("let add = 5; add(1, 2)", "let add = 5;add(1, 2)"),
+            (
+                "let f = fn(y) { let x = 2; add(y, y) }",
+                "let f = fn(y) let x = 2;(y + y);",
+            ),
+            # Imports may bind any name, add and square included.
+            ('import "lib.monkey"; add(1, 2)', 'import "lib.monkey";add(1, 2)'),
+            (
+                'let f = fn() { import "lib.monkey"; }; add(1, 2)',
+                'let f = fn() import "lib.monkey";;add(1, 2)',
+            ),
+        ]
+    )
+    def test_inlining(self, source: str, expected: str):
+        program = Optimizer().optimize(parse(HELPERS + source))
+        self.assertEqual(expected, "".join(map(str, program.statements[2:])))
+
+    @parameterized.expand(
+        [
+            ("fn(a, b) { b + a }", "add(f(1), f(2))", "add(f(1), f(2))"),
+            ("fn(a, b) { a + b }", "add(f(1), f(2))", "(f(1) + f(2))"),
+            ("fn(a, b) { a + c + b }", "add(f(1), f(2))", "add(f(1), f(2))"),
+            ("fn(a, b) { a + c + b }", "add(1, f(2))", "add(1, f(2))"),
+            ("fn(a, b) { a + b + c }", "add(1, f(2))", "((1 + f(2)) + c)"),
+            ("fn(a) { if (a) { 1 } else { 2 } }", "add(f(1))", "if f(1) 1 else 2"),
+            ("fn(a, b) { if (a) { b } }", "add(f(1), f(2))", "add(f(1), f(2))"),
+            ("fn(a, b) { if (a) { b } }", "add(f(1), 2)", "if f(1) 2"),
+            ("fn(a, b) { a }", "add(1, f(2))", "add(1, f(2))"),
+            ("fn(a, b) { a }", "add(1, 2)", "1"),
+            ("fn(a) { a == a }", "add(fn() { 1 })", "add(fn() 1)"),
+            ("fn(a) { a(1) }", "add(fn(x) { x })", "fn(x) x(1)"),
+            ("fn(a) { return a; }", "add(1)", "1"),
+            ("fn(a) { let b = a; b }", "add(1)", "add(1)"),
+            ("fn(a) { fn() { a } }", "add(1)", "add(1)"),
+            ("fn(a) { if (a) { return 1; } 2 }", "add(1)", "add(1)"),
+            ("fn(a) { if (a) { let c = 1; } c }", "add(1)", "add(1)"),
+            ("fn(a) { add(a) }", "add(1)", "add(1)"),
+        ]
+    )
+    def test_preserves_evaluation_order(self, helper: str, call: str, expected: str):
+        program = Optimizer().optimize(
+            parse(f"let f = fn(x) {{ f(x) }}; let c = 3; let add = {helper}; {call}")
+        )
+        self.assertEqual(expected, str(program.statements[3]))
+
+    @parameterized.expand(
+        [
+            ("let f = fn() { add(1, 2) }; let add = fn(a, b) { a + b }; f()",),
+            ("let c = 1; let add = fn(a) { a + c }; let f = fn(c) { add(1) }; f(2)",),
+            ("let add = fn(a) { a + c }; let f = fn(x) { let c = 5; add(x) }; f(1)",),
+            ("let add = fn(a) { a + c }; add(1)",),
+            ("let add = fn(a) { a + c }; let c = 2; add(1)",),
+            ("let add = fn(a, b) { b + a }; add(x, y)",),
+            ("let add = fn(a, b) { a / b }; add(1, 0)",),
+            ("let add = fn(a, b) { a + b }; add(1, true)",),
+            ("let add = fn(a, b) { a + b }; add(1)",),
+            ("let id = fn(a) { a }; let x = 1; id(if (true) { let x = 2; x }) + x",),
+            (
+                "let add = fn(a, b) { b - a }; let x = 1; add(x, if (true) { let x = 2; x })",
+            ),
+            ("let eq = fn(a) { a == a }; eq(fn() { 1 })",),
+            (
+                HELPERS
+                + "let f = fn(n) { if (n < 2) { return n; 5 } add(f(n - 1), f(n - 2)) }; f(10)",
+            ),
+            (HELPERS + "add(square(3), square(square(2))) + add(1, square(true))",),
+            ("let f = fn() { return 1; 1 / 0 }; f(); return 2; 1 / 0",),
+        ]
+    )
+    def test_preserves_semantics(self, source: str):
+        program = parse(source)
+        expected = run(program)
+        optimized = Optimizer().optimize(program)
+        self.assertEqual(expected, run(optimized))
+        # The original program is left as it was.
+        self.assertEqual(str(parse(source)), str(program))
+
+    def test_budget(self):
+        self.assertEqual(3, size(parse("a * b").statements[0].expression))  # type: ignore[attr-defined]
+        source = HELPERS + "add(1, 2) + square(3)"
+        optimizer = Optimizer(budget=2)
+        self.assertEqual(
+            "(add(1, 2) + square(3))",
+            str(optimizer.optimize(parse(source)).statements[2]),
+        )
+        self.assertEqual(0, optimizer.inlined)
+        optimizer = Optimizer(budget=3)
+        self.assertEqual(
+            "((1 + 2) + (3 * 3))", str(optimizer.optimize(parse(source)).statements[2])
+        )
+        self.assertEqual(2, optimizer.inlined)
+
+    def test_dead_code_elimination(self):
+        optimizer = Optimizer()
+        program = optimizer.optimize(
+            parse(
+                "let f = fn(x) { if (x) { return 1; x; x } return 2; 3 };"
+                "f(true); return f(false); f(1); f(2)"
+            )
+        )
+        self.assertEqual(
+            "let f = fn(x) if x return 1;return 2;;f(true)return f(false);",
+            str(program),
+        )
+        self.assertEqual(5, optimizer.eliminated)
+
+    def test_unchanged_subtrees_are_shared(self):
+        program = parse(HELPERS + "let f = fn(x) { x + 1 }; f(add(1, 2))")
+        optimized = Optimizer().optimize(program)
+        for i in range(3):
+            self.assertIs(program.statements[i], optimized.statements[i])
+        self.assertIsNot(program.statements[3], optimized.statements[3])
@@ -0,0 +1,179 @@
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.limits import LimitedEvaluator, Limits
+from monkeypie.object import Builtin, Error, Function, Integer, Object
+from monkeypie.parallel import WorkerPool, _payload, detach, use_pool
+from monkeypie.parser import Parser
+from monkeypie.tiered import TieredEvaluator
+
+RANGE = """
+let range = fn(lo, hi, out) { if (lo == hi) { out } else { range(lo + 1, hi, push(out, lo)) } };
+"""
+
+
+def evaluate(input: str, evaluator: Evaluator | None = None) -> Object:
+    parser = Parser(Lexer(input))
+    program = parser.parse_program()
+    assert not parser.errors(), parser.errors()
+    return (evaluator or Evaluator()).evaluate(program, Environment())
+
+
+class TestParallel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Two workers and no minimum size, so that even small arrays are
+        # split across processes.
+        cls.pool = WorkerPool(2, min_elements=1)
+        cls.previous = use_pool(cls.pool)
+
+    @classmethod
+    def tearDownClass(cls):
+        use_pool(cls.previous)
+        cls.pool.shutdown()
+
+    @parameterized.expand(
+        [
+            ("pmap([], fn(x) { x })", "[]"),
+            ("pmap([1, 2, 3], fn(x) { x * 2 })", "[2, 4, 6]"),
+            (RANGE + "pmap(range(0, 40, []), fn(x) { x * x })[39]", "1521"),
+            (RANGE + "len(pmap(range(0, 40, []), fn(x) { x }))", "40"),
+            ("let k = 10; pmap([1, 2], fn(x) { x + k })", "[11, 12]"),
+            (
+                "let fib = fn(n) { if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } };"
+                " pmap([10, 11, 12], fib)",
+                "[55, 89, 144]",
+            ),
+            ("pmap([[1, 2], [3]], len)", "[2, 1]"),
+            ("pmap([1, 2], fn(x) { x > 1 })[1] == true", "true"),
+            (
+                "pmap([1, 2], fn(x) { if (x > 1) { x } })[0] == {}[1]",
+                "true",
+            ),
+            ("pmap([{1: 2}, {1: 3, 2: 4}], fn(h) { h[1] })", "[2, 3]"),
+            ("pmap([1, 2], fn(x) { fn(y) { x + y } })[1](3)", "5"),
+            ("preduce([], 7, fn(a, b) { a + b })", "7"),
+            (RANGE + "preduce(range(1, 41, []), 0, fn(a, b) { a + b })", "820"),
+            (RANGE + "preduce(range(1, 41, []), 5, fn(a, b) { a + b })", "825"),
+            (
+                "preduce([[1], [2, 3], [4]], [], fn(a, b) { push(a, len(b)) })",
+                "[1, 2, 1]",
+            ),
+        ]
+    )
+    def test_results(self, input: str, expected: str):
+        self.assertEqual(expected, evaluate(input).inspect())
+        self.assertEqual(
+            expected, evaluate(input, TieredEvaluator(threshold=2)).inspect()
+        )
+
+    @parameterized.expand(
+        [
+            (
+                RANGE
+                + "pmap(range(0, 20, []), fn(x) { if (x > 5) { x + true } else { x } })",
+                "type mismatch: INTEGER + BOOLEAN",
+            ),
+            (
+                RANGE + "preduce(push(range(0, 20, []), true), 0, fn(a, b) { a + b })",
+                "type mismatch: INTEGER + BOOLEAN",
+            ),
+            (
+                "pmap([1, 2], fn(a, b) { a })",
+                "wrong number of arguments: want=2, got=1",
+            ),
+            ("pmap([1, 2], 3)", "not a function: INTEGER"),
+            ("pmap(1, fn(x) { x })", "argument to `pmap` must be ARRAY, got INTEGER"),
+            (
+                "preduce(true, 0, fn(a, b) { a })",
+                "argument to `preduce` must be ARRAY, got BOOLEAN",
+            ),
+        ]
+    )
+    def test_errors(self, input: str, expected: str):
+        evaluated = evaluate(input)
+        self.assertIsInstance(evaluated, Error)
+        assert isinstance(evaluated, Error)
+        self.assertEqual(expected, evaluated.message)
+
+    def test_detach_keeps_free_identifiers_only(self):
+        function = evaluate(
+            "let a = 1; let b = [2]; let f = fn(x) { let y = x; a + y }; f"
+        )
+        assert isinstance(function, Function)
+        detached = detach(function)
+        self.assertIs(function.body, detached.body)
+        self.assertEqual({"a"}, set(detached.env._store))
+
+    def test_detach_recursive_function_points_at_its_copy(self):
+        function = evaluate("let f = fn(n) { if (n < 1) { 0 } else { f(n - 1) } }; f")
+        assert isinstance(function, Function)
+        detached = detach(function)
+        self.assertIs(detached, detached.env.get("f"))
+
+    def test_unpicklable_closure_runs_serially(self):
+        parser = Parser(Lexer("pmap([1, 2, 3], fn(x) { g(x) })"))
+        program = parser.parse_program()
+        env = Environment()
+        env.set("g", Builtin("g", lambda value: Integer(value.value + 1)))
+        self.assertEqual("[2, 3, 4]", Evaluator().evaluate(program, env).inspect())
+
+        function = evaluate("fn(x) { g(x) }")
+        assert isinstance(function, Function)
+        function.env.set("g", Builtin("g", lambda value: value))
+        self.assertIsNone(_payload(Evaluator(), function, 10))
+
+    def test_deeply_nested_closure_runs_serially(self):
+        body = " + ".join(["x"] * 600)
+        function = evaluate(f"fn(x) {{ {body} }}")
+        self.assertIsNone(_payload(Evaluator(), function, 10))
+        # Bodies that still evaluate fail to pickle close to the same depth.
+        with mock.patch("pickle.dumps", side_effect=RecursionError):
+            self.assertEqual(
+                "[2, 3]", evaluate("pmap([1, 2], fn(x) { x + 1 })").inspect()
+            )
+
+    def test_limited_evaluator_runs_serially(self):
+        evaluator = LimitedEvaluator(Limits(fuel=1000))
+        self.assertIsNone(evaluator.worker_factory())
+        self.assertEqual(
+            "[2, 3, 4]",
+            evaluate("pmap([1, 2, 3], fn(x) { x + 1 })", evaluator).inspect(),
+        )
+        # The call to pmap and one call per element.
+        self.assertEqual(4, evaluator.steps)
+
+    def test_small_arrays_run_serially(self):
+        function = evaluate("fn(x) { x }")
+        previous = use_pool(WorkerPool(2, min_elements=100))
+        try:
+            self.assertIsNone(_payload(Evaluator(), function, 99))
+            self.assertIsNotNone(_payload(Evaluator(), function, 100))
+        finally:
+            use_pool(previous)
+
+    def test_nested_pmap_runs_serially_in_workers(self):
+        # Workers must not submit to the pool they were forked from.
+        self.assertEqual(
+            "[3, 3, 2, 2]",
+            evaluate(
+                "let inner = fn(x) { x * 2 };"
+                "pmap([[1, 2, 3], [4, 5, 6], [1, 2], [3, 4]],"
+                " fn(a) { len(pmap(a, inner)) })"
+            ).inspect(),
+        )
+
+    def test_empty_arrays_without_minimum(self):
+        previous = use_pool(WorkerPool(2, min_elements=0))
+        try:
+            self.assertEqual("[]", evaluate("pmap([], fn(x) { x })").inspect())
+            self.assertEqual(
+                "0", evaluate("preduce([], 0, fn(a, b) { a + b })").inspect()
+            )
+        finally:
+            use_pool(previous).shutdown()
@@ -1,4 +1,6 @@
+import gc
 import unittest
+import weakref
 from typing import cast
 
 from parameterized import parameterized
@@ -7,6 +9,7 @@ from monkeypie.ast import (
     LetStatement,
     StatementNode,
     ReturnStatement,
+    ImportStatement,
     ExpressionStatement,
     IdentifierExpression,
     IntegerLiteralExpression,
@@ -18,6 +21,9 @@ from monkeypie.ast import (
     IfExpression,
     FunctionLiteralExpression,
     CallExpression,
+    ArrayLiteralExpression,
+    IndexExpression,
+    HashLiteralExpression,
 )
 from monkeypie.lexer import Lexer
 from monkeypie.parser import Parser
@@ -143,6 +149,45 @@ class TestReturnStatements(ParserTestCase):
         self.assertTrue(self._test_literal_expression(return_value, expected_value))
 
 
+class TestImportStatements(ParserTestCase):
+    @parameterized.expand(
+        [
+            ('import "a.monkey";', "a.monkey"),
+            ('import "lib/b.monkey"', "lib/b.monkey"),
+            ('import "";', ""),
+        ]
+    )
+    def test_import_statements(self, input: str, expected_path: str):
+        program = self._test_execution(input, 1)
+        statement = program.statements[0]
+        self.assertIsInstance(statement, ImportStatement)
+        statement = cast(ImportStatement, statement)
+        self.assertEqual(expected_path, statement.path)
+        self.assertIsNone(statement.module)
+        self.assertEqual(f'import "{expected_path}";', str(statement))
+
+    def test_import_in_function_body(self):
+        program = self._test_execution('fn() { import "a.monkey"; f() }', 1)
+        self.assertEqual('fn() import "a.monkey";f()', str(program))
+
+    @parameterized.expand(
+        [
+            (
+                "import a;",
+                "1:8: expected next token to be TokenType.STRING, got TokenType.IDENT instead",
+            ),
+            (
+                'import "a',
+                "1:8: expected next token to be TokenType.STRING, got TokenType.ILLEGAL instead",
+            ),
+        ]
+    )
+    def test_errors(self, input: str, expected: str):
+        parser = Parser(Lexer(input))
+        parser.parse_program()
+        self.assertEqual(expected, parser.errors()[0])
+
+
 class TestIdentifierExpressions(ParserTestCase):
     def test_identifier_expressions(self):
         input = "foobar;"
@@ -249,6 +294,13 @@ class TestOperatorPrecedenceParsing(ParserTestCase):
                 "add(a, b, 1, (2 * 3), (4 + 5), add(6, (7 * 8)))",
             ),
             ("add(a + b + c * d / f + g)", "add((((a + b) + ((c * d) / f)) + g))"),
+            ("a * [1, 2, 3, 4][b * c] * d", "((a * ([1, 2, 3, 4][(b * c)])) * d)"),
+            (
+                "add(a * b[2], b[1], 2 * [1, 2][1])",
+                "add((a * (b[2])), (b[1]), (2 * ([1, 2][1])))",
+            ),
+            ("-a[0]", "(-(a[0]))"),
+            ("f(x)[0][1]", "((f(x)[0])[1])"),
         ]
     )
     def test_operator_precedence_parsing(self, input: str, expected: str):
@@ -373,3 +425,163 @@ class TestCallExpressionParsing(ParserTestCase):
         self.assertTrue(self._test_literal_expression(expression.arguments[0], 1))
         self.assertTrue(self._test_infix_expression(expression.arguments[1], 2, "*", 3))
         self.assertTrue(self._test_infix_expression(expression.arguments[2], 4, "+", 5))
+
+
+class TestCollectionParsing(ParserTestCase):
+    def _expression(self, input: str) -> ExpressionNode | None:
+        program = self._test_execution(input, 1)
+        return cast(ExpressionStatement, program.statements[0]).expression
+
+    def test_array_literal(self):
+        array = self._expression("[1, 2 * 2, 3 + 3]")
+        self.assertIsInstance(array, ArrayLiteralExpression)
+        array = cast(ArrayLiteralExpression, array)
+        self.assertEqual(3, len(array.elements))
+        self.assertTrue(self._test_integer_literal(array.elements[0], 1))
+        self.assertTrue(self._test_infix_expression(array.elements[1], 2, "*", 2))
+        self.assertTrue(self._test_infix_expression(array.elements[2], 3, "+", 3))
+
+    def test_empty_array_literal(self):
+        array = cast(ArrayLiteralExpression, self._expression("[]"))
+        self.assertEqual([], array.elements)
+
+    def test_index_expression(self):
+        expression = self._expression("myArray[1 + 1]")
+        self.assertIsInstance(expression, IndexExpression)
+        expression = cast(IndexExpression, expression)
+        self.assertTrue(self._test_identifier_literal(expression.left, "myArray"))
+        self.assertTrue(self._test_infix_expression(expression.index, 1, "+", 1))
+
+    @parameterized.expand(
+        [
+            ("{}", [], []),
+            ("{1: 2, 3: 4}", [1, 3], [2, 4]),
+            ("{true: 1, false: 2}", [True, False], [1, 2]),
+            ("{a: b, c: 5}", ["a", "c"], ["b", 5]),
+        ]
+    )
+    def test_hash_literal(self, input: str, keys: list, values: list):
+        expression = self._expression(input)
+        self.assertIsInstance(expression, HashLiteralExpression)
+        expression = cast(HashLiteralExpression, expression)
+        self.assertEqual(len(keys), len(expression.keys))
+        for key, expected in zip(expression.keys, keys):
+            self.assertTrue(self._test_literal_expression(key, expected))
+        for value, expected in zip(expression.values, values):
+            self.assertTrue(self._test_literal_expression(value, expected))
+
+    def test_hash_literal_with_expressions(self):
+        expression = cast(
+            HashLiteralExpression, self._expression("{1: 0 + 1, 2: 10 - 8, 3: 15 / 5}")
+        )
+        for value, (left, operator, right) in zip(
+            expression.values, [(0, "+", 1), (10, "-", 8), (15, "/", 5)]
+        ):
+            self.assertTrue(self._test_infix_expression(value, left, operator, right))
+        self.assertEqual("{1:(0 + 1), 2:(10 - 8), 3:(15 / 5)}", str(expression))
+
+    @parameterized.expand(
+        [
+            (
+                "{1 2}",
+                "1:4: expected next token to be TokenType.COLON, got TokenType.INT instead",
+            ),
+            (
+                "{1: 2 3: 4}",
+                "1:7: expected next token to be TokenType.COMMA, got TokenType.INT instead",
+            ),
+            (
+                "[1, 2",
+                "1:6: expected next token to be TokenType.RBRACKET, got TokenType.EOF instead",
+            ),
+            (
+                "a[1",
+                "1:4: expected next token to be TokenType.RBRACKET, got TokenType.EOF instead",
+            ),
+        ]
+    )
+    def test_errors(self, input: str, expected: str):
+        parser = Parser(Lexer(input))
+        parser.parse_program()
+        self.assertEqual(expected, parser.errors()[0])
+
+
+class TestSourceSpans(ParserTestCase):
+    @parameterized.expand(
+        [
+            ("let x = 1 + 2;", "1 + 2"),
+            ("a * (b + c)", "a * (b + c)"),
+            ("-add(1, 2) + 3", "-add(1, 2) + 3"),
+            ("if (x) { y } else { z }", "if (x) { y } else { z }"),
+            ("fn(a, b) { a + b; }(1, 2)", "fn(a, b) { a + b; }(1, 2)"),
+            ("[1, [2]][0]", "[1, [2]][0]"),
+            ("{1: [a], b: c}", "{1: [a], b: c}"),
+        ]
+    )
+    def test_expression_spans(self, input: str, expected: str):
+        program = self._test_execution(input, 1)
+        statement = program.statements[0]
+        expression = (
+            cast(LetStatement, statement).value
+            if isinstance(statement, LetStatement)
+            else cast(ExpressionStatement, statement).expression
+        )
+        assert expression is not None
+        self.assertEqual(expected, input[expression.start : expression.end])
+
+    def test_statement_spans(self):
+        input = "let x = 5;\n  return x;\nfn(y) { y }"
+        program = self._test_execution(input, 3)
+        self.assertEqual(
+            ["let x = 5;", "return x;", "fn(y) { y }"],
+            [input[s.start : s.end] for s in program.statements],
+        )
+
+    def test_error_positions(self):
+        parser = Parser(Lexer("let x = 5;\nlet = 10;\nlet y 7;"))
+        parser.parse_program()
+        self.assertEqual(
+            [
+                "2:5: expected next token to be TokenType.IDENT, got TokenType.ASSIGN instead",
+                "2:5: no prefix parse function found for = found",
+                "3:7: expected next token to be TokenType.ASSIGN, got TokenType.INT instead",
+            ],
+            parser.errors(),
+        )
+
+
+class TestIterStatements(ParserTestCase):
+    def test_statements_and_errors(self):
+        parser = Parser(Lexer("let x = 5;\nlet = 10;\nx + 1;"))
+        items = [
+            (str(s) if s is not None else None, errors)
+            for s, errors in parser.iter_statements()
+        ]
+        self.assertEqual(
+            [
+                ("let x = 5;", []),
+                (
+                    None,
+                    [
+                        "2:5: expected next token to be TokenType.IDENT, got TokenType.ASSIGN instead"
+                    ],
+                ),
+                ("", ["2:5: no prefix parse function found for = found"]),
+                ("10", []),
+                ("(x + 1)", []),
+            ],
+            items,
+        )
+        self.assertEqual([e for _, errors in items for e in errors], parser.errors())
+
+    def test_releases_consumed_statements(self):
+        parser = Parser(Lexer("let a = fn(x) { x }; let b = 2; let c = 3;"))
+        references = []
+        for statement, _ in parser.iter_statements():
+            references.append(weakref.ref(statement))
+            del statement
+            gc.collect()
+            self.assertEqual(
+                [None] * (len(references) - 1), [r() for r in references[:-1]]
+            )
+        self.assertEqual(3, len(references))
@@ -0,0 +1,191 @@
+import pickle
+import random
+import unittest
+
+from parameterized import parameterized
+
+from monkeypie.persistent import HashTrie, PersistentVector
+
+
+class CollidingKey:
+    """A key whose 32-bit hash is chosen by the test."""
+
+    def __init__(self, name: str, hash_: int):
+        self.name = name
+        self.hash = hash_
+
+    def __hash__(self) -> int:
+        return self.hash
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CollidingKey) and self.name == other.name
+
+    def __repr__(self) -> str:
+        return f"CollidingKey({self.name!r}, {self.hash})"
+
+
+class TestPersistentVector(unittest.TestCase):
+    @parameterized.expand([(0,), (1,), (32,), (33,), (1024,), (1057,), (33_000,)])
+    def test_append(self, n: int):
+        vector: PersistentVector[int] = PersistentVector()
+        for i in range(n):
+            vector = vector.append(i)
+        self.assertEqual(n, len(vector))
+        self.assertEqual(list(range(n)), list(vector))
+        self.assertEqual(list(range(n)), [vector[i] for i in range(n)])
+
+    @parameterized.expand([(0,), (1,), (32,), (33,), (1024,), (1057,), (33_000,)])
+    def test_from_iterable(self, n: int):
+        vector = PersistentVector.from_iterable(range(n))
+        self.assertEqual(list(range(n)), list(vector))
+        # Appending continues the trie built in bulk.
+        self.assertEqual(list(range(n + 40)), list(_extend(vector, range(n, n + 40))))
+
+    @parameterized.expand([(0,), (5,), (31,), (32,), (1000,), (1055,), (1056,)])
+    def test_iterate(self, start: int):
+        vector = PersistentVector.from_iterable(range(1056))
+        self.assertEqual(list(range(start, 1056)), list(vector.iterate(start)))
+
+    def test_old_versions_are_unchanged(self):
+        versions = [PersistentVector[int]()]
+        for i in range(2000):
+            versions.append(versions[-1].append(i))
+        for n, version in enumerate(versions):
+            self.assertEqual(list(range(n)), list(version))
+
+    @parameterized.expand([(0,), (31,), (32,), (1000,), (1055,)])
+    def test_set(self, index: int):
+        vector = PersistentVector.from_iterable(range(1056))
+        updated = vector.set(index, -1)
+        self.assertEqual(-1, updated[index])
+        self.assertEqual(index, vector[index])
+        expected = list(range(1056))
+        expected[index] = -1
+        self.assertEqual(expected, list(updated))
+
+    def test_set_shares_untouched_leaves(self):
+        vector = PersistentVector.from_iterable(range(1056))
+        updated = vector.set(0, -1)
+        self.assertIs(vector._leaf(32), updated._leaf(32))
+        self.assertIs(vector._leaf(1055), updated._leaf(1055))
+
+    @parameterized.expand([(-1,), (3,)])
+    def test_index_out_of_range(self, index: int):
+        vector = PersistentVector.from_iterable(range(3))
+        with self.assertRaises(IndexError):
+            vector[index]
+        with self.assertRaises(IndexError):
+            vector.set(index, 0)
+
+    def test_pickle(self):
+        vector = PersistentVector.from_iterable(range(1100))
+        self.assertEqual(list(vector), list(pickle.loads(pickle.dumps(vector))))
+
+
+def _extend(vector: PersistentVector[int], items: range) -> PersistentVector[int]:
+    for item in items:
+        vector = vector.append(item)
+    return vector
+
+
+class TestHashTrie(unittest.TestCase):
+    def test_set_and_get(self):
+        trie = HashTrie.from_items((i, i * i) for i in range(5000))
+        self.assertEqual(5000, len(trie))
+        for i in range(5000):
+            self.assertEqual(i * i, trie.get(i))
+        self.assertIsNone(trie.get(5000))
+        self.assertEqual("missing", trie.get(-1, "missing"))
+        self.assertEqual({i: i * i for i in range(5000)}, dict(trie.items()))
+
+    def test_replace(self):
+        trie = HashTrie.from_items([(1, "a"), (2, "b")])
+        replaced = trie.set(1, "c")
+        self.assertEqual(2, len(replaced))
+        self.assertEqual("c", replaced.get(1))
+        self.assertEqual("a", trie.get(1))
+
+    def test_set_same_value_returns_same_trie(self):
+        value = object()
+        trie = HashTrie().set("key", value)
+        self.assertIs(trie, trie.set("key", value))
+
+    def test_old_versions_are_unchanged(self):
+        versions = [HashTrie[int, int]()]
+        for i in range(300):
+            versions.append(versions[-1].set(i, i))
+        for n, version in enumerate(versions):
+            self.assertEqual(n, len(version))
+            self.assertEqual(set(range(n)), set(version))
+
+    def test_delete(self):
+        trie = HashTrie.from_items((i, str(i)) for i in range(2000))
+        for i in range(0, 2000, 2):
+            trie = trie.delete(i)
+        self.assertEqual(1000, len(trie))
+        self.assertEqual({i: str(i) for i in range(1, 2000, 2)}, dict(trie.items()))
+        self.assertNotIn(0, trie)
+        self.assertIn(1, trie)
+
+    def test_delete_missing_key_returns_same_trie(self):
+        trie = HashTrie.from_items([(1, 1)])
+        self.assertIs(trie, trie.delete(2))
+
+    def test_delete_everything(self):
+        trie = HashTrie.from_items((i, i) for i in range(100))
+        for i in range(100):
+            trie = trie.delete(i)
+        self.assertEqual(0, len(trie))
+        self.assertEqual([], list(trie))
+        self.assertEqual(1, trie.set(7, 1).get(7))
+
+    def test_collisions(self):
+        keys = [CollidingKey(name, 42) for name in "abcd"]
+        trie = HashTrie.from_items((key, key.name) for key in keys)
+        self.assertEqual(4, len(trie))
+        for key in keys:
+            self.assertEqual(key.name, trie.get(key))
+        self.assertIsNone(trie.get(CollidingKey("e", 42)))
+
+        other = CollidingKey("z", 42 + 32)
+        trie = trie.set(other, "z")
+        self.assertEqual("z", trie.get(other))
+        for key in keys:
+            self.assertEqual(key.name, trie.get(key))
+
+        for key in keys[:3]:
+            trie = trie.delete(key)
+        self.assertEqual({keys[3]: "d", other: "z"}, dict(trie.items()))
+
+    def test_collision_bucket_at_root(self):
+        a, b = CollidingKey("a", 7), CollidingKey("b", 7)
+        trie = HashTrie.from_items([(a, 1), (b, 2), (CollidingKey("c", 8), 3)])
+        trie = trie.delete(CollidingKey("c", 8))
+        self.assertEqual({a: 1, b: 2}, dict(trie.items()))
+        self.assertEqual(3, trie.set(CollidingKey("d", 9), 3).get(CollidingKey("d", 9)))
+
+    def test_matches_dict(self):
+        # Hashes from a small range, so that keys share hash prefixes and
+        # collide, checked against a dict after every update.
+        rng = random.Random(0)
+        trie: HashTrie[CollidingKey, int] = HashTrie()
+        expected: dict[CollidingKey, int] = {}
+        for step in range(3000):
+            name = rng.randrange(200)
+            key = CollidingKey(str(name), [1, 33, 1057, 2][name % 4])
+            if rng.random() < 0.3:
+                trie = trie.delete(key)
+                expected.pop(key, None)
+            else:
+                trie = trie.set(key, step)
+                expected[key] = step
+            self.assertEqual(len(expected), len(trie))
+        self.assertEqual(expected, dict(trie.items()))
+        for key in expected:
+            self.assertEqual(expected[key], trie.get(key))
+
+    def test_pickle(self):
+        trie = HashTrie.from_items((str(i), i) for i in range(500))
+        self.assertEqual(
+            dict(trie.items()), dict(pickle.loads(pickle.dumps(trie)).items())
+        )
@@ -0,0 +1,102 @@
+import gc
+import unittest
+import weakref
+
+from parameterized import parameterized
+
+from monkeypie.ast import StatementNode
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.object import NULL, Error, Integer, Object
+from monkeypie.parser import Parser
+from monkeypie.pipeline import run_pipelined
+
+SOURCE = """let add = fn(x, y) { x + y; };
+let a = 5;
+add(a, 1);
+let fib = fn(n) { if (n < 2) { return n; } fib(n - 1) + fib(n - 2) };
+fib(10);
+a * 2
+"""
+
+
+def run_whole(source: str) -> Object:
+    program = Parser(Lexer(source)).parse_program()
+    return Evaluator().evaluate(program, Environment())
+
+
+class TestPipeline(unittest.TestCase):
+    @parameterized.expand([("inline", False), ("threaded", True)])
+    def test_matches_parse_then_run(self, _name: str, threaded: bool):
+        outputs: list[str] = []
+        result = run_pipelined(
+            SOURCE, on_result=lambda o: outputs.append(o.inspect()), threaded=threaded
+        )
+        self.assertEqual([], result.errors)
+        self.assertEqual(run_whole(SOURCE).inspect(), result.value.inspect())
+        self.assertEqual(["6", "55", "10"], outputs)
+
+    @parameterized.expand([("inline", False), ("threaded", True)])
+    def test_stops_at_error(self, _name: str, threaded: bool):
+        outputs: list[str] = []
+        result = run_pipelined(
+            "1; 2 + true; 3;",
+            on_result=lambda o: outputs.append(o.inspect()),
+            threaded=threaded,
+        )
+        self.assertIsInstance(result.value, Error)
+        self.assertEqual(
+            "ERROR: type mismatch: INTEGER + BOOLEAN", result.value.inspect()
+        )
+        self.assertEqual(["1"], outputs)
+
+    @parameterized.expand([("inline", False), ("threaded", True)])
+    def test_stops_at_return(self, _name: str, threaded: bool):
+        result = run_pipelined("1; return 2; 3;", threaded=threaded)
+        self.assertIsInstance(result.value, Integer)
+        self.assertEqual("2", result.value.inspect())
+
+    @parameterized.expand([("inline", False), ("threaded", True)])
+    def test_stops_at_parse_error(self, _name: str, threaded: bool):
+        env = Environment()
+        result = run_pipelined("let a = 1; let = 2; let b = 3;", env, threaded=threaded)
+        self.assertIs(NULL, result.value)
+        self.assertEqual(
+            [
+                "1:16: expected next token to be TokenType.IDENT, got TokenType.ASSIGN"
+                " instead"
+            ],
+            result.errors,
+        )
+        self.assertIsNotNone(env.get("a"))
+        self.assertIsNone(env.get("b"))
+
+    def test_threaded_small_queue_stops_producer(self):
+        source = "1;\n" * 1000 + "1 / 0;\n" + "2;\n" * 1000
+        result = run_pipelined(source, threaded=True, queue_size=1)
+        self.assertEqual("ERROR: division by zero", result.value.inspect())
+
+    def test_threaded_propagates_parser_exceptions(self):
+        with self.assertRaises(RecursionError):
+            run_pipelined("(" * 100_000 + "1", threaded=True)
+
+    def test_releases_executed_statements(self):
+        refs: list[weakref.ref[StatementNode]] = []
+
+        def on_result(_: Object) -> None:
+            gc.collect()
+            self.assertTrue(all(ref() is None for ref in refs[:-1]))
+
+        original = Evaluator.evaluate_expression_statement
+
+        def evaluate_expression_statement(self, statement, env):
+            refs.append(weakref.ref(statement))
+            return original(self, statement, env)
+
+        Evaluator.evaluate_expression_statement = evaluate_expression_statement
+        try:
+            run_pipelined("1; 2; 3; 4;", on_result=on_result)
+        finally:
+            Evaluator.evaluate_expression_statement = original
+        self.assertEqual(4, len(refs))
@@ -0,0 +1,145 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+
+from monkeypie import prelude
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.modules import ModuleError
+from monkeypie.object import Function
+from monkeypie.parser import Parser
+
+
+def evaluate(input: str, env: Environment) -> str:
+    parser = Parser(Lexer(input))
+    program = parser.parse_program()
+    assert not parser.errors(), parser.errors()
+    return Evaluator().evaluate(program, Environment(env)).inspect()
+
+
+class TestPrelude(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ("map([1, 2, 3], fn(x) { x * 2 })", "[2, 4, 6]"),
+            ("map([], fn(x) { x })", "[]"),
+            ("filter(range(0, 10), fn(x) { x > 6 })", "[7, 8, 9]"),
+            ("reduce([1, 2, 3, 4], 1, fn(a, b) { a * b })", "24"),
+            ("sum(range(1, 11))", "55"),
+            ("range(3, 3)", "[]"),
+            ("reverse([1, 2, 3])", "[3, 2, 1]"),
+            ("reverse([])", "[]"),
+            ("max(3, 5) + min(3, 5)", "8"),
+            ("let reduce = 1; sum([1, 2])", "3"),
+            ("fold_range(0, 4, [], fn(xs, i) { push(xs, i * i) })", "[0, 1, 4, 9]"),
+            # Recursion grows with the logarithm of the length, not the length.
+            ("sum(range(0, 2000))", "1999000"),
+            ("len(range(-1000, 1000))", "2000"),
+            ("map(range(0, 2000), fn(x) { x * 2 })[1999]", "3998"),
+            ("len(filter(range(0, 2000), fn(x) { x > 1499 }))", "500"),
+            ("reduce(range(0, 2000), 0, fn(a, b) { max(a, b) })", "1999"),
+            ("reverse(range(0, 2000))[0]", "1999"),
+            ("fold_range(0, 2000, 0, fn(count, i) { count + 1 })", "2000"),
+        ]
+    )
+    def test_helpers(self, input: str, expected: str):
+        self.assertEqual(expected, evaluate(input, prelude.load()))
+        with mock.patch.dict(os.environ, {"MONKEYPIE_PRELUDE_SNAPSHOT_DISABLED": "1"}):
+            self.assertEqual(expected, evaluate(input, prelude.load()))
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.source = os.path.join(directory.name, "prelude.monkey")
+        self.snapshot = os.path.join(directory.name, "prelude.snapshot")
+        self.write_source("let twice = fn(x) { x * 2 }; let one = 1;")
+
+    def write_source(self, source: str) -> None:
+        with open(self.source, "w") as file:
+            file.write(source)
+
+    def test_round_trip(self):
+        prelude.build(self.source, self.snapshot)
+        bindings = prelude.read_snapshot(self.snapshot, self.source)
+        assert bindings is not None
+        self.assertEqual({"twice", "one"}, set(bindings))
+        twice = bindings["twice"]
+        assert isinstance(twice, Function)
+        # Functions keep closing over the other prelude bindings.
+        self.assertIs(twice, twice.env.get("twice"))
+        env = prelude.load(self.snapshot, self.source)
+        self.assertEqual("4", evaluate("twice(one + one)", env))
+
+    def test_missing_source_trusts_snapshot(self):
+        prelude.build(self.source, self.snapshot)
+        os.remove(self.source)
+        self.assertIsNotNone(prelude.read_snapshot(self.snapshot, self.source))
+
+    def test_stale_snapshot_is_ignored(self):
+        prelude.build(self.source, self.snapshot)
+        self.write_source("let twice = fn(x) { x + x + 1 };")
+        self.assertIsNone(prelude.read_snapshot(self.snapshot, self.source))
+        env = prelude.load(self.snapshot, self.source)
+        self.assertEqual("5", evaluate("twice(2)", env))
+
+    @parameterized.expand(
+        [
+            ("other format", lambda data: b"monkeypie prelude 0\n" + data[20:]),
+            ("truncated", lambda data: data[:-10]),
+            ("no header", lambda data: data[:24]),
+            ("empty", lambda data: b""),
+        ]
+    )
+    def test_unreadable_snapshot_is_ignored(self, _, corrupt):
+        prelude.build(self.source, self.snapshot)
+        with open(self.snapshot, "rb") as file:
+            data = file.read()
+        with open(self.snapshot, "wb") as file:
+            file.write(corrupt(data))
+        self.assertIsNone(prelude.read_snapshot(self.snapshot, self.source))
+        env = prelude.load(self.snapshot, self.source)
+        self.assertEqual("4", evaluate("twice(2)", env))
+
+    def test_corrupted_snapshot_is_ignored(self):
+        prelude.build(self.source, self.snapshot)
+        with open(self.snapshot, "rb") as file:
+            data = file.read()
+        header = len(b"monkeypie prelude 1\n") + 16
+        rng = random.Random(0)
+        for _ in range(300):
+            corrupted = bytearray(data)
+            for _ in range(rng.randrange(1, 4)):
+                corrupted[rng.randrange(header, len(data))] = rng.randrange(256)
+            with open(self.snapshot, "wb") as file:
+                file.write(corrupted)
+            # Whatever unpickles is used; nothing may raise.
+            prelude.read_snapshot(self.snapshot, self.source)
+
+    def test_disabled_snapshot(self):
+        prelude.build(self.source, self.snapshot)
+        with mock.patch.object(prelude, "read_snapshot") as read_snapshot:
+            with mock.patch.dict(
+                os.environ, {"MONKEYPIE_PRELUDE_SNAPSHOT_DISABLED": "1"}
+            ):
+                env = prelude.load(self.snapshot, self.source)
+        read_snapshot.assert_not_called()
+        self.assertEqual("4", evaluate("twice(2)", env))
+
+    @parameterized.expand(
+        [
+            ("let = 1;", "expected next token to be TokenType.IDENT"),
+            ("let x = 1 + true;", "type mismatch: INTEGER + BOOLEAN"),
+        ]
+    )
+    def test_broken_source(self, source: str, expected: str):
+        self.write_source(source)
+        with self.assertRaises(ModuleError) as raised:
+            prelude.build(self.source, self.snapshot)
+        self.assertIn(expected, str(raised.exception))
+        self.assertFalse(os.path.exists(self.snapshot))
@@ -0,0 +1,57 @@
+import unittest
+
+from monkeypie import prelude
+from monkeypie.environment import Environment
+from monkeypie.profiler import TOP_LEVEL, Profiler
+
+SOURCE = """let fib = fn(n) { if (n < 2) { return n; } fib(n - 1) + fib(n - 2) };
+let square = fn(x) { x * x };
+fib(16) + square(3) + fn(x) { x }(1);
+"""
+
+
+class TestProfiler(unittest.TestCase):
+    def test_counts_and_samples(self):
+        profiler = Profiler(SOURCE, interval=0.0005)
+        self.assertEqual("997", profiler.run().inspect())
+
+        functions = profiler.function_stats()
+        self.assertEqual(3193, functions["fib@1:11"][0])
+        self.assertEqual(1, functions["square@2:14"][0])
+        self.assertEqual(1, functions["<fn>@3:23"][0])
+        self.assertGreater(profiler.samples, 0)
+        self.assertGreater(functions["fib@1:11"][1], 0)
+
+        call_sites = profiler.call_site_stats()
+        self.assertEqual(1, call_sites["fib@3:1"][0])
+        self.assertEqual(1596, call_sites["fib@1:44"][0])
+        self.assertEqual(1596, call_sites["fib@1:57"][0])
+
+    def test_collapsed(self):
+        profiler = Profiler(SOURCE, interval=0.0005)
+        profiler.run()
+        lines = profiler.collapsed().splitlines()
+        self.assertTrue(lines)
+        total = 0
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            frames = stack.split(";")
+            self.assertEqual(TOP_LEVEL, frames[0])
+            self.assertTrue(all(f == "fib@1:11" for f in frames[1:]), frames)
+            total += int(count)
+        self.assertEqual(profiler.samples, total)
+
+    def test_parse_errors(self):
+        profiler = Profiler("let = 1;")
+        self.assertTrue(profiler.errors)
+        with self.assertRaises(ValueError):
+            profiler.run()
+
+    def test_functions_from_the_environment(self):
+        profiler = Profiler("sum(range(0, 50))", interval=0.0005)
+        self.assertEqual("1225", profiler.run(Environment(prelude.load())).inspect())
+        call_sites = profiler.call_site_stats()
+        self.assertEqual(1, call_sites["sum@1:1"][0])
+        self.assertEqual(1, call_sites["range@1:5"][0])
+        self.assertGreater(call_sites["<call>"][0], 0)
+        self.assertIn("<fn>", profiler.function_stats())
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from monkeypie.server import EvaluationServer, ProgramCache
+
+
+class TestProgramCache(unittest.TestCase):
+    def test_get(self):
+        cache = ProgramCache(max_size=2)
+        program, errors = cache.get("1 + 2")
+        self.assertEqual([], errors)
+        self.assertIs(program, cache.get("1 + 2")[0])
+        self.assertEqual(1, cache.hits)
+        _, errors = cache.get("let x 1;")
+        self.assertEqual(1, len(errors))
+        cache.get("3")
+        self.assertEqual(2, len(cache))
+        self.assertIsNot(program, cache.get("1 + 2")[0])
+
+    def test_programs_have_own_symbols(self):
+        cache = ProgramCache(max_size=1)
+        first, _ = cache.get("foo")
+        second, _ = cache.get("bar;")
+        assert first is not None and second is not None
+        assert first.symbols is not None and second.symbols is not None
+        self.assertIsNot(first.symbols, second.symbols)
+        # Names of evicted programs are not kept by the cache.
+        self.assertEqual(1, len(second.symbols))
+        self.assertEqual("foo", first.symbols.name(0))
+
+
+class TestEvaluationServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = EvaluationServer(workers=2)
+        self.listener = await self.server.start("127.0.0.1", 0)
+        self.port = self.listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.listener.close()
+        await self.listener.wait_closed()
+        self.server.close()
+
+    async def request(self, reader, writer, line: bytes) -> dict:
+        writer.write(line + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    async def test_connections_have_own_environments(self):
+        first = await asyncio.open_connection("127.0.0.1", self.port)
+        second = await asyncio.open_connection("127.0.0.1", self.port)
+        try:
+            self.assertEqual(
+                {"id": 1, "result": "null", "type": "NULL"},
+                await self.request(*first, b'{"id": 1, "source": "let a = 5;"}'),
+            )
+            self.assertEqual(
+                {"id": 2, "result": "10", "type": "INTEGER"},
+                await self.request(*first, b'{"id": 2, "source": "a * 2"}'),
+            )
+            self.assertEqual(
+                {"id": 3, "result": "ERROR: identifier not found: a", "type": "ERROR"},
+                await self.request(*second, b'{"id": 3, "source": "a * 2"}'),
+            )
+        finally:
+            for _, writer in (first, second):
+                writer.close()
+        self.assertEqual(1, self.server.cache.hits)
+
+    async def test_errors(self):
+        connection = await asyncio.open_connection("127.0.0.1", self.port)
+        try:
+            self.assertEqual(
+                {
+                    "id": 1,
+                    "errors": [
+                        "1:7: expected next token to be TokenType.ASSIGN,"
+                        " got TokenType.INT instead"
+                    ],
+                },
+                await self.request(*connection, b'{"id": 1, "source": "let x 1;"}'),
+            )
+            response = await self.request(*connection, b"not json")
+            self.assertIsNone(response["id"])
+            self.assertTrue(response["error"].startswith("invalid request: "))
+            response = await self.request(*connection, b'{"id": 2}')
+            self.assertEqual("invalid request: 'source'", response["error"])
+        finally:
+            connection[1].close()
+
+    async def test_recursion_errors(self):
+        connection = await asyncio.open_connection("127.0.0.1", self.port)
+        try:
+            for source in (
+                "(" * 3000 + "1" + ")" * 3000,
+                "let f = fn(n) { f(n + 1) }; f(0)",
+            ):
+                line = json.dumps({"id": 1, "source": source}).encode()
+                self.assertEqual(
+                    {"id": 1, "error": "maximum recursion depth exceeded"},
+                    await self.request(*connection, line),
+                )
+            # The connection keeps serving requests.
+            response = await self.request(*connection, b'{"source": "1 + 1"}')
+            self.assertEqual("2", response["result"])
+        finally:
+            connection[1].close()
+
+    async def test_concurrent_clients(self):
+        async def client(n: int) -> list[str]:
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+            try:
+                results = []
+                for i in range(5):
+                    source = f"let x = {n}; x + {i}"
+                    line = json.dumps({"id": i, "source": source}).encode()
+                    results.append((await self.request(reader, writer, line))["result"])
+                return results
+            finally:
+                writer.close()
+
+        results = await asyncio.gather(*(client(n) for n in range(10)))
+        self.assertEqual([[str(n + i) for i in range(5)] for n in range(10)], results)
+
+    @unittest.skipUnless(hasattr(asyncio, "start_unix_server"), "no Unix sockets")
+    async def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "monkeypie.sock")
+            listener = await self.server.start(path=path)
+            try:
+                connection = await asyncio.open_unix_connection(path)
+                response = await self.request(*connection, b'{"source": "1 + 1"}')
+                self.assertEqual("2", response["result"])
+                connection[1].close()
+            finally:
+                listener.close()
+                await listener.wait_closed()
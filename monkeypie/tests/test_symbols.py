@@ -0,0 +1,73 @@
+import unittest
+from typing import cast
+
+from monkeypie.ast import (
+    CallExpression,
+    ExpressionStatement,
+    FunctionLiteralExpression,
+    IdentifierExpression,
+    LetStatement,
+)
+from monkeypie.lexer import Lexer
+from monkeypie.parser import Parser
+from monkeypie.symbols import SymbolTable
+from monkeypie.token import TokenKind
+
+
+class TestSymbolTable(unittest.TestCase):
+    def test_intern(self):
+        symbols = SymbolTable()
+        first = "".join(["fo", "o"])
+        second = "".join(["f", "oo"])
+        self.assertIsNot(first, second)
+        self.assertEqual(("foo", 0), symbols.intern(first))
+        self.assertEqual(("bar", 1), symbols.intern("bar"))
+        name, symbol = symbols.intern(second)
+        self.assertIs(first, name)
+        self.assertEqual(0, symbol)
+        self.assertEqual("bar", symbols.name(1))
+        self.assertEqual(2, len(symbols))
+
+
+class TestIdentifierSymbols(unittest.TestCase):
+    def test_lexer_interns_identifiers(self):
+        lexer = Lexer("let x = fn(y) { x + y + x }; let z = x;")
+        identifiers = []
+        while (token := lexer.next_token()).kind != TokenKind.EOF:
+            if token.kind == TokenKind.IDENT:
+                identifiers.append(token)
+            else:
+                self.assertEqual(-1, token.symbol)
+        self.assertEqual(
+            ["x", "y", "x", "y", "x", "z", "x"], [t.literal for t in identifiers]
+        )
+        self.assertEqual([0, 1, 0, 1, 0, 2, 0], [t.symbol for t in identifiers])
+        self.assertIs(identifiers[0].literal, identifiers[6].literal)
+        self.assertEqual(3, len(lexer.symbols))
+
+    def test_symbols_shared_across_lexers(self):
+        symbols = SymbolTable()
+        first = Lexer("alpha beta", symbols=symbols).next_token()
+        second = Lexer("beta alpha", symbols=symbols).next_token()
+        self.assertEqual((0, 1), (first.symbol, second.symbol))
+
+    def test_identifier_expressions_carry_symbols(self):
+        program = Parser(Lexer("let add = fn(a, b) { a }; add(b, a);")).parse_program()
+        assert program is not None
+        assert program.symbols is not None
+        let = cast(LetStatement, program.statements[0])
+        function = cast(FunctionLiteralExpression, let.value)
+        call = cast(
+            CallExpression, cast(ExpressionStatement, program.statements[1]).expression
+        )
+        identifiers = [
+            let.name,
+            *function.parameters,
+            cast(IdentifierExpression, call.function),
+            *cast(list[IdentifierExpression], call.arguments),
+        ]
+        self.assertEqual(
+            ["add", "a", "b", "add", "b", "a"],
+            [program.symbols.name(i.symbol) for i in identifiers],
+        )
+        self.assertEqual([0, 1, 2, 0, 2, 1], [i.symbol for i in identifiers])
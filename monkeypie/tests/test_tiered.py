@@ -0,0 +1,135 @@
+import unittest
+
+from parameterized import parameterized
+
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.lexer import Lexer
+from monkeypie.object import Object
+from monkeypie.parser import Parser
+from monkeypie.tiered import MAX_DEOPTIMIZATIONS, TieredEvaluator, TierEvent
+
+FIB = "let fib = fn(n) { if (n < 2) { return n; } fib(n - 1) + fib(n - 2) };"
+
+
+def evaluate(source: str, evaluator: Evaluator) -> Object:
+    parser = Parser(Lexer(source))
+    program = parser.parse_program()
+    assert not parser.errors()
+    return evaluator.evaluate(program, Environment())
+
+
+class TestTieredEvaluator(unittest.TestCase):
+    @parameterized.expand(
+        [
+            (FIB + "fib(15)",),
+            (FIB + "fib(true)",),
+            ("let f = fn(x) { x + 1 }; f(1) + f(2) + f(true)",),
+            ("let f = fn(x) { -x }; f(1); f(true)",),
+            (
+                "let f = fn(x) { !x }; f(0) == f(true) == f(false) == f(if (false) { 1 })",
+            ),
+            ("let f = fn(x) { !x }; f(1); f(false)",),
+            ("let f = fn(a, b) { a / b }; f(-7, 2) + f(7, -2) + f(-7, -2)",),
+            ("let f = fn(a, b) { a / b }; f(1, 1); f(1, 0)",),
+            ("let f = fn(a) { a / 0 }; f(1)",),
+            ("let f = fn(a, b) { a == b }; f(1, 1); f(1, true)",),
+            ("let f = fn(a, b) { a == b }; f(true, true); f(1, 1); f(f, f)",),
+            ("let f = fn(a, b) { a != b }; f(if (false) { 1 }, if (false) { 2 })",),
+            ("let f = fn(a) { a == 1 }; f(1); f(true)",),
+            ("let f = fn(a) { a != true }; f(1); f(true); f(false)",),
+            ("let f = fn(a) { 1 == true }; f(1)",),
+            ("let f = fn(a) { a < 2 }; f(1); f(3); f(true)",),
+            ("let f = fn(a) { a + b }; f(1)",),
+            ("let b = 5; let f = fn(a) { a + b }; f(1)",),
+            ("let f = fn(x) { x(1) }; f(5)",),
+            ("let f = fn(x) { x }; let g = fn() { f() }; g()",),
+            ("let f = fn(x) { if (x) { 1 } else { 2 } }; f(0) + f(false)",),
+            ("let f = fn(x) { if (x) { 1 } }; f(false)",),
+            (
+                "let f = fn(x) { if (x > 1) { if (x > 2) { return 3; } 2 } else { 1 } }; f(3) + f(2) + f(1)",
+            ),
+            ("let f = fn(x) { return x; 2 }; f(1)",),
+            ("let f = fn(x) { let y = x * 2; let y = y + 1; y }; f(1) + f(2)",),
+            ("let f = fn(x) { let x = true; x }; f(1)",),
+            (
+                "let y = 10; let f = fn(c) { if (c) { let y = 1; } y }; f(true) + f(false)",
+            ),
+            ("let f = fn(c) { if (c) { let z = 1; } z }; f(true); f(false)",),
+            ("let f = fn(x) { if (x) { let x = 5; } x }; f(true); f(false)",),
+            ("let f = fn(x) { y + 1; let y = 2; y }; f(1)",),
+            ("let f = fn(x) { x + 1 }; let g = fn(x) { f(x) + f(true) }; g(1)",),
+            ("let f = fn(x) { x }; let g = fn(x) { f(x, x) }; g(1)",),
+            ("let add = fn(x) { fn(y) { x + y } }; add(1)(2) + add(3)(4)",),
+            (
+                "let apply = fn(f, x) { f(x) }; apply(fn(x) { x * 2 }, 3) + apply(fn(x) { x }, true)",
+            ),
+            ("let f = fn() { }; f()",),
+            ("let f = fn(x) { let y = x; }; f(1)",),
+        ]
+    )
+    def test_matches_interpreter(self, source: str):
+        expected = evaluate(source, Evaluator()).inspect()
+        for threshold in (1, 2, 3):
+            with self.subTest(threshold=threshold):
+                actual = evaluate(source, TieredEvaluator(threshold)).inspect()
+                self.assertEqual(expected, actual)
+
+    def test_promotion(self):
+        events: list[TierEvent] = []
+        result = evaluate(FIB + "fib(10)", TieredEvaluator(10, events.append))
+        self.assertEqual("55", result.inspect())
+        self.assertEqual(1, len(events))
+        (event,) = events
+        self.assertEqual("promote", event.kind)
+        self.assertEqual(("n",), event.parameters)
+        self.assertEqual(10, event.calls)
+        self.assertEqual("promote fn(n) at offset 16 after 10 calls", str(event))
+        assert event.source is not None
+        self.assertIn("if type(v_n) is not int:", event.source)
+
+    def test_deoptimization(self):
+        events: list[TierEvent] = []
+        evaluator = TieredEvaluator(2, events.append)
+        result = evaluate(
+            "let f = fn(x) { if (x) { 1 } else { 0 } };"
+            "f(1) + f(2) + f(true) + f(false) + f(3) + f(4)",
+            evaluator,
+        )
+        self.assertEqual("5", result.inspect())
+        self.assertEqual(
+            [
+                ("promote", None),
+                ("deoptimize", "argument x changed type"),
+                ("promote", None),
+            ],
+            [(event.kind, event.reason) for event in events],
+        )
+        # Once the profile has seen a boolean, the argument is no longer
+        # specialized.
+        assert events[2].source is not None
+        self.assertNotIn("if type(v_x)", events[2].source)
+
+    def test_gives_up_after_repeated_deoptimization(self):
+        events: list[TierEvent] = []
+        evaluator = TieredEvaluator(1, events.append)
+        parser = Parser(Lexer("let f = fn(x) { x / 0 }; f(1)"))
+        program = parser.parse_program()
+        for _ in range(MAX_DEOPTIMIZATIONS + 2):
+            result = evaluator.evaluate(program, Environment())
+            self.assertEqual("ERROR: division by zero", result.inspect())
+        self.assertEqual(
+            ["promote", "deoptimize"] * MAX_DEOPTIMIZATIONS,
+            [event.kind for event in events],
+        )
+        self.assertEqual("division by zero at offset 16", events[1].reason)
+
+    def test_rejects_function_literals(self):
+        events: list[TierEvent] = []
+        evaluate(
+            "let f = fn() { fn() { 1 } }; f(); f()", TieredEvaluator(1, events.append)
+        )
+        self.assertEqual(
+            ["reject fn() at offset 13 after 1 calls: FunctionLiteralExpression"],
+            [str(event) for event in events],
+        )
@@ -0,0 +1,517 @@
+"""Tiered execution: hot Monkey functions are compiled to Python.
+
+Every function literal starts out in the tree-walking interpreter, which
+counts its calls and records the types of its arguments. Once a function has
+been called TieredEvaluator.threshold times, its body is translated into the
+source of a Python function specialized for the argument types seen so far,
+and later calls run that instead. Integers and booleans are passed around
+unboxed between compiled functions.
+
+Compiled code only implements the common case. Whenever one of its guards
+fails, say because an argument or a free variable has a type the code was
+not specialized for, or because an operation would produce a Monkey error,
+it raises Deoptimize. The call is then run again in the interpreter, which
+Monkey's lack of side effects makes safe, and the function goes back to the
+interpreter to be profiled and compiled anew.
+"""
+
+from functools import partial
+from typing import Any, Callable
+
+from monkeypie.ast import (
+    BlockStatement,
+    BooleanLiteralExpression,
+    CallExpression,
+    ExpressionNode,
+    ExpressionStatement,
+    IdentifierExpression,
+    IfExpression,
+    InfixExpression,
+    IntegerLiteralExpression,
+    LetStatement,
+    Node,
+    PrefixExpression,
+    ReturnStatement,
+    StatementNode,
+)
+from monkeypie.builtins import BUILTINS
+from monkeypie.evaluator import Evaluator, divide
+from monkeypie.object import (
+    FALSE,
+    NULL,
+    TRUE,
+    Boolean,
+    Error,
+    Function,
+    Integer,
+    Object,
+)
+
+# A function that deoptimizes this many times stays in the interpreter.
+MAX_DEOPTIMIZATIONS = 4
+
+StaticType = type | None
+CompiledFn = Callable[..., Any]
+
+
+class Deoptimize(Exception):
+    """Raised by compiled code when one of its guards fails."""
+
+
+class Unsupported(Exception):
+    """Raised when a function body cannot be compiled."""
+
+
+def box(value: Any) -> Object:
+    if value is True:
+        return TRUE
+    if value is False:
+        return FALSE
+    if type(value) is int:
+        return Integer(value)
+    return value
+
+
+def unbox(value: Object) -> Any:
+    cls = value.__class__
+    if cls is Integer or cls is Boolean:
+        return value.value  # type: ignore[attr-defined]
+    return value
+
+
+class TierEvent:
+    """A function changing tiers, as reported to TieredEvaluator.on_event.
+
+    kind is "promote" when a function is compiled, with source holding the
+    generated Python, "deoptimize" when compiled code fails a guard and
+    "reject" when a function body cannot be compiled. offset is that of the
+    function body in the source.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        parameters: tuple[str, ...],
+        offset: int,
+        calls: int,
+        reason: str | None = None,
+        source: str | None = None,
+    ):
+        self.kind = kind
+        self.parameters = parameters
+        self.offset = offset
+        self.calls = calls
+        self.reason = reason
+        self.source = source
+
+    def __str__(self) -> str:
+        out = f"{self.kind} fn({', '.join(self.parameters)}) at offset {self.offset}"
+        out += f" after {self.calls} calls"
+        return out if self.reason is None else f"{out}: {self.reason}"
+
+
+class FunctionTier:
+    """Profile and compiled code of a function literal, shared by its closures."""
+
+    __slots__ = (
+        "body",
+        "parameters",
+        "calls",
+        "observed",
+        "compiled",
+        "deoptimizations",
+        "compilable",
+    )
+
+    def __init__(self, function: Function):
+        self.body = function.body
+        self.parameters = tuple(parameter.value for parameter in function.parameters)
+        self.calls = 0
+        self.observed: set[tuple[type, ...]] = set()
+        self.compiled: CompiledFn | None = None
+        self.deoptimizations = 0
+        self.compilable = True
+
+    def specialization(self) -> tuple[StaticType, ...]:
+        """The Python type of each argument, or None where it has varied."""
+        types: list[StaticType] = []
+        for i in range(len(self.parameters)):
+            seen = {observed[i] for observed in self.observed}
+            if seen == {Integer}:
+                types.append(int)
+            elif seen == {Boolean}:
+                types.append(bool)
+            else:
+                types.append(None)
+        return tuple(types)
+
+
+class _Compiler:
+    """Translates a function body into the source of a Python function.
+
+    Monkey variables become Python locals prefixed with "v_" and
+    intermediate values temporaries named "t" and a number; neither can clash
+    with the helpers the source refers to, which all start with "_". Each
+    expression is compiled to a Python operand along with its static type, int
+    or bool where it is known and None otherwise, and the checks a value of
+    unknown type needs are emitted as guards.
+    """
+
+    def __init__(self, parameters: tuple[str, ...], types: tuple[StaticType, ...]):
+        self.parameters = parameters
+        self.parameter_types = types
+        self.lines: list[str] = []
+        self.indent = 1
+        self.temporaries = 0
+        self.types: dict[str, StaticType] = dict(zip(parameters, types))
+        self.free: list[str] = []
+        self.branch_lets: set[str] = set()
+
+    def compile(self, body: BlockStatement) -> str:
+        # A let in a branch leaves its name unbound on the other path, where
+        # it refers to the enclosing environments instead. Such names start
+        # out with their value there, if any, and are never given a static
+        # type.
+        self.branch_lets = _branch_lets(body)
+        for name in self.branch_lets:
+            if name in self.types:
+                self.types[name] = None
+            else:
+                self.free.append(name)
+        value, _ = self.block(body, nested=False)
+        self.emit(f"return {value}")
+        header = [
+            f"def _compiled(_env, {', '.join(self.variable(p) for p in self.parameters)}):"
+        ]
+        for name, static_type in zip(self.parameters, self.parameter_types):
+            if static_type is not None:
+                header.append(
+                    f"    if type({self.variable(name)}) is not {static_type.__name__}:"
+                )
+                header.append(
+                    f"        raise _Deoptimize('argument {name} changed type')"
+                )
+        for name in self.free:
+            header.append(f"    {self.variable(name)} = _lookup(_env, {name!r})")
+        return "\n".join(header + self.lines) + "\n"
+
+    def emit(self, line: str) -> None:
+        self.lines.append("    " * self.indent + line)
+
+    def temporary(self) -> str:
+        self.temporaries += 1
+        return f"t{self.temporaries}"
+
+    @staticmethod
+    def variable(name: str) -> str:
+        return f"v_{name}"
+
+    def guard(self, operand: str, static_type: StaticType, offset: int) -> None:
+        if static_type is not int:
+            self.emit(f"if type({operand}) is not int:")
+            self.emit(f"    raise _Deoptimize('not an integer at offset {offset}')")
+
+    def block(
+        self, block: BlockStatement, nested: bool = True
+    ) -> tuple[str, StaticType]:
+        value, static_type = "_NULL", None
+        for statement in block.statements:
+            value, static_type = self.statement(statement, nested)
+        return value, static_type
+
+    def statement(
+        self, statement: StatementNode, nested: bool
+    ) -> tuple[str, StaticType]:
+        if isinstance(statement, ExpressionStatement):
+            if statement.expression is None:
+                return "_NULL", None
+            return self.expression(statement.expression)
+        if isinstance(statement, ReturnStatement):
+            if statement.return_value is None:
+                self.emit("return _NULL")
+            else:
+                value, _ = self.expression(statement.return_value)
+                self.emit(f"return {value}")
+            return "_NULL", None
+        if isinstance(statement, LetStatement):
+            if statement.value is None:
+                raise Unsupported("let without a value")
+            value, static_type = self.expression(statement.value)
+            name = statement.name.value
+            self.emit(f"{self.variable(name)} = {value}")
+            if name not in self.branch_lets:
+                self.types[name] = static_type
+            elif not nested:
+                self.types[name] = None
+            return "_NULL", None
+        raise Unsupported(f"{type(statement).__name__}")
+
+    def expression(self, node: ExpressionNode) -> tuple[str, StaticType]:
+        if isinstance(node, IntegerLiteralExpression):
+            return str(node.value), int
+        if isinstance(node, BooleanLiteralExpression):
+            return str(node.value), bool
+        if isinstance(node, IdentifierExpression):
+            return self.identifier(node)
+        if isinstance(node, PrefixExpression):
+            return self.prefix(node)
+        if isinstance(node, InfixExpression):
+            return self.infix(node)
+        if isinstance(node, IfExpression):
+            return self.if_expression(node)
+        if isinstance(node, CallExpression):
+            return self.call(node)
+        raise Unsupported(f"{type(node).__name__}")
+
+    def identifier(self, node: IdentifierExpression) -> tuple[str, StaticType]:
+        name = node.value
+        if name in self.types:
+            return self.variable(name), self.types[name]
+        # A free variable, looked up once per call: nothing can rebind the
+        # enclosing environments while the call runs.
+        if name not in self.free:
+            self.free.append(name)
+        operand = self.variable(name)
+        self.emit(f"if {operand} is None:")
+        self.emit(f"    raise _Deoptimize('identifier not found: {name}')")
+        return operand, None
+
+    def prefix(self, node: PrefixExpression) -> tuple[str, StaticType]:
+        if node.right is None:
+            raise Unsupported("prefix without an operand")
+        right, right_type = self.expression(node.right)
+        result = self.temporary()
+        if node.operator == "-":
+            self.guard(right, right_type, node.start)
+            self.emit(f"{result} = -{right}")
+            return result, int
+        if node.operator == "!":
+            if right_type is int:
+                self.emit(f"{result} = False")
+            elif right_type is bool:
+                self.emit(f"{result} = not {right}")
+            else:
+                self.emit(f"{result} = {right} is False or {right} is _NULL")
+            return result, bool
+        raise Unsupported(f"prefix operator {node.operator}")
+
+    def infix(self, node: InfixExpression) -> tuple[str, StaticType]:
+        if node.left is None or node.right is None:
+            raise Unsupported("infix without an operand")
+        left, left_type = self.expression(node.left)
+        right, right_type = self.expression(node.right)
+        result = self.temporary()
+        operator = node.operator
+        if operator in ("==", "!="):
+            # Integers compare by value and everything else by identity.
+            negate = "not " if operator == "!=" else ""
+            if left_type is not None and left_type is right_type:
+                self.emit(f"{result} = {left} {operator} {right}")
+            elif left_type is not None and right_type is not None:
+                self.emit(f"{result} = {operator == '!='}")
+            elif left_type is int or right_type is int:
+                unknown, known = (right, left) if left_type is int else (left, right)
+                self.emit(
+                    f"{result} = {negate}(type({unknown}) is int and {unknown} == {known})"
+                )
+            elif left_type is bool or right_type is bool:
+                self.emit(f"{result} = {negate}({left} is {right})")
+            else:
+                self.emit(
+                    f"{result} = {negate}({left} == {right} if type({left}) is int"
+                    f" and type({right}) is int else {left} is {right})"
+                )
+            return result, bool
+        if operator not in ("+", "-", "*", "/", "<", ">"):
+            raise Unsupported(f"infix operator {operator}")
+        self.guard(left, left_type, node.start)
+        self.guard(right, right_type, node.start)
+        if operator == "/":
+            if right == "0" or not right.isdigit():
+                self.emit(f"if {right} == 0:")
+                self.emit(
+                    f"    raise _Deoptimize('division by zero at offset {node.start}')"
+                )
+            self.emit(f"{result} = _divide({left}, {right})")
+            return result, int
+        self.emit(f"{result} = {left} {operator} {right}")
+        return result, int if operator in ("+", "-", "*") else bool
+
+    def if_expression(self, node: IfExpression) -> tuple[str, StaticType]:
+        if node.condition is None:
+            raise Unsupported("if without a condition")
+        condition, condition_type = self.expression(node.condition)
+        result = self.temporary()
+        if condition_type is bool:
+            self.emit(f"if {condition}:")
+        elif condition_type is int:
+            self.emit("if True:")
+        else:
+            self.emit(f"if {condition} is not False and {condition} is not _NULL:")
+        self.indent += 1
+        value, consequence_type = self.block(node.consequence)
+        self.emit(f"{result} = {value}")
+        self.indent -= 1
+        self.emit("else:")
+        self.indent += 1
+        if node.alternative is None:
+            value, alternative_type = "_NULL", None
+        else:
+            value, alternative_type = self.block(node.alternative)
+        self.emit(f"{result} = {value}")
+        self.indent -= 1
+        return (
+            result,
+            consequence_type if consequence_type is alternative_type else None,
+        )
+
+    def call(self, node: CallExpression) -> tuple[str, StaticType]:
+        if node.function is None:
+            raise Unsupported("call without a function")
+        operands = [self.expression(node.function)[0]]
+        operands.extend(self.expression(argument)[0] for argument in node.arguments)
+        result = self.temporary()
+        self.emit(f"{result} = _call({', '.join(operands)})")
+        self.emit(f"if {result}.__class__ is _Error:")
+        self.emit(f"    return {result}")
+        return result, None
+
+
+def _branch_lets(body: BlockStatement) -> set[str]:
+    names: set[str] = set()
+    stack: list[tuple[object, bool]] = [(body, False)]
+    while stack:
+        item, nested = stack.pop()
+        if isinstance(item, list):
+            stack.extend((element, nested) for element in item)
+        elif isinstance(item, Node):
+            if nested and isinstance(item, LetStatement):
+                names.add(item.name.value)
+            nested = nested or (isinstance(item, BlockStatement) and item is not body)
+            stack.extend((value, nested) for value in vars(item).values())
+    return names
+
+
+def compile_function(
+    parameters: tuple[str, ...], body: BlockStatement, types: tuple[StaticType, ...]
+) -> str:
+    """Python source of a function running body, specialized for types.
+
+    The function is named _compiled and takes the environment the Monkey
+    function closes over followed by its unboxed arguments. Raises
+    Unsupported if the body uses a construct the compiler does not handle.
+    """
+    return _Compiler(parameters, types).compile(body)
+
+
+class TieredEvaluator(Evaluator):
+    """Evaluator that compiles functions once they have been called enough.
+
+    on_event, if given, is called with a TierEvent whenever a function is
+    promoted to compiled code, deoptimized or found not to be compilable.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 50,
+        on_event: Callable[[TierEvent], None] | None = None,
+        inline_caches: bool = True,
+    ):
+        super().__init__(inline_caches)
+        self.threshold = threshold
+        self.on_event = on_event
+        # Keyed by the id of the function body; each tier keeps its body
+        # alive, so an id is never reused while it is in the table.
+        self.tiers: dict[int, FunctionTier] = {}
+        self._namespace: dict[str, Any] = {
+            "_call": self._call_compiled,
+            "_lookup": self._lookup,
+            "_divide": divide,
+            "_Deoptimize": Deoptimize,
+            "_Error": Error,
+            "_NULL": NULL,
+        }
+
+    def worker_factory(self) -> Callable[[], Evaluator]:
+        # Workers compile what is hot for them; events stay in this process.
+        return partial(TieredEvaluator, self.threshold, None, self.inline_caches)
+
+    def _event(self, kind: str, tier: FunctionTier, **details: str) -> None:
+        if self.on_event is not None:
+            self.on_event(
+                TierEvent(kind, tier.parameters, tier.body.start, tier.calls, **details)
+            )
+
+    @staticmethod
+    def _lookup(env: Any, name: str) -> Any:
+        value = env.get(name)
+        if value is None:
+            return BUILTINS.get(name)
+        return unbox(value)
+
+    def _promote(self, tier: FunctionTier) -> None:
+        try:
+            source = compile_function(tier.parameters, tier.body, tier.specialization())
+        except Unsupported as exc:
+            tier.compilable = False
+            self._event("reject", tier, reason=str(exc))
+            return
+        namespace = dict(self._namespace)
+        exec(
+            compile(source, f"<monkey fn at offset {tier.body.start}>", "exec"),
+            namespace,
+        )
+        tier.compiled = namespace["_compiled"]
+        self._event("promote", tier, source=source)
+
+    def _deoptimize(self, tier: FunctionTier, exc: Deoptimize) -> None:
+        tier.compiled = None
+        tier.calls = 0
+        tier.deoptimizations += 1
+        if tier.deoptimizations >= MAX_DEOPTIMIZATIONS:
+            tier.compilable = False
+        self._event("deoptimize", tier, reason=str(exc))
+
+    def _call_compiled(self, function: Any, *arguments: Any) -> Any:
+        # Calls made by compiled code, with unboxed arguments and result.
+        if function.__class__ is Function:
+            tier = self.tiers.get(id(function.body))
+            if (
+                tier is not None
+                and tier.compiled is not None
+                and len(arguments) == len(tier.parameters)
+            ):
+                try:
+                    return tier.compiled(function.env, *arguments)
+                except Deoptimize as exc:
+                    self._deoptimize(tier, exc)
+        return unbox(
+            self.apply_function(
+                box(function), [box(argument) for argument in arguments]
+            )
+        )
+
+    def apply_function(
+        self,
+        function: Object,
+        arguments: list[Object],
+        call: CallExpression | None = None,
+    ) -> Object:
+        if isinstance(function, Function):
+            tier = self.tiers.get(id(function.body))
+            if tier is None:
+                tier = self.tiers[id(function.body)] = FunctionTier(function)
+            if tier.compiled is not None and len(arguments) == len(tier.parameters):
+                try:
+                    return box(tier.compiled(function.env, *map(unbox, arguments)))
+                except Deoptimize as exc:
+                    self._deoptimize(tier, exc)
+            # Profiled after any deoptimization, so that the arguments that
+            # caused it are part of the next specialization.
+            if tier.compiled is None and tier.compilable:
+                tier.calls += 1
+                if len(arguments) == len(tier.parameters):
+                    tier.observed.add(tuple(map(type, arguments)))
+                if tier.calls >= self.threshold:
+                    self._promote(tier)
+        return super().apply_function(function, arguments, call)
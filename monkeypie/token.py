@@ -9,6 +9,7 @@ class TokenType(Enum):
     # Identifiers
     IDENT = "IDENT"
     INT = "INT"
+    STRING = "STRING"
 
     # Operators
     ASSIGN = "="
@@ -29,6 +30,9 @@ class TokenType(Enum):
     RPAREN = ")"
     LBRACE = "{"
     RBRACE = "}"
+    LBRACKET = "["
+    RBRACKET = "]"
+    COLON = ":"
 
     # Keywords
     FUNCTION = "FUNCTION"
@@ -38,8 +42,58 @@ class TokenType(Enum):
     IF = "IF"
     ELSE = "ELSE"
     RETURN = "RETURN"
+    IMPORT = "IMPORT"
 
 
+class TokenKind:
+    """Small integer codes for TokenType, used by the lexer and parser.
+
+    Kinds index TOKEN_TYPES and the parser's dispatch tables; they are plain
+    ints rather than an IntEnum so that comparing and indexing with them never
+    goes through enum attribute lookup or hashing.
+    """
+
+    ILLEGAL: Final = 0
+    EOF: Final = 1
+    IDENT: Final = 2
+    INT: Final = 3
+    ASSIGN: Final = 4
+    PLUS: Final = 5
+    MINUS: Final = 6
+    BANG: Final = 7
+    ASTERISK: Final = 8
+    SLASH: Final = 9
+    LT: Final = 10
+    GT: Final = 11
+    EQ: Final = 12
+    NOT_EQ: Final = 13
+    COMMA: Final = 14
+    SEMICOLON: Final = 15
+    LPAREN: Final = 16
+    RPAREN: Final = 17
+    LBRACE: Final = 18
+    RBRACE: Final = 19
+    FUNCTION: Final = 20
+    LET: Final = 21
+    TRUE: Final = 22
+    FALSE: Final = 23
+    IF: Final = 24
+    ELSE: Final = 25
+    RETURN: Final = 26
+    LBRACKET: Final = 27
+    RBRACKET: Final = 28
+    COLON: Final = 29
+    STRING: Final = 30
+    IMPORT: Final = 31
+
+
+TOKEN_TYPES: Final[tuple[TokenType, ...]] = tuple(
+    TokenType[name] for name in vars(TokenKind) if not name.startswith("_")
+)
+TOKEN_KINDS: Final[dict[TokenType, int]] = {
+    token_type: kind for kind, token_type in enumerate(TOKEN_TYPES)
+}
+
 KEYWORDS: Final[dict[str, TokenType]] = {
     "fn": TokenType.FUNCTION,
     "let": TokenType.LET,
@@ -48,13 +102,30 @@ KEYWORDS: Final[dict[str, TokenType]] = {
     "if": TokenType.IF,
     "else": TokenType.ELSE,
     "return": TokenType.RETURN,
+    "import": TokenType.IMPORT,
+}
+KEYWORD_KINDS: Final[dict[str, int]] = {
+    keyword: TOKEN_KINDS[token_type] for keyword, token_type in KEYWORDS.items()
 }
 
 
 class Token:
-    def __init__(self, token_type: TokenType, literal: str):
-        self.type = token_type
+    # Symbol id of IDENT tokens in their lexer's SymbolTable.
+    symbol: int = -1
+
+    def __init__(
+        self, token_type: TokenType | int, literal: str, start: int = 0, end: int = 0
+    ):
+        self.kind: int = (
+            TOKEN_KINDS[token_type] if isinstance(token_type, TokenType) else token_type
+        )
         self.literal = literal
+        self.start = start
+        self.end = end
+
+    @property
+    def type(self) -> TokenType:
+        return TOKEN_TYPES[self.kind]
 
     def __str__(self):
         return f"Token {{ Type:{self.type}, Literal:{self.literal} }}"
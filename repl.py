@@ -1,11 +1,18 @@
 import getpass
+import os
+import sys
 from typing import Final
 
-from monkeypie.lexer import Lexer
-from monkeypie.parser import Parser
+from monkeypie import prelude
+from monkeypie.ast import ProgramNode
+from monkeypie.environment import Environment
+from monkeypie.evaluator import Evaluator
+from monkeypie.interactive import InteractiveParser
 
 
 PROMPT: Final[str] = ">> "
+CONTINUATION_PROMPT: Final[str] = "... "
+RECURSION_ERROR: Final[str] = "ERROR: maximum recursion depth exceeded"
 MONKEY_FACE: Final[str] = r'''
            __,__
   .--.  .-"     "-.  .--.
@@ -32,23 +39,67 @@ class REPL:
 
     @staticmethod
     def start_repl() -> None:
+        evaluator = Evaluator()
+        # Names bound at the prompt shadow the prelude's without changing
+        # what its functions see.
+        env = Environment(prelude.load())
+        parser = InteractiveParser()
         while True:
-            line = input(PROMPT)
-            lexer = Lexer(line)
-            parser = Parser(lexer)
-            program = parser.parse_program()
-            if len(errors := parser.errors()):
+            try:
+                line = input(CONTINUATION_PROMPT if parser.pending() else PROMPT)
+            except KeyboardInterrupt:
+                # Ctrl+C drops an unfinished entry and only quits at the
+                # first prompt.
+                if not parser.pending():
+                    raise
+                parser.reset()
+                print()
+                continue
+
+            try:
+                statements, errors, complete = parser.feed(line + "\n")
+            except RecursionError:
+                # Input nested too deeply to parse.
+                parser.reset()
+                print(RECURSION_ERROR)
+                continue
+            if len(errors):
                 REPL.print_parser_errors(errors)
                 continue
+            if not complete or not statements:
+                continue
 
-            print(program)
+            program = ProgramNode()
+            program.statements = statements
+            program.symbols = parser.symbols
+            # Imported after the first prompt, which does not need the loader.
+            from monkeypie.modules import ModuleError, link
+
+            try:
+                link(program, os.getcwd())
+            except ModuleError as error:
+                print(error)
+                continue
+
+            try:
+                print(evaluator.evaluate(program, env).inspect())
+            except RecursionError:
+                print(RECURSION_ERROR)
 
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["bench"]:
+        # Imported here as it pulls in every engine, which the REPL does not
+        # need before its first prompt.
+        from monkeypie import bench
+
+        bench.main(sys.argv[2:])
+        sys.exit()
+
     print(f"Hello {getpass.getuser()}! This is the monkey programming language!")
     print("Feel free to type commands (Ctrl+C to quit)")
 
     try:
         REPL.start_repl()
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, EOFError):
         pass